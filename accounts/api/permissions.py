@@ -24,7 +24,7 @@ class IsUserProfileOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        if instance.user == request.user:
+        if instance.user_id == request.user.pk:
             return True
 
         return False
@@ -101,6 +101,18 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
         return data
 
 
+class ImageURLsField(serializers.ReadOnlyField):
+    """
+    Read-only field rendering the URLs of the image derivatives of a row,
+    absolute like those of ``ImageField``, or null without an image.
+    """
+    def to_representation(self, value):
+        request = self.context.get('request')
+        if value is None or request is None:
+            return value
+        return {size: request.build_absolute_uri(url) for size, url in value.items()}
+
+
 class UserProfileSerializer(CountryFieldMixin, serializers.ModelSerializer):
     """
     Serializer for UserProfile model that includes additional user-related fields.
@@ -112,17 +124,16 @@ class UserProfileSerializer(CountryFieldMixin, serializers.ModelSerializer):
     email = serializers.EmailField(source='user.email', label=_('Email Address'), read_only=True)
     first_name = serializers.CharField(source='user.first_name', label=_('First Name'))
     last_name = serializers.CharField(source='user.last_name', label=_('Last Name'))
-    folder_count = serializers.IntegerField(read_only=True)
-    dictionary_count = serializers.IntegerField(read_only=True)
-    entry_count = serializers.IntegerField(read_only=True)
+    image_urls = ImageURLsField()
 
     class Meta:
         model = UserProfile
         fields = (
             'id', 'email', 'username', 'first_name',
-            'last_name', 'country', 'date_of_birth', 'image',
+            'last_name', 'country', 'date_of_birth', 'image', 'image_urls',
             'folder_count', 'dictionary_count', 'entry_count'
         )
+        read_only_fields = ('folder_count', 'dictionary_count', 'entry_count')
 
     def update(self, instance: UserProfile, validated_data: dict) -> UserProfile:
         """
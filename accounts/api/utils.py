@@ -1,9 +1,5 @@
 from datetime import timedelta
 
-from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
-from django.template.defaultfilters import strip_tags
-from django.template.loader import render_to_string
 from django.urls import reverse
 
 from rest_framework import status
@@ -11,12 +7,13 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
+from accounts.emails import queue_email
 from accounts.models import CustomUser
 
 
 def send_verification_email(user: CustomUser, name: str, subject: str):
     """
-    Send a verification email to the user with a time-limited verification link.
+    Queue a verification email to the user with a time-limited verification link.
 
     Args:
         user (CustomUser): The user to send the verification email to.
@@ -24,27 +21,19 @@ def send_verification_email(user: CustomUser, name: str, subject: str):
         subject (str): Subject line of the email.
 
     Note:
-        Generates a 15-minute valid verification token and sends an HTML email.
+        Generates a 15-minute valid verification token and queues an HTML email.
     """
     current_site = 'https://nunu29.pythonanywhere.com/'
     token = RefreshToken.for_user(user).access_token
     token.set_exp(lifetime=timedelta(minutes=15))
-    verification_link = f"{current_site}{reverse('accounts:verify_email', kwargs={'uidb64': uidb64, 'token': token})}"
+    verification_link = f"{current_site.rstrip('/')}{reverse('accounts_api:verify_email')}?token={token}"
 
-    html_content = render_to_string(
+    queue_email(
+        subject,
         "accounts/verification-email.html",
         context={"name": name, "verification_link": verification_link},
-    )
-    plain_message = strip_tags(html_content)
-
-    email = EmailMultiAlternatives(
-        subject=subject,
-        body=plain_message,
-        from_email=settings.EMAIL_HOST_USER,
         to=[user.email],
     )
-    email.attach_alternative(html_content, "text/html")
-    email.send()
 
 
 def generate_password_reset_token(user: CustomUser) -> str:
@@ -1,8 +1,3 @@
-from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
-from django.db.models import Count
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
 from django.utils.translation import gettext_lazy as _
 
 from drf_spectacular.utils import extend_schema
@@ -20,6 +15,7 @@ from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 
+from accounts.emails import queue_email
 from accounts.models import CustomUser, UserProfile
 from .permissions import IsUserProfileOrReadOnly
 from .serializers import (EmailSerializer, PasswordResetConfirmSerializer,
@@ -153,7 +149,7 @@ class PasswordResetRequestAPIView(APIView):
 
     def post(self, request: Request) -> Response:
         """
-        Generate and send password reset link.
+        Generate a password reset link and queue its email.
 
         Args:
             request (Request): HTTP request with user email.
@@ -171,20 +167,12 @@ class PasswordResetRequestAPIView(APIView):
             reset_token = generate_password_reset_token(user)
             reset_link = f"http://localhost:8000/api/account/reset-password?token={reset_token}"
 
-            convert_to_html_content = render_to_string(
+            queue_email(
+                'Reset Password',
                 "accounts/password-reset-email-api.html",
                 context={"reset_link": reset_link},
-            )
-            plain_message = strip_tags(convert_to_html_content)
-
-            email = EmailMultiAlternatives(
-                subject='Reset Password',
-                body=plain_message,
-                from_email=settings.EMAIL_HOST_USER,
                 to=[user.email],
             )
-            email.attach_alternative(convert_to_html_content, "text/html")
-            email.send()
             return Response({"message": "Check your email for password reset link."})
 
         except CustomUser.DoesNotExist:
@@ -275,12 +263,8 @@ class UserProfileViewSet(ListModelMixin,
     permission_classes = (IsAuthenticatedOrReadOnly, IsUserProfileOrReadOnly)
 
     def get_queryset(self):
-        """Get annotated queryset of user profiles."""
+        """Get queryset of user profiles ordered by their dictionary count."""
         queryset = UserProfile.objects.select_related(
             'user'
-        ).annotate(
-            folder_count=Count('user__folders', distinct=True),
-            dictionary_count=Count('user__folders__dictionaries', distinct=True),
-            entry_count=Count('user__folders__dictionaries__entries', distinct=True),
         ).order_by('-dictionary_count')
         return queryset
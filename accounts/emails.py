@@ -0,0 +1,78 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+
+
+def render_email(template_name: str, context: Dict[str, str]) -> Tuple[str, str]:
+    """
+    Render an HTML email template and its plain text version.
+
+    Rendered emails are not cached, as their context holds one-time tokens;
+    the compiled templates are, by Django's cached template loader.
+
+    Args:
+        template_name (str): Name of the HTML template.
+        context (Dict[str, str]): Template context with string values.
+
+    Returns:
+        Tuple[str, str]: HTML and plain text content.
+    """
+    html_content = render_to_string(template_name, context=context)
+    return html_content, strip_tags(html_content)
+
+
+def build_email(message: Dict, connection=None) -> EmailMultiAlternatives:
+    """
+    Build the email described by a queued message.
+
+    Args:
+        message (Dict): Message as queued by ``queue_email``.
+        connection (optional): Email backend to send the email with.
+
+    Returns:
+        EmailMultiAlternatives: Email with a plain text body and an HTML alternative.
+    """
+    html_content, plain_message = render_email(message['template_name'], message['context'])
+    email = EmailMultiAlternatives(
+        subject=message['subject'],
+        body=plain_message,
+        from_email=message['from_email'],
+        to=message['to'],
+        connection=connection,
+    )
+    email.attach_alternative(html_content, "text/html")
+    return email
+
+
+def queue_email(subject: str, template_name: str, context: Dict[str, str],
+                to: Iterable[str], from_email: Optional[str] = None):
+    """
+    Queue an email to be rendered and sent by a Celery worker once the
+    current transaction commits, instead of in the request.
+
+    Every email is its own task: its commit hook is dropped along with a
+    rolled back savepoint, which a hook sending all the emails of the
+    transaction at once could not tell apart. The worker sends them over
+    the connection it keeps open all the same.
+
+    Args:
+        subject (str): Subject line of the email.
+        template_name (str): Name of the HTML template of the body.
+        context (Dict[str, str]): Template context; values must be JSON serializable.
+        to (Iterable[str]): Recipient addresses.
+        from_email (str, optional): Sender address. Defaults to EMAIL_HOST_USER.
+    """
+    from .tasks import send_emails  # The task module builds emails with this one
+
+    message = {
+        'subject': subject,
+        'template_name': template_name,
+        'context': context,
+        'to': list(to),
+        'from_email': from_email or settings.EMAIL_HOST_USER,
+    }
+    transaction.on_commit(lambda: send_emails.delay([message]), robust=True)
@@ -1,8 +1,10 @@
 from django import forms
 from django.contrib.admin.templatetags.admin_list import search_form
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm, PasswordResetForm, SetPasswordForm
+from django.template.loader import render_to_string
 from django.utils.translation import gettext_lazy as _
 
+from .emails import queue_email
 from .models import CustomUser, UserProfile
 
 
@@ -48,11 +50,27 @@ class CustomAuthenticationForm(AuthenticationForm):
 
 
 class CustomPasswordResetForm(PasswordResetForm):
-    """Custom password reset form with enhanced placeholder."""
+    """Custom password reset form with enhanced placeholder, queueing its email."""
     email = forms.EmailField(widget=forms.TextInput(
         attrs={'placeholder': 'Enter your email'})
     )
 
+    def send_mail(self, subject_template_name, email_template_name, context,
+                  from_email, to_email, html_email_template_name=None):
+        """
+        Queue the reset email instead of sending it in the request.
+
+        The body is rendered by the worker from the serializable part of the context.
+        """
+        subject = ''.join(render_to_string(subject_template_name, context).splitlines())
+        queue_email(
+            subject,
+            html_email_template_name or email_template_name,
+            context={key: context[key] for key in ('email', 'domain', 'site_name', 'uid', 'token', 'protocol')},
+            to=[to_email],
+            from_email=from_email,
+        )
+
 
 class CustomSetPasswordForm(SetPasswordForm):
     """Custom password set form with descriptive placeholders."""
@@ -0,0 +1,215 @@
+import hashlib
+import posixpath
+import re
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.dispatch import Signal
+from django.urls import reverse
+from PIL import Image, ImageOps
+
+from .storage import blob_hash, is_blob
+
+
+# Bounding boxes of the derivatives generated for every uploaded image.
+IMAGE_DERIVATIVE_SIZES = {
+    'thumb': (128, 128),
+    'card': (480, 480),
+    'print': (1200, 1200),
+}
+
+DERIVATIVES_DIRECTORY = 'derivatives'
+
+# Encodings of derivatives, by Pillow format name.
+IMAGE_FORMATS = {
+    'AVIF': {'extension': 'avif', 'content_type': 'image/avif', 'options': {'quality': 50}},
+    'WEBP': {'extension': 'webp', 'content_type': 'image/webp', 'options': {'quality': 75, 'method': 6}},
+    'JPEG': {'extension': 'jpg', 'content_type': 'image/jpeg', 'options': {'quality': 80, 'optimize': True, 'progressive': True}},
+    'PNG': {'extension': 'png', 'content_type': 'image/png', 'options': {'optimize': True}},
+}
+
+# Formats generated next to the JPEG or PNG fallback, most preferred first.
+# AVIF is skipped on Pillow builds without an AVIF encoder (before 11.2).
+MODERN_FORMATS = ('AVIF', 'WEBP')
+
+# Sent after the derivatives of a row's image are generated and recorded
+# with a queryset update, which skips ``post_save``. Receivers get the row
+# as ``instance``.
+image_derivatives_generated = Signal()
+
+
+def hash_image(field_file) -> str:
+    """
+    Return the SHA-256 hex digest of the content of a stored image.
+    """
+    digest = hashlib.sha256()
+    with field_file.open('rb') as file:
+        for chunk in file.chunks():
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def derivative_name(content_hash: str, size: str, extension: str) -> str:
+    """
+    Return the storage name of a derivative, derived from the content hash
+    of its source so that identical uploads share their derivatives.
+    """
+    return f'{DERIVATIVES_DIRECTORY}/{content_hash[:2]}/{content_hash}/{size}.{extension}'
+
+
+def has_transparency(image: Image.Image) -> bool:
+    """Return whether an image has an alpha channel or a transparent color."""
+    return image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+
+
+def resize_image(image: Image.Image, box: Tuple[int, int]) -> Image.Image:
+    """
+    Return an upright copy of an image fitting in a bounding box, never enlarged.
+    """
+    derivative = ImageOps.exif_transpose(image)
+    derivative.thumbnail(box)
+    return derivative
+
+
+def encode_image(image: Image.Image, image_format: str) -> ContentFile:
+    """
+    Encode an image in the given format with the settings of ``IMAGE_FORMATS``.
+    """
+    if image_format == 'JPEG':
+        image = image.convert('RGB')
+
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, **IMAGE_FORMATS[image_format]['options'])
+    return ContentFile(buffer.getvalue())
+
+
+def modern_formats() -> List[str]:
+    """
+    Return the formats of ``MODERN_FORMATS`` the installed Pillow can encode.
+    """
+    Image.init()
+    return [image_format for image_format in MODERN_FORMATS if image_format in Image.SAVE]
+
+
+def generate_derivatives(field_file) -> Tuple[str, Dict[str, dict]]:
+    """
+    Generate the derivatives of a stored image, unless the derivatives of
+    an image with the same content already exist.
+
+    Every size is encoded as PNG for images with transparency and as JPEG
+    for all others, plus in each of the modern formats Pillow can encode,
+    which are served instead to browsers that accept them.
+    Derivatives are kept in the default storage under names derived from
+    the content hash, whatever the storage of the source image.
+
+    Args:
+        field_file (FieldFile): The stored source image.
+
+    Returns:
+        Tuple[str, Dict[str, dict]]: Content hash of the image and, keyed by
+            size, the storage ``name`` of each fallback derivative and its ``width``.
+    """
+    # Blobs are already named after their content hash
+    content_hash = blob_hash(field_file.name) if is_blob(field_file.name) else hash_image(field_file)
+
+    derivatives = {}
+    with field_file.open('rb') as file, Image.open(file) as image:
+        fallback_format = 'PNG' if has_transparency(image) else 'JPEG'
+        formats = [fallback_format, *modern_formats()]
+        for size, box in IMAGE_DERIVATIVE_SIZES.items():
+            names = {
+                image_format: derivative_name(content_hash, size, IMAGE_FORMATS[image_format]['extension'])
+                for image_format in formats
+            }
+            missing = [image_format for image_format, name in names.items() if not default_storage.exists(name)]
+            if missing:
+                derivative = resize_image(image, box)
+                for image_format in missing:
+                    default_storage.save(names[image_format], encode_image(derivative, image_format))
+                width = derivative.width
+            else:
+                with default_storage.open(names[fallback_format]) as existing, Image.open(existing) as derivative:
+                    width = derivative.width
+            derivatives[size] = {'name': names[fallback_format], 'width': width}
+    return content_hash, derivatives
+
+
+def get_image_urls(name: Optional[str], derivatives: Dict[str, dict], storage) -> Optional[Dict[str, str]]:
+    """
+    Return the URL of the fallback format of every derivative of an image,
+    falling back to the original image for derivatives that are not
+    generated yet.
+
+    Args:
+        name (str, optional): Storage name of the source image.
+        derivatives (Dict[str, dict]): Derivatives, as returned by ``generate_derivatives``.
+        storage (Storage): Storage of the source image.
+
+    Returns:
+        Optional[Dict[str, str]]: URLs keyed by size, or None without an image.
+    """
+    if not name:
+        return None
+    return {
+        size: default_storage.url(derivatives[size]['name']) if size in derivatives else storage.url(name)
+        for size in IMAGE_DERIVATIVE_SIZES
+    }
+
+
+def get_image_srcset(content_hash: str, derivatives: Dict[str, dict]) -> str:
+    """
+    Return the ``srcset`` attribute listing the derivatives of an image by
+    width, each served in the best format the browser accepts.
+
+    Args:
+        content_hash (str): Content hash of the source image.
+        derivatives (Dict[str, dict]): Derivatives, as returned by ``generate_derivatives``.
+
+    Returns:
+        str: The attribute value, empty until the derivatives are generated.
+    """
+    candidates = {}
+    for size in IMAGE_DERIVATIVE_SIZES:
+        if size in derivatives:
+            # Images smaller than a bounding box have several derivatives of the same width
+            candidates.setdefault(derivatives[size]['width'], reverse('accounts:image_derivative', kwargs={
+                'content_hash': content_hash,
+                'file_name': posixpath.basename(derivatives[size]['name']),
+            }))
+    return ', '.join(f'{url} {width}w' for width, url in candidates.items())
+
+
+def negotiate_derivative(content_hash: str, file_name: str, accept: str) -> Optional[Tuple[str, str]]:
+    """
+    Pick the format of a derivative to serve from an ``Accept`` header.
+
+    Args:
+        content_hash (str): Content hash of the source image.
+        file_name (str): File name of the fallback derivative, e.g., ``card.jpg``.
+        accept (str): The ``Accept`` header of the request.
+
+    Returns:
+        Optional[Tuple[str, str]]: Storage name and content type of the best
+            existing derivative, or None if the derivative does not exist.
+    """
+    accepted = {
+        media_type.split(';')[0].strip().lower()
+        for media_type in accept.split(',')
+        if not re.search(r';\s*q=0(?:\.0*)?\s*(?:;|$)', media_type)
+    }
+    size, extension = posixpath.splitext(file_name)
+    fallback_format = next(
+        (image_format for image_format, options in IMAGE_FORMATS.items() if options['extension'] == extension[1:]),
+        None,
+    )
+    if fallback_format is None or size not in IMAGE_DERIVATIVE_SIZES:
+        return None
+
+    for image_format in [*(f for f in MODERN_FORMATS if IMAGE_FORMATS[f]['content_type'] in accepted), fallback_format]:
+        options = IMAGE_FORMATS[image_format]
+        name = derivative_name(content_hash, size, options['extension'])
+        if default_storage.exists(name):
+            return name, options['content_type']
+    return None
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import UserProfile
+from accounts.tasks import generate_image_derivatives
+from dictionary.models import DictionaryEntry
+
+
+class Command(BaseCommand):
+    help = (
+        'Queue the generation of the image derivatives of every profile and '
+        'entry whose image has none yet, e.g., images uploaded before derivatives existed.'
+    )
+
+    def handle(self, *args, **options):
+        for model in (UserProfile, DictionaryEntry):
+            field = model._meta.get_field('image')
+            pks = model.objects.filter(image_hash='', image__gt='')
+            if field.has_default():
+                pks = pks.exclude(image=field.default)
+            pks = pks.values_list('pk', flat=True)
+            count = 0
+            for pk in pks.iterator():
+                generate_image_derivatives.delay(model._meta.label, pk)
+                count += 1
+            self.stdout.write(f'{model._meta.verbose_name_plural}: {count} queued')
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.3 on 2026-10-18 12:00
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    """Backfill profile folder, dictionary and entry counters from existing rows."""
+    UserProfile = apps.get_model("accounts", "UserProfile")
+    DictionaryFolder = apps.get_model("dictionary", "DictionaryFolder")
+    Dictionary = apps.get_model("dictionary", "Dictionary")
+    DictionaryEntry = apps.get_model("dictionary", "DictionaryEntry")
+
+    def count_of(queryset, field):
+        return Coalesce(
+            Subquery(
+                queryset.filter(**{field: OuterRef("user")})
+                .order_by()
+                .values(field)
+                .annotate(total=Count("pk"))
+                .values("total")
+            ),
+            0,
+        )
+
+    UserProfile.objects.update(
+        folder_count=count_of(DictionaryFolder.objects.all(), "user"),
+        dictionary_count=count_of(Dictionary.objects.all(), "folder__user"),
+        entry_count=count_of(DictionaryEntry.objects.all(), "dictionary__folder__user"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_userprofile_updated_at"),
+        ("dictionary", "0015_dictionary_entry_count_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="dictionary_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="number of dictionaries"
+            ),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="entry_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="number of entries"
+            ),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="folder_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="number of folders"
+            ),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.3 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+def populate_folder_languages(apps, schema_editor):
+    """Backfill the cached folder language names of every user."""
+    CustomUser = apps.get_model("accounts", "CustomUser")
+    DictionaryFolder = apps.get_model("dictionary", "DictionaryFolder")
+
+    languages = {}
+    for user_id, language in DictionaryFolder.objects.values_list(
+        "user_id", "language__name"
+    ).distinct():
+        languages.setdefault(user_id, set()).add(language)
+
+    for user_id, names in languages.items():
+        CustomUser.objects.filter(pk=user_id).update(folder_languages=sorted(names))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0006_userprofile_dictionary_count_userprofile_entry_count_and_more"),
+        ("dictionary", "0015_dictionary_entry_count_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="folder_languages",
+            field=models.JSONField(
+                default=list, editable=False, verbose_name="folder languages"
+            ),
+        ),
+        migrations.RunPython(populate_folder_languages, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-19 00:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_customuser_folder_languages"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="image_derivatives",
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name="image derivatives"),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="image_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name="image content hash"),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.3 on 2026-10-19 00:30
+
+import accounts.storage
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_userprofile_image_derivatives_userprofile_image_hash"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="userprofile",
+            name="image",
+            field=models.ImageField(default="default.jpeg", storage=accounts.storage.image_storage, upload_to="profile_images/"),
+        ),
+        migrations.CreateModel(
+            name="MediaBlob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=255, unique=True, verbose_name="name")),
+                ("reference_count", models.PositiveIntegerField(default=0, verbose_name="number of references")),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="updated at")),
+            ],
+            options={
+                "verbose_name": "Media blob",
+                "verbose_name_plural": "Media blobs",
+                "indexes": [models.Index(fields=["reference_count", "updated_at"], name="mediablob_orphans_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-19 02:10
+
+from django.db import migrations
+
+
+def reset_image_derivatives(apps, schema_editor):
+    """
+    Forget derivatives recorded before they had widths and modern formats,
+    so that the generate_image_derivatives command generates them again.
+    """
+    UserProfile = apps.get_model("accounts", "UserProfile")
+    UserProfile.objects.exclude(image_derivatives={}).update(image_hash="", image_derivatives={})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_alter_userprofile_image_mediablob"),
+    ]
+
+    operations = [
+        migrations.RunPython(reset_image_derivatives, migrations.RunPython.noop),
+    ]
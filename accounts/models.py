@@ -1,12 +1,150 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.db import models
-from django.db.models import Count
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 from django_countries.fields import CountryField
-from PIL import Image
+
+from .images import get_image_srcset, get_image_urls
+from .storage import image_storage, is_blob
+from .tasks import generate_image_derivatives
+
+
+class DenormalizedFieldsMixin(models.Model):
+    """
+    Abstract base for models that carry denormalized columns.
+
+    Denormalized values (counters, cached lists) are only ever changed through
+    queryset updates issued by signals, so saving an already existing instance
+    leaves them out of the UPDATE statement instead of writing back possibly
+    stale in-memory values.
+    """
+    denormalized_fields = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if (not self._state.adding and not args
+                and kwargs.get('update_fields') is None
+                and not kwargs.get('force_insert')):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.denormalized_fields
+            ]
+        super().save(*args, **kwargs)
+
+
+class MediaBlobManager(models.Manager):
+    """
+    Manager counting the references to the blobs of the image storage.
+    """
+    def reference(self, name: str):
+        """Count one more row referencing a blob; other names are ignored."""
+        if not is_blob(name):
+            return
+        blob, created = self.get_or_create(name=name, defaults={'reference_count': 1})
+        if not created:
+            self.filter(pk=blob.pk).update(reference_count=F('reference_count') + 1, updated_at=timezone.now())
+
+    def release(self, name: str):
+        """Count one less row referencing a blob; other names are ignored."""
+        if is_blob(name):
+            self.filter(name=name, reference_count__gt=0).update(
+                reference_count=F('reference_count') - 1, updated_at=timezone.now()
+            )
+
+
+class MediaBlob(models.Model):
+    """
+    A file of the content-addressed image storage and the number of rows referencing it.
+
+    Blobs nothing references any more are deleted, with their derivatives,
+    by the ``collect_orphaned_blobs`` task once a grace period has passed.
+    """
+    name = models.CharField(_('name'), max_length=255, unique=True)
+    reference_count = models.PositiveIntegerField(_('number of references'), default=0)
+    updated_at = models.DateTimeField(_('updated at'), default=timezone.now)
+
+    objects = MediaBlobManager()
+
+    class Meta:
+        verbose_name = _('Media blob')
+        verbose_name_plural = _('Media blobs')
+        indexes = [
+            models.Index(fields=('reference_count', 'updated_at'), name='mediablob_orphans_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class ImageDerivativesMixin(models.Model):
+    """
+    Abstract base for models whose ``image`` is served through resized derivatives.
+
+    Whenever a different file is saved, its derivatives are generated by a
+    background task, which reuses those of any earlier image with the same
+    content. Until they are ready, the original image is served in their
+    place. The derivative columns are only written by the task, so
+    subclasses list them in ``denormalized_fields``.
+    """
+    image_hash = models.CharField(_('image content hash'), max_length=64, blank=True, editable=False)
+    image_derivatives = models.JSONField(_('image derivatives'), default=dict, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_image_name = instance.__dict__.get('image') or ''
+        return instance
+
+    @property
+    def image_urls(self) -> Optional[Dict[str, str]]:
+        """
+        URLs of the image derivatives keyed by size, or None without an image.
+        """
+        return get_image_urls(self.image.name, self.image_derivatives, self.image.storage)
+
+    @property
+    def image_srcset(self) -> str:
+        """
+        ``srcset`` of the image derivatives, served in the best format the
+        browser accepts, or an empty string until they are generated.
+        """
+        return get_image_srcset(self.image_hash, self.image_derivatives)
+
+    def save(self, *args, **kwargs):
+        """
+        Save the row and, if its image changed, drop the derivatives of the
+        previous image and queue the generation of the new ones.
+        """
+        super().save(*args, **kwargs)
+        if 'image' not in self.__dict__:
+            return  # Deferred and untouched
+
+        name = self.image.name or ''
+        previous_name = getattr(self, '_loaded_image_name', '')
+        if name == previous_name:
+            return
+        self._loaded_image_name = name
+        MediaBlob.objects.reference(name)
+        MediaBlob.objects.release(previous_name)
+
+        if self.image_hash or self.image_derivatives:
+            type(self).objects.filter(pk=self.pk).update(image_hash='', image_derivatives={})
+            self.image_hash, self.image_derivatives = '', {}
+        if name and name != self._meta.get_field('image').default:
+            transaction.on_commit(self.queue_image_derivatives, robust=True)
+
+    def queue_image_derivatives(self):
+        """Queue the generation of the derivatives of the current image."""
+        generate_image_derivatives.delay(self._meta.label, self.pk)
 
 
 class CustomUserManager(BaseUserManager):
@@ -69,7 +207,7 @@ class CustomUserManager(BaseUserManager):
         return self.create_user(email, password, **extra_fields)
 
 
-class CustomUser(AbstractUser):
+class CustomUser(DenormalizedFieldsMixin, AbstractUser):
     """
     Custom user model that extends Django's AbstractUser with additional fields.
 
@@ -78,16 +216,21 @@ class CustomUser(AbstractUser):
         date_of_birth (DateField): Date of birth
         country (CountryField): Country of residence
         is_verified (BooleanField): Whether the user is verified
+        folder_languages (JSONField): Sorted names of the languages of the user's folders,
+            maintained by the dictionary app's signals
     """
     email = models.EmailField(_('email address'), unique=True)
     is_verified = models.BooleanField(_('email verified'), default=False)
     slug = models.SlugField(_('slug'), unique=True)
+    folder_languages = models.JSONField(_('folder languages'), default=list, editable=False)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []
 
     objects = CustomUserManager()
 
+    denormalized_fields = ('folder_languages',)
+
     class Meta:
         verbose_name = _('User')
         verbose_name_plural = _('Users')
@@ -102,49 +245,34 @@ class CustomUser(AbstractUser):
 
     @property
     def languages(self):
-        return ", ".join(
-            language for language in self.folders
-            .values_list('language__name', flat=True).distinct()
-        )
-
-    @classmethod
-    def annotate_all_statistics(cls, queryset):
-        return queryset.annotate(
-            folder_count=Count('folders', distinct=True),
-            dictionary_count=Count('folders__dictionaries', distinct=True),
-            entry_count=Count('folders__dictionaries__entries', distinct=True),
-        )
+        return ", ".join(self.folder_languages)
 
 
-class UserProfile(models.Model):
+class UserProfile(ImageDerivativesMixin, DenormalizedFieldsMixin):
     """
     Extended user profile with additional details.
 
-    Stores supplementary user information and handles profile image resizing.
+    Stores supplementary user information. Resized versions of the profile
+    image are generated in the background.
+    Folder, dictionary and entry counts are maintained by the dictionary app's
+    signals, so profile pages never have to count across joins.
     """
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='profile')
     date_of_birth = models.DateField(_('date of birth'), blank=True, null=True)
     country = CountryField(verbose_name=_("country"), blank_label=_("Select country"))
-    image = models.ImageField(upload_to='profile_images/', default='default.jpeg')
+    image = models.ImageField(upload_to='profile_images/', default='default.jpeg', storage=image_storage)
+    folder_count = models.PositiveIntegerField(_('number of folders'), default=0, editable=False)
+    dictionary_count = models.PositiveIntegerField(_('number of dictionaries'), default=0, editable=False)
+    entry_count = models.PositiveIntegerField(_('number of entries'), default=0, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
+    denormalized_fields = (
+        'folder_count', 'dictionary_count', 'entry_count', 'image_hash', 'image_derivatives'
+    )
+
     class Meta:
         verbose_name = _('User profile')
         verbose_name_plural = _('User profiles')
 
     def __str__(self):
         return f'{self.user.username} Profile'
-
-    def save(self, *args, **kwargs):
-        """
-        Override save method to resize profile image.
-
-        Automatically resizes images larger than 300x300 pixels.
-        """
-        super().save(*args, **kwargs)
-
-        img = Image.open(self.image.path)
-        if img.height > 300 or img.width > 300:
-            output_size = (300, 300)
-            img.thumbnail(output_size)
-            img.save(self.image.path)
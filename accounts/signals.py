@@ -1,8 +1,8 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from leaderboard.models import UserStatistics
-from .models import CustomUser, UserProfile
+from .models import CustomUser, MediaBlob, UserProfile
 
 
 @receiver(post_save, sender=CustomUser)
@@ -36,3 +36,11 @@ def save_user_statistics(sender, instance, **kwargs):
     Ensure user statistics are saved when CustomUser is updated.
     """
     instance.statistics.save()
+
+
+@receiver(post_delete, sender=UserProfile)
+def release_image_on_profile_deletion(sender, instance, **kwargs):
+    """
+    Release the reference a deleted profile held to its image blob.
+    """
+    MediaBlob.objects.release(instance.image.name)
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import uuid
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, storages
+from PIL import Image
+
+
+BLOBS_DIRECTORY = 'blobs'
+
+# Blobs never change once written, so browsers may keep them for a year.
+BLOB_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+# Extensions of blobs by Pillow format name, for formats with several
+# common ones. Other formats take the first extension Pillow registers.
+BLOB_EXTENSIONS = {
+    'JPEG': '.jpg',
+    'TIFF': '.tif',
+}
+
+
+def blob_name(content_hash: str, extension: str) -> str:
+    """
+    Return the storage name of the blob with the given content hash.
+    """
+    return f'{BLOBS_DIRECTORY}/{content_hash[:2]}/{content_hash}{extension}'
+
+
+def blob_extension(content, name: str) -> str:
+    """
+    Return the extension of the blob of some content, derived from its
+    detected image format so that the same content is stored once whatever
+    it was called, e.g., both "photo.jpeg" and "photo.JPG" are stored as
+    ".jpg". Content that is not an image keeps the extension of its name.
+    """
+    try:
+        content.seek(0)
+        with Image.open(content) as image:
+            image_format = image.format
+    except (OSError, ValueError):  # Not an image
+        image_format = None
+    finally:
+        content.seek(0)
+
+    if image_format in BLOB_EXTENSIONS:
+        return BLOB_EXTENSIONS[image_format]
+    extensions = [extension for extension, registered_format in Image.registered_extensions().items()
+                  if registered_format == image_format]
+    return extensions[0] if extensions else os.path.splitext(name)[1].lower()
+
+
+def is_blob(name: str) -> bool:
+    """Return whether a storage name is that of a content-addressed blob."""
+    return bool(name) and name.startswith(f'{BLOBS_DIRECTORY}/')
+
+
+def blob_hash(name: str) -> str:
+    """Return the content hash a blob is named after."""
+    return os.path.splitext(os.path.basename(name))[0]
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage naming every file after the SHA-256 of its content.
+
+    Saving content that is already stored writes nothing and returns the
+    existing name, so identical uploads share one file whatever they were
+    called: the extension of a blob is that of its image format, not of the
+    uploaded name. Files are never overwritten with other content, so they can be
+    served as immutable. Which rows reference a blob is tracked by
+    ``MediaBlob``; files nothing references are removed by the
+    ``collect_orphaned_blobs`` task.
+    """
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        name = blob_name(digest.hexdigest(), blob_extension(content, name))
+
+        if self.exists(name):
+            # Restart the grace period of the blob, which may be an orphan
+            # about to be collected.
+            os.utime(self.path(name))
+            return name
+        return self._save(name, content)
+
+    def _save(self, name, content):
+        """
+        Write the content to a temporary file moved in place once complete,
+        so concurrent uploads of the same content never see a partial file.
+        """
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+
+        temporary_path = f'{full_path}.{uuid.uuid4().hex}.tmp'
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+        with open(os.open(temporary_path, flags, 0o666), 'wb') as file:
+            for chunk in content.chunks():
+                file.write(chunk)
+        if self.file_permissions_mode is not None:
+            os.chmod(temporary_path, self.file_permissions_mode)
+        os.replace(temporary_path, full_path)
+        return name
+
+
+def image_storage():
+    """
+    Return the storage of uploaded images, configured as ``STORAGES['images']``.
+    """
+    return storages['images']
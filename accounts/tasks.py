@@ -0,0 +1,162 @@
+import logging
+from datetime import timedelta
+from smtplib import SMTPException, SMTPRecipientsRefused, SMTPServerDisconnected
+from typing import Dict, List
+
+from celery import shared_task
+from celery.signals import worker_process_shutdown
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.mail import get_connection
+from django.utils import timezone
+
+from .emails import build_email
+from .images import DERIVATIVES_DIRECTORY, generate_derivatives, image_derivatives_generated
+from .storage import BLOBS_DIRECTORY, blob_hash, image_storage
+
+# Unreferenced blobs are kept this long, so that a file uploaded by a save
+# that has not recorded its reference yet is never collected.
+BLOB_GRACE_PERIOD = timedelta(days=1)
+
+# Delays between attempts to send an email grow exponentially up to the maximum.
+EMAIL_MAX_RETRIES = 6
+EMAIL_RETRY_BACKOFF = 30
+EMAIL_RETRY_BACKOFF_MAX = 60 * 30
+
+logger = logging.getLogger(__name__)
+
+# Email backend of the worker process, kept open between tasks.
+_email_connection = None
+
+
+@shared_task
+def generate_image_derivatives(model_label: str, pk: int):
+    """
+    Generate the derivatives of a row's image and record them on the row.
+
+    Nothing is recorded if the image changed again since the task was
+    queued, since the newer image has a task of its own.
+
+    Args:
+        model_label (str): Label of a model using ImageDerivativesMixin.
+        pk (int): Primary key of the row.
+    """
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None or not instance.image:
+        return
+
+    content_hash, derivatives = generate_derivatives(instance.image)
+    updated = model.objects.filter(pk=pk, image=instance.image.name).update(
+        image_hash=content_hash,
+        image_derivatives=derivatives,
+    )
+    if updated:
+        instance.image_hash, instance.image_derivatives = content_hash, derivatives
+        image_derivatives_generated.send(sender=model, instance=instance)
+
+
+def _walk_files(storage, directory: str):
+    """Yield the names of all files below a storage directory."""
+    if not storage.exists(directory):
+        return
+    directories, files = storage.listdir(directory)
+    for file in files:
+        yield f'{directory}/{file}'
+    for subdirectory in directories:
+        yield from _walk_files(storage, f'{directory}/{subdirectory}')
+
+
+@shared_task
+def collect_orphaned_blobs() -> int:
+    """
+    Delete the blobs of the image storage that no row has referenced for
+    the grace period, along with their derivatives.
+
+    Blob files without a ``MediaBlob`` row, e.g., left by a save that was
+    rolled back, are collected too.
+
+    Returns:
+        int: Number of blob files deleted.
+    """
+    media_blob_model = apps.get_model('accounts', 'MediaBlob')
+    storage = image_storage()
+    cutoff = timezone.now() - BLOB_GRACE_PERIOD
+
+    media_blob_model.objects.filter(reference_count=0, updated_at__lt=cutoff).delete()
+    live_names = set(media_blob_model.objects.values_list('name', flat=True).iterator())
+
+    deleted = 0
+    for name in _walk_files(storage, BLOBS_DIRECTORY):
+        if name in live_names or storage.get_modified_time(name) >= cutoff:
+            continue
+        storage.delete(name)
+        deleted += 1
+
+        content_hash = blob_hash(name)
+        directory = f'{DERIVATIVES_DIRECTORY}/{content_hash[:2]}/{content_hash}'
+        for derivative in _walk_files(default_storage, directory):
+            default_storage.delete(derivative)
+    return deleted
+
+
+def get_email_connection():
+    """
+    Return the email backend of the worker process, opening its connection
+    on first use and keeping it open for the following tasks.
+    """
+    global _email_connection
+    if _email_connection is None:
+        connection = get_connection(fail_silently=False)
+        connection.open()
+        _email_connection = connection
+    return _email_connection
+
+
+@worker_process_shutdown.connect
+def close_email_connection(**kwargs):
+    """
+    Close the email connection of the worker process, e.g., after an error
+    or when the process exits.
+    """
+    global _email_connection
+    if _email_connection is not None:
+        try:
+            _email_connection.close()
+        finally:
+            _email_connection = None
+
+
+def _send_email(message: Dict):
+    """
+    Send a message over the shared connection, reconnecting once if the
+    server closed it while idle.
+    """
+    try:
+        build_email(message, get_email_connection()).send()
+    except SMTPServerDisconnected:
+        close_email_connection()
+        build_email(message, get_email_connection()).send()
+
+
+@shared_task(bind=True, max_retries=EMAIL_MAX_RETRIES)
+def send_emails(self, messages: List[Dict]):
+    """
+    Render and send a batch of queued emails over the connection the worker
+    process keeps open, instead of one connection per email.
+
+    When sending fails, the messages not sent yet are retried with an
+    exponential backoff; messages whose recipients are refused are dropped.
+
+    Args:
+        messages (List[Dict]): Messages as queued by ``accounts.emails.queue_email``.
+    """
+    for index, message in enumerate(messages):
+        try:
+            _send_email(message)
+        except SMTPRecipientsRefused:
+            logger.warning('Dropped an email to refused recipients %s', message['to'])
+        except (SMTPException, OSError) as exc:
+            close_email_connection()
+            countdown = min(EMAIL_RETRY_BACKOFF * 2 ** self.request.retries, EMAIL_RETRY_BACKOFF_MAX)
+            raise self.retry(args=(messages[index:],), exc=exc, countdown=countdown)
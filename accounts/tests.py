@@ -1,3 +1,334 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO
+from smtplib import SMTPRecipientsRefused, SMTPServerDisconnected
+from unittest import mock
 
-# Create your tests here.
+from celery.exceptions import Retry
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from personalized_dictionary.testing import SimpleTestCase, TestCase
+from .emails import queue_email
+from .images import (
+    IMAGE_DERIVATIVE_SIZES, derivative_name, generate_derivatives, image_derivatives_generated, modern_formats,
+    negotiate_derivative,
+)
+from .models import CustomUser, MediaBlob
+from .storage import blob_hash, image_storage
+from .tasks import (
+    BLOB_GRACE_PERIOD, EMAIL_RETRY_BACKOFF, EMAIL_RETRY_BACKOFF_MAX, collect_orphaned_blobs,
+    generate_image_derivatives, send_emails,
+)
+
+
+def image_bytes(image_format: str, color: str = 'red', size=(4, 4), mode: str = 'RGB') -> bytes:
+    """Return an image encoded in the given Pillow format."""
+    buffer = BytesIO()
+    Image.new(mode, size, color).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class MediaTestCase(TestCase):
+    """``TestCase`` storing media files in a temporary directory of its own."""
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.storage = image_storage()
+
+
+class MediaBlobTests(MediaTestCase):
+    """
+    Tests of the content-addressed image storage, the reference counts of
+    its blobs and the collection of the blobs nothing references.
+    """
+
+    def age(self, name: str, storage=None):
+        """Make a stored file older than the grace period."""
+        modified = (timezone.now() - BLOB_GRACE_PERIOD - timedelta(hours=1)).timestamp()
+        os.utime((storage or self.storage).path(name), (modified, modified))
+
+    def test_same_content_is_one_blob_whatever_its_extension(self):
+        content = image_bytes('JPEG')
+        names = {
+            self.storage.save(name, ContentFile(content))
+            for name in ('photo.jpg', 'photo.jpeg', 'PHOTO.JPG', 'photo.png')
+        }
+
+        self.assertEqual(len(names), 1)
+        name = names.pop()
+        self.assertTrue(name.endswith('.jpg'), name)
+        self.assertEqual(len(os.listdir(os.path.dirname(self.storage.path(name)))), 1)
+
+        png = self.storage.save('drawing.jpg', ContentFile(image_bytes('PNG')))
+        self.assertTrue(png.endswith('.png'), png)
+
+    def test_reference_and_release(self):
+        name = self.storage.save('photo.jpg', ContentFile(image_bytes('JPEG')))
+
+        MediaBlob.objects.reference(name)
+        MediaBlob.objects.reference(name)
+        MediaBlob.objects.reference('default.jpeg')
+        self.assertEqual(MediaBlob.objects.get(name=name).reference_count, 2)
+        self.assertFalse(MediaBlob.objects.filter(name='default.jpeg').exists())
+
+        for _ in range(3):
+            MediaBlob.objects.release(name)
+        self.assertEqual(MediaBlob.objects.get(name=name).reference_count, 0)
+
+    def test_profile_images_are_referenced_and_released(self):
+        user = CustomUser.objects.create_user(email='owner@example.com', password='password', username='owner')
+        profile = user.profile
+
+        profile.image = SimpleUploadedFile('me.jpeg', image_bytes('JPEG'))
+        profile.save()
+        first = profile.image.name
+        self.assertEqual(MediaBlob.objects.get(name=first).reference_count, 1)
+
+        profile.image = SimpleUploadedFile('me.png', image_bytes('PNG'))
+        profile.save()
+        self.assertEqual(MediaBlob.objects.get(name=first).reference_count, 0)
+        self.assertEqual(MediaBlob.objects.get(name=profile.image.name).reference_count, 1)
+
+        profile.delete()
+        self.assertEqual(MediaBlob.objects.get(name=profile.image.name).reference_count, 0)
+
+    def test_collect_orphaned_blobs(self):
+        stale = timezone.now() - BLOB_GRACE_PERIOD - timedelta(hours=1)
+        names = {
+            color: self.storage.save(f'{color}.jpg', ContentFile(image_bytes('JPEG', color)))
+            for color in ('red', 'green', 'blue', 'white', 'black')
+        }
+        MediaBlob.objects.create(name=names['red'], reference_count=1, updated_at=stale)
+        MediaBlob.objects.create(name=names['green'], reference_count=0, updated_at=stale)
+        MediaBlob.objects.create(name=names['blue'], reference_count=0)
+        # white is a file without a row, left by a rolled back save; black is one just written
+        for color in ('red', 'green', 'blue', 'white'):
+            self.age(names[color])
+        derivatives = {
+            color: default_storage.save(derivative_name(blob_hash(names[color]), 'thumb', 'jpg'), ContentFile(b''))
+            for color in ('red', 'green', 'white')
+        }
+
+        self.assertEqual(collect_orphaned_blobs(), 2)
+
+        self.assertCountEqual(
+            [color for color, name in names.items() if self.storage.exists(name)], ['red', 'blue', 'black']
+        )
+        self.assertCountEqual(MediaBlob.objects.values_list('name', flat=True), [names['red'], names['blue']])
+        self.assertCountEqual(
+            [color for color, name in derivatives.items() if default_storage.exists(name)], ['red']
+        )
+
+    def test_saving_an_orphan_again_restarts_its_grace_period(self):
+        content = image_bytes('JPEG')
+        name = self.storage.save('photo.jpg', ContentFile(content))
+        self.age(name)
+
+        self.assertEqual(self.storage.save('again.jpeg', ContentFile(content)), name)
+        self.assertEqual(collect_orphaned_blobs(), 0)
+        self.assertTrue(self.storage.exists(name))
+
+
+class ImageDerivativeTests(MediaTestCase):
+    """
+    Derivatives are generated once per image content, and only recorded on
+    rows whose image is still the one they were generated from.
+    """
+    def setUp(self):
+        super().setUp()
+        user = CustomUser.objects.create_user(email='owner@example.com', password='password', username='owner')
+        self.profile = user.profile
+        self.profile.image = SimpleUploadedFile('me.jpg', image_bytes('JPEG', size=(1000, 600)))
+        self.profile.save()
+
+    def test_generate_derivatives(self):
+        content_hash, derivatives = generate_derivatives(self.profile.image)
+
+        self.assertEqual(content_hash, blob_hash(self.profile.image.name))
+        self.assertEqual({size: derivative['width'] for size, derivative in derivatives.items()},
+                         {'thumb': 128, 'card': 480, 'print': 1000})
+        for size in IMAGE_DERIVATIVE_SIZES:
+            self.assertEqual(derivatives[size]['name'], derivative_name(content_hash, size, 'jpg'))
+            for extension in ('jpg', *(f.lower() for f in modern_formats())):
+                with default_storage.open(derivative_name(content_hash, size, extension)) as file, \
+                        Image.open(file) as derivative:
+                    self.assertEqual(derivative.width, derivatives[size]['width'])
+
+    def test_transparent_images_fall_back_to_png(self):
+        self.profile.image = SimpleUploadedFile('me.png', image_bytes('PNG', (0, 0, 0, 0), (10, 10), 'RGBA'))
+        self.profile.save()
+
+        _content_hash, derivatives = generate_derivatives(self.profile.image)
+        self.assertTrue(derivatives['thumb']['name'].endswith('/thumb.png'))
+
+    def test_derivatives_are_reused_by_content(self):
+        expected = generate_derivatives(self.profile.image)
+        with mock.patch('accounts.images.resize_image') as resize_image:
+            self.assertEqual(generate_derivatives(self.profile.image), expected)
+        resize_image.assert_not_called()
+
+    def test_task_records_derivatives(self):
+        receiver = mock.Mock()
+        image_derivatives_generated.connect(receiver)
+        self.addCleanup(image_derivatives_generated.disconnect, receiver)
+
+        generate_image_derivatives(self.profile._meta.label, self.profile.pk)
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.image_hash, blob_hash(self.profile.image.name))
+        self.assertEqual(set(self.profile.image_derivatives), set(IMAGE_DERIVATIVE_SIZES))
+        self.assertEqual(receiver.call_args.kwargs['instance'].pk, self.profile.pk)
+
+    def test_task_skips_rows_whose_image_changed(self):
+        receiver = mock.Mock()
+        image_derivatives_generated.connect(receiver)
+        self.addCleanup(image_derivatives_generated.disconnect, receiver)
+        newer = self.storage.save('newer.jpg', ContentFile(image_bytes('JPEG', 'blue')))
+
+        def generate_while_image_changes(field_file):
+            type(self.profile).objects.filter(pk=self.profile.pk).update(image=newer)
+            return generate_derivatives(field_file)
+
+        with mock.patch('accounts.tasks.generate_derivatives', side_effect=generate_while_image_changes):
+            generate_image_derivatives(self.profile._meta.label, self.profile.pk)
+
+        self.profile.refresh_from_db()
+        self.assertEqual((self.profile.image_hash, self.profile.image_derivatives), ('', {}))
+        receiver.assert_not_called()
+
+
+class ImageDerivativeServingTests(MediaTestCase):
+    """
+    Derivatives are served in the most preferred modern format the browser
+    accepts, falling back to JPEG or PNG, and may be cached forever.
+    """
+    content_hash = 'a' * 64
+
+    def setUp(self):
+        super().setUp()
+        for extension in ('avif', 'webp', 'jpg'):
+            default_storage.save(derivative_name(self.content_hash, 'card', extension), ContentFile(extension))
+
+    def negotiate(self, accept, file_name='card.jpg'):
+        derivative = negotiate_derivative(self.content_hash, file_name, accept)
+        return derivative and derivative[1]
+
+    def test_negotiation(self):
+        cases = {
+            'image/avif,image/webp,image/*,*/*;q=0.8': 'image/avif',
+            'image/webp,*/*': 'image/webp',
+            'image/avif;q=0, image/webp;q=0.5': 'image/webp',
+            'image/avif; q=0.0 ,image/webp;q=0.000': 'image/jpeg',
+            'IMAGE/AVIF': 'image/avif',
+            '*/*': 'image/jpeg',
+            '': 'image/jpeg',
+        }
+        for accept, content_type in cases.items():
+            with self.subTest(accept=accept):
+                self.assertEqual(self.negotiate(accept), content_type)
+
+    def test_missing_modern_formats_fall_back(self):
+        default_storage.delete(derivative_name(self.content_hash, 'card', 'avif'))
+        self.assertEqual(self.negotiate('image/avif,image/webp'), 'image/webp')
+        default_storage.delete(derivative_name(self.content_hash, 'card', 'webp'))
+        self.assertEqual(self.negotiate('image/avif,image/webp'), 'image/jpeg')
+        default_storage.delete(derivative_name(self.content_hash, 'card', 'jpg'))
+        self.assertIsNone(self.negotiate('image/avif,image/webp'))
+
+    def test_serve(self):
+        url = reverse('accounts:image_derivative', kwargs={'content_hash': self.content_hash, 'file_name': 'card.jpg'})
+        response = self.client.get(url, HTTP_ACCEPT='image/webp,*/*')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertEqual(b''.join(response.streaming_content), b'webp')
+        self.assertIn('Accept', response['Vary'])
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_unknown_derivatives_are_not_found(self):
+        for file_name in ('card.gif', 'huge.jpg', 'thumb.jpg'):
+            with self.subTest(file_name=file_name):
+                url = reverse('accounts:image_derivative', kwargs={
+                    'content_hash': self.content_hash, 'file_name': file_name,
+                })
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class SendEmailsTests(SimpleTestCase):
+    """
+    Tests of the task sending queued emails: failures retry the messages
+    not sent yet with an exponential backoff, refused recipients are dropped.
+    """
+    messages = [
+        {'subject': f'Message {index}', 'template_name': 'email.html', 'context': {},
+         'to': [f'user{index}@example.com'], 'from_email': 'noreply@example.com'}
+        for index in range(3)
+    ]
+
+    def send(self, side_effect, retries=0):
+        """Run the task with ``_send_email`` mocked, returning the mock and the retry mock."""
+        with mock.patch('accounts.tasks._send_email', side_effect=side_effect) as send_email, \
+                mock.patch.object(send_emails, 'retry', return_value=Retry()) as retry:
+            try:
+                send_emails.apply(args=(self.messages,), retries=retries, throw=True)
+            except Retry:
+                pass
+        return send_email, retry
+
+    def test_sends_every_message(self):
+        send_email, retry = self.send(None)
+
+        self.assertEqual([call.args[0] for call in send_email.call_args_list], self.messages)
+        retry.assert_not_called()
+
+    def test_failure_retries_the_remaining_messages_with_backoff(self):
+        for retries, countdown in ((0, EMAIL_RETRY_BACKOFF), (2, EMAIL_RETRY_BACKOFF * 4),
+                                   (10, EMAIL_RETRY_BACKOFF_MAX)):
+            with self.subTest(retries=retries):
+                error = SMTPServerDisconnected()
+                send_email, retry = self.send([None, error], retries=retries)
+
+                self.assertEqual(send_email.call_count, 2)
+                retry.assert_called_once_with(args=(self.messages[1:],), exc=error, countdown=countdown)
+
+    def test_refused_recipients_are_dropped(self):
+        refused = SMTPRecipientsRefused({'user0@example.com': (550, b'No such user')})
+        with self.assertLogs('accounts.tasks', 'WARNING') as logs:
+            send_email, retry = self.send([refused, None, None])
+
+        self.assertEqual(send_email.call_count, 3)
+        retry.assert_not_called()
+        self.assertIn('user0@example.com', logs.output[0])
+
+
+class QueueEmailTests(TestCase):
+    """
+    Emails are queued once the transaction commits, except those queued in
+    a savepoint that was rolled back.
+    """
+    def test_rolled_back_savepoints_drop_their_emails(self):
+        with mock.patch.object(send_emails, 'delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                queue_email('Kept', 'email.html', {}, ['kept@example.com'])
+                try:
+                    with transaction.atomic():
+                        queue_email('Dropped', 'email.html', {}, ['dropped@example.com'])
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+                delay.assert_not_called()
+
+        self.assertEqual([call.args[0][0]['to'] for call in delay.call_args_list], [['kept@example.com']])
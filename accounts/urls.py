@@ -2,7 +2,7 @@ from django.contrib.auth.views import (
     PasswordResetDoneView,
     PasswordResetCompleteView
 )
-from django.urls import path, include
+from django.urls import path, include, re_path
 
 from . import views
 
@@ -27,4 +27,8 @@ urlpatterns = [
     ),name='password_reset_complete'),
     path('profile/<slug:user_slug>/', views.view_user_profile, name='view_profile'),
     path('profile/<slug:user_slug>/update/', views.update_profile, name='update_profile'),
+    re_path(
+        r'^images/(?P<content_hash>[0-9a-f]{64})/(?P<file_name>[a-z]+\.[a-z]+)$',
+        views.serve_image_derivative, name='image_derivative',
+    ),
 ]
@@ -1,17 +1,15 @@
-from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils.encoding import force_bytes
-from django.utils.html import strip_tags
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 
+from accounts.emails import queue_email
 from accounts.models import CustomUser
 
 
 def send_verification_email(user: CustomUser, name=None):
     """
-    Send email verification link to user.
+    Queue the email with the verification link of a user.
 
     Args:
         user (CustomUser): User to send verification email to.
@@ -24,23 +22,15 @@ def send_verification_email(user: CustomUser, name=None):
 
     verification_link = f"{current_site}{reverse('accounts:verify_email', kwargs={'uidb64': uidb64, 'token': token})}"
 
-    html_content = render_to_string(
+    queue_email(
+        subject,
         "accounts/verification-email.html",
         context={
             "name": name or user.username,
             "verification_link": verification_link
         },
-    )
-    plain_message = strip_tags(html_content)
-
-    email = EmailMultiAlternatives(
-        subject=subject,
-        body=plain_message,
-        from_email=settings.EMAIL_HOST_USER,
         to=(user.email,),
     )
-    email.attach_alternative(html_content, "text/html")
-    email.send()
 
 
 def get_user_from_token(uidb64: str, token: str) -> CustomUser:
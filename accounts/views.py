@@ -6,19 +6,24 @@ from django.contrib.auth.views import (LoginView, LogoutView,
                                        PasswordResetConfirmView,
                                        PasswordResetView)
 from django.core.exceptions import PermissionDenied
-from django.http import Http404, HttpRequest, HttpResponse
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse, reverse_lazy
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_safe
+from django.views.decorators.vary import vary_on_headers
 
-from dictionary.models import Language
 from leaderboard.models import UserStatistics
 from .decorators import verified_email_required
 from .forms import (CustomAuthenticationForm, CustomPasswordResetForm,
                     CustomSetPasswordForm, CustomUserCreationForm,
                     UserProfileUpdateForm, UserUpdateForm)
+from .images import negotiate_derivative
 from .models import CustomUser, UserProfile
+from .storage import BLOB_CACHE_MAX_AGE
 from .utils import send_verification_email, get_user_from_token
 
 
@@ -201,15 +206,11 @@ def update_profile(request: HttpRequest, user_slug: str) -> HttpResponse:
         user_form = UserUpdateForm(instance=user)
         profile_form = UserProfileUpdateForm(instance=profile)
 
-    folder_languages = Language.objects.filter(
-            folders__user = user
-        ).distinct()
-
     context = {
         'user_form': user_form,
         'profile_form': profile_form,
         'MEDIA_URL': settings.MEDIA_URL,
-        'folder_languages': folder_languages,
+        'folder_languages': user.folder_languages,
     }
 
     return render(request, 'accounts/profile-update.html', context)
@@ -227,9 +228,7 @@ def view_user_profile(request: HttpRequest, user_slug: str) -> HttpResponse:
         HttpResponse: Rendered user profile page.
     """
     try:
-        page_user = CustomUser.annotate_all_statistics(
-            CustomUser.objects.filter(slug=user_slug)
-        ).select_related('profile').get(slug=user_slug)
+        page_user = CustomUser.objects.select_related('profile').get(slug=user_slug)
     except CustomUser.DoesNotExist:
         raise Http404(_('User does not exist'))
 
@@ -238,15 +237,12 @@ def view_user_profile(request: HttpRequest, user_slug: str) -> HttpResponse:
     except Profile.DoesNotExist:
         profile = None
 
-    folder_languages = Language.objects.filter(
-            folders__user = page_user
-        ).distinct()
     statistics = UserStatistics.objects.get(user=page_user)
 
     context = {
         'page_user': page_user,
         'profile': profile,
-        'folder_languages': folder_languages,
+        'folder_languages': page_user.folder_languages,
         'statistics': statistics,
     }
 
@@ -266,3 +262,29 @@ def user_logout(request: HttpRequest) -> HttpResponse:
     """
     logout(request)
     return redirect('accounts:login')
+
+
+@require_safe
+@vary_on_headers('Accept')
+@cache_control(public=True, max_age=BLOB_CACHE_MAX_AGE, immutable=True)
+def serve_image_derivative(request: HttpRequest, content_hash: str, file_name: str) -> FileResponse:
+    """
+    Serve an image derivative in the best format the browser accepts.
+
+    Derivatives never change once generated, so responses may be cached
+    for as long as caches take ``Vary: Accept`` into account.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+        content_hash (str): Content hash of the source image.
+        file_name (str): File name of the JPEG or PNG derivative, e.g., ``card.jpg``.
+
+    Returns:
+        FileResponse: The derivative file.
+    """
+    derivative = negotiate_derivative(content_hash, file_name, request.headers.get('Accept', ''))
+    if derivative is None:
+        raise Http404(_('Image does not exist'))
+
+    name, content_type = derivative
+    return FileResponse(default_storage.open(name), content_type=content_type)
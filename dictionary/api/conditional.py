@@ -0,0 +1,69 @@
+import hashlib
+from datetime import datetime
+from typing import Optional, Tuple
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    A view mixin answering conditional GET requests with 304 Not Modified.
+
+    Views implement ``get_resource_version`` as a cheap lookup of the
+    version of the data behind the response. The ETag combines that version
+    with everything else the response depends on (the full path with its
+    filters, cursor and fieldsets, the requesting user and the negotiated
+    media type), so a matching ``If-None-Match`` is answered before any
+    queryset is evaluated or any serializer runs.
+
+    The ``list`` and ``retrieve`` actions of viewsets are handled
+    automatically; other views call ``conditional_response`` themselves.
+    """
+    def get_resource_version(self) -> Optional[Tuple[str, Optional[datetime]]]:
+        """
+        Return a version token and, optionally, the last modification time
+        of the requested resource, or None to skip conditional handling.
+        """
+        raise NotImplementedError
+
+    def get_etag(self, request, version: str) -> str:
+        """
+        Build the quoted ETag of the response for the given resource version.
+        """
+        user = request.user.pk if request.user.is_authenticated else ''
+        media_type = getattr(request, 'accepted_media_type', '')
+        key = '|'.join((version, request.get_full_path(), str(user), media_type))
+        return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        """
+        Answer with 304 if the client's copy is current, otherwise call the
+        handler and tag its response with ``ETag`` and ``Last-Modified``.
+        """
+        version = self.get_resource_version()
+        if version is None:
+            return handler(request, *args, **kwargs)
+
+        token, last_modified = version
+        etag = self.get_etag(request, token)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        # The ETag differs by user and media type, and so may the response
+        patch_vary_headers(response, ('Accept', 'Authorization', 'Cookie'))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().retrieve, *args, **kwargs)
@@ -0,0 +1,164 @@
+from collections import defaultdict
+
+from rest_framework.settings import api_settings
+
+from accounts.images import get_image_urls
+from dictionary.languages import get_language, get_language_registry
+from dictionary.models import DictionaryEntry, Example, Meaning
+
+
+class ValuesListSerializer:
+    """
+    Read-only serializer rendering a page of ``values()`` rows with plain dicts.
+
+    It bypasses DRF field instantiation and introspection for hot list
+    endpoints, yet produces exactly the same data as its ``ModelSerializer``
+    counterpart. Nested rows are loaded with one ``values_list`` query per
+    relation for the whole page.
+
+    Subclasses declare the ``values_fields`` their ``to_representation``
+    needs; views select them with ``queryset.values(*values_fields)``.
+    """
+    values_fields = ()
+
+    def __init__(self, instance=None, many=True, context=None):
+        self.instance = instance
+        self.context = context or {}
+
+    @property
+    def data(self) -> list:
+        rows = list(self.instance)
+        return self.to_representation(rows)
+
+    def to_representation(self, rows: list) -> list:
+        raise NotImplementedError
+
+    @staticmethod
+    def get_meanings(entry_ids) -> dict:
+        """
+        Return the rendered meanings of the given entries, keyed by entry id.
+        """
+        languages = get_language_registry().by_pk
+        meanings = defaultdict(list)
+        rows = Meaning.objects.filter(entry_id__in=entry_ids).order_by('pk').values_list(
+            'entry_id', 'description', 'target_language_id'
+        )
+        for entry_id, description, language_id in rows:
+            language = languages.get(language_id) or get_language(pk=language_id)
+            meanings[entry_id].append({'description': description, 'target_language': language.name})
+        return meanings
+
+    @staticmethod
+    def get_examples(entry_ids) -> dict:
+        """
+        Return the rendered examples of the given entries, keyed by entry id.
+        """
+        examples = defaultdict(list)
+        rows = Example.objects.filter(entry_id__in=entry_ids).order_by('pk').values_list(
+            'entry_id', 'sentence', 'source'
+        )
+        for entry_id, sentence, source in rows:
+            examples[entry_id].append({'sentence': sentence, 'source': source})
+        return examples
+
+
+class FastDictionaryEntrySerializer(ValuesListSerializer):
+    """
+    Fast path equivalent of ``DictionaryEntrySerializer`` for entry listings.
+    """
+    values_fields = ('id', 'word', 'notes', 'image', 'image_derivatives', 'created_at')
+
+    def get_image_url(self, name):
+        """
+        Render an image the way DRF's ``ImageField`` does.
+        """
+        if not name:
+            return None
+        if not api_settings.UPLOADED_FILES_USE_URL:
+            return name
+        url = DictionaryEntry._meta.get_field('image').storage.url(name)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+    def get_image_urls(self, name, derivatives):
+        """
+        Render image derivatives the way ``ImageURLsField`` does.
+        """
+        urls = get_image_urls(name, derivatives, DictionaryEntry._meta.get_field('image').storage)
+        request = self.context.get('request')
+        if urls is None or request is None:
+            return urls
+        return {size: request.build_absolute_uri(url) for size, url in urls.items()}
+
+    def to_representation(self, rows: list) -> list:
+        entry_ids = [row['id'] for row in rows]
+        meanings = self.get_meanings(entry_ids)
+        examples = self.get_examples(entry_ids)
+        return [
+            {
+                'id': row['id'],
+                'word': row['word'],
+                'meanings': meanings.get(row['id'], []),
+                'examples': examples.get(row['id'], []),
+                'notes': row['notes'],
+                'image': self.get_image_url(row['image']),
+                'image_urls': self.get_image_urls(row['image'], row['image_derivatives']),
+            }
+            for row in rows
+        ]
+
+
+class FastSearchDictionaryEntrySerializer(ValuesListSerializer):
+    """
+    Fast path equivalent of ``SearchDictionaryEntrySerializer`` for search results.
+    """
+    values_fields = (
+        'id', 'word', 'created_at', 'dictionary__name',
+        'dictionary__folder__user_id',
+        'dictionary__folder__user__username',
+        'dictionary__folder__user__email',
+    )
+
+    def to_representation(self, rows: list) -> list:
+        meanings = self.get_meanings([row['id'] for row in rows])
+        return [
+            {
+                'id': row['id'],
+                'word': row['word'],
+                'author': {
+                    'id': row['dictionary__folder__user_id'],
+                    'username': row['dictionary__folder__user__username'],
+                    'email': row['dictionary__folder__user__email'],
+                },
+                'dictionary': row['dictionary__name'],
+                'meanings': meanings.get(row['id'], []),
+            }
+            for row in rows
+        ]
+
+
+class FastPathMixin:
+    """
+    A view mixin serving JSON list responses through a ``ValuesListSerializer``.
+
+    Requests that ask for sparse fieldsets, other actions and other
+    renderers (such as the browsable API) keep using the regular serializer.
+    """
+    fast_serializer_class = None
+
+    def use_fast_path(self) -> bool:
+        request = self.request
+        if request is None or getattr(self, 'action', 'list') != 'list':
+            return False
+        renderer = getattr(request, 'accepted_renderer', None)
+        return (
+            request.method == 'GET'
+            and renderer is not None and renderer.format == 'json'
+            and 'fields' not in request.query_params
+            and 'expand' not in request.query_params
+        )
+
+    def get_serializer_class(self):
+        if self.use_fast_path():
+            return self.fast_serializer_class
+        return super().get_serializer_class()
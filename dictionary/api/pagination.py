@@ -0,0 +1,43 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Cursor pagination over the newest-first ``created_at`` ordering.
+
+    Avoids the ``COUNT(*)`` and deep ``OFFSET`` scans of page number
+    pagination, so every page costs about the same regardless of its depth.
+
+    The cursor position is the ``created_at`` of the last row only; rows
+    sharing it with the previous page are skipped with an offset, which
+    ``id`` as the second ordering field keeps stable. Timestamps rarely
+    tie, so the offset stays small.
+    """
+    page_size = 10
+    ordering = ('-created_at', '-id')
+
+
+class DictionaryEntryCursorPagination(CreatedAtCursorPagination):
+    """
+    Cursor pagination for dictionary entries.
+
+    Honours the ``ordering`` query parameter of the entry filter by mapping it
+    to an ordering with ``id`` as the second field. Words are unique within
+    a dictionary, so word cursors never need an offset.
+    """
+    ordering_param = 'ordering'
+    orderings = {
+        'word': ('word', 'id'),
+        '-word': ('-word', '-id'),
+        'created_at': ('created_at', 'id'),
+        '-created_at': ('-created_at', '-id'),
+    }
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the ordering requested by the client, or the default one.
+        """
+        return self.orderings.get(
+            request.query_params.get(self.ordering_param),
+            self.ordering
+        )
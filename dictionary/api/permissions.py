@@ -27,7 +27,7 @@ class IsFolderAuthorOrReadOnly(permissions.BasePermission):
             if view.action != 'download_folder_pdf':
                 return True
 
-        if instance.user == request.user:
+        if instance.user_id == request.user.pk:
             return True
 
         return False
@@ -56,7 +56,7 @@ class IsDictionaryAuthorOrReadOnly(permissions.BasePermission):
         if request.method == 'POST':
             folder = getattr(request, '_cached_folder', None)
             if folder:
-                return folder.user == request.user
+                return folder.user_id == request.user.pk
             return False
 
         return True
@@ -78,10 +78,10 @@ class IsDictionaryAuthorOrReadOnly(permissions.BasePermission):
                 return True
 
         if isinstance(instance, Dictionary):
-            if instance.folder.user == request.user:
+            if instance.folder.user_id == request.user.pk:
                 return True
         elif isinstance(instance, DictionaryEntry):
-            if instance.dictionary.folder.user == request.user:
+            if instance.dictionary.folder.user_id == request.user.pk:
                 return True
 
         return False
@@ -1,9 +1,117 @@
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from rest_framework.fields import CurrentUserDefault, DateTimeField
+from rest_framework.permissions import SAFE_METHODS
 
+from accounts.api.serializers import ImageURLsField
 from accounts.models import CustomUser
+from dictionary.languages import get_language
 from dictionary.models import *
+from dictionary.utils import bulk_create_examples, bulk_create_meanings, sync_examples, sync_meanings
+
+
+def parse_fieldset(value: str) -> dict:
+    """
+    Parse a comma-separated list of (possibly dotted) field names.
+
+    ``'id,entries.word,entries.meanings'`` becomes
+    ``{'id': '', 'entries': 'word,meanings'}``, where each value is the
+    fieldset to apply to the nested serializer.
+
+    Args:
+        value (str): Raw query parameter value.
+
+    Returns:
+        dict: Mapping of top-level field name to its nested fieldset.
+    """
+    fieldset = {}
+    for name in filter(None, (name.strip() for name in value.split(','))):
+        head, _dot, rest = name.partition('.')
+        nested = fieldset.setdefault(head, [])
+        if rest:
+            nested.append(rest)
+    return {name: ','.join(nested) for name, nested in fieldset.items()}
+
+
+class DynamicFieldsMixin:
+    """
+    Serializer mixin adding sparse fieldsets and expandable fields to reads.
+
+    ``?fields=id,name,entries.word`` keeps only the listed fields, with dotted
+    names selecting fields of nested serializers. ``?expand=entries`` adds
+    the nested serializers declared in ``Meta.expandable_fields``, which are
+    otherwise left out. Selecting an expandable field in ``fields`` expands it too.
+    """
+    def get_fieldset(self) -> tuple:
+        """
+        Return the requested ``(fields, expand)`` fieldsets of this serializer.
+
+        The root serializer reads them from the query parameters of safe
+        requests; nested serializers receive them from their parent.
+        """
+        if hasattr(self, '_fieldset'):
+            return self._fieldset
+
+        request = self.context.get('request')
+        is_root = self.root is self or getattr(self.root, 'child', None) is self
+        if not is_root or request is None or request.method not in SAFE_METHODS:
+            return None, {}
+
+        fields = request.query_params.get('fields')
+        expand = request.query_params.get('expand', '')
+        return (
+            parse_fieldset(fields) if fields is not None else None,
+            parse_fieldset(expand)
+        )
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected, expanded = self.get_fieldset()
+
+        expandable_fields = getattr(self.Meta, 'expandable_fields', {})
+        for name, (serializer_class, kwargs) in expandable_fields.items():
+            if name in expanded or (selected is not None and name in selected):
+                fields[name] = serializer_class(**kwargs)
+
+        if selected is not None:
+            for name in list(fields):
+                if name not in selected:
+                    fields.pop(name)
+
+        for name, field in fields.items():
+            nested = getattr(field, 'child', field)
+            if isinstance(nested, DynamicFieldsMixin):
+                nested_selected = selected.get(name) if selected is not None else ''
+                nested._fieldset = (
+                    parse_fieldset(nested_selected) if nested_selected else None,
+                    parse_fieldset(expanded.get(name, ''))
+                )
+        return fields
+
+
+def get_prefetch_lookups(serializer, prefix: str = '') -> list:
+    """
+    Return the ``prefetch_related`` lookups needed to render a serializer.
+
+    Every nested list serializer whose source is a direct relation adds a
+    lookup, so the queryset prefetches exactly the shape that is rendered.
+
+    Args:
+        serializer: Serializer (or list serializer) instance.
+        prefix (str): Lookup prefix of the serializer's relation.
+
+    Returns:
+        list: Prefetch lookups, parents before children.
+    """
+    serializer = getattr(serializer, 'child', serializer)
+    lookups = []
+    for field in serializer.fields.values():
+        if isinstance(field, serializers.ListSerializer) and '.' not in field.source:
+            lookup = prefix + field.source
+            lookups.append(lookup)
+            lookups.extend(get_prefetch_lookups(field.child, f'{lookup}__'))
+    return lookups
 
 
 class MiniCustomUserSerializer(serializers.ModelSerializer):
@@ -25,6 +133,37 @@ class FormattedDateTimeField(DateTimeField):
         return value.strftime('%d/%m/%Y at %H:%M')
 
 
+class LanguageNameField(serializers.RelatedField):
+    """
+    Related field representing a language by its name.
+
+    Both directions are resolved through the in-process language registry,
+    so neither validation nor serialization queries the Language table.
+    """
+    default_error_messages = {
+        'does_not_exist': _('Language "{value}" does not exist.'),
+        'invalid': _('Invalid value.'),
+    }
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', Language.objects.all())
+        super().__init__(**kwargs)
+
+    def use_pk_only_optimization(self):
+        return True
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        try:
+            return get_language(name=data)
+        except Language.DoesNotExist:
+            self.fail('does_not_exist', value=data)
+
+    def to_representation(self, value):
+        return get_language(pk=value.pk).name
+
+
 class LanguageSerializer(serializers.ModelSerializer):
     """
     Serializer for Language model, exposing only the name field.
@@ -47,19 +186,16 @@ class MeaningSerializer(serializers.ModelSerializer):
     """
     Serializer for dictionary entry meanings.
 
-    Includes description and target language as a slug-related field.
+    Includes description and target language by name.
     """
-    target_language = serializers.SlugRelatedField(
-        queryset=Language.objects.all(),
-        slug_field='name',
-    )
+    target_language = LanguageNameField()
 
     class Meta:
         model = Meaning
         fields = ('description', 'target_language')
 
 
-class DictionaryEntrySerializer(serializers.ModelSerializer):
+class DictionaryEntrySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Comprehensive serializer for dictionary entries.
 
@@ -67,13 +203,14 @@ class DictionaryEntrySerializer(serializers.ModelSerializer):
     """
     examples = ExampleSerializer(many=True)
     meanings = MeaningSerializer(many=True)
+    image_urls = ImageURLsField()
 
     class Meta:
         model = DictionaryEntry
-        fields = ('id', 'word', 'meanings', 'examples', 'notes', 'image')
+        fields = ('id', 'word', 'meanings', 'examples', 'notes', 'image', 'image_urls')
 
 
-class DictionarySerializer(serializers.ModelSerializer):
+class DictionarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for Dictionary model with nested entries.
 
@@ -86,15 +223,19 @@ class DictionarySerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'description', 'accessibility', 'entries')
 
 
-class MiniDictionarySerializer(serializers.ModelSerializer):
+class MiniDictionarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Minimal serializer for Dictionary model.
 
+    Entries are only included when expanded.
     Supports custom create and update methods with folder context.
     """
     class Meta:
         model = Dictionary
         fields = ('id', 'name', 'description', 'accessibility')
+        expandable_fields = {
+            'entries': (DictionaryEntrySerializer, {'many': True, 'read_only': True}),
+        }
 
     def create(self, validated_data: dict) -> Dictionary:
         """
@@ -133,7 +274,7 @@ class MiniDictionarySerializer(serializers.ModelSerializer):
         return instance
 
 
-class DictionaryFolderSerializer(serializers.ModelSerializer):
+class DictionaryFolderSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Comprehensive serializer for DictionaryFolder model.
 
@@ -164,9 +305,10 @@ class DictionaryFolderSerializer(serializers.ModelSerializer):
         """
         request = self.context.get('request')
         language_data = validated_data.pop('language')
-        language = Language.objects.filter(
-            name=language_data['name']
-        ).first()
+        try:
+            language = get_language(name=language_data['name'])
+        except Language.DoesNotExist:
+            raise serializers.ValidationError({'language': _('Language not found.')})
         folder = DictionaryFolder.objects.create(
             user=request.user,
             language=language,
@@ -192,7 +334,10 @@ class DictionaryFolderSerializer(serializers.ModelSerializer):
         instance.name = validated_data.get('name', instance.name).title()
 
         if language_data:
-            language = Language.objects.get(name=language_data['name'])
+            try:
+                language = get_language(name=language_data['name'])
+            except Language.DoesNotExist:
+                raise serializers.ValidationError({'language': _('Language not found.')})
             instance.language = language
 
         instance.accessibility = validated_data.get('accessibility', instance.accessibility)
@@ -267,6 +412,7 @@ class CreateDictionaryEntrySerializer(serializers.ModelSerializer):
         model = DictionaryEntry
         fields = ('word', 'meanings', 'examples', 'notes', 'image')
 
+    @transaction.atomic
     def create(self, validated_data: dict) -> DictionaryEntry:
         """
         Create a new dictionary entry with meanings and examples.
@@ -287,18 +433,16 @@ class CreateDictionaryEntrySerializer(serializers.ModelSerializer):
 
         view = self.context.get('view')
 
-        try:
-            dictionary = Dictionary.objects.filter(
-                folder__pk=view.kwargs.get('folder_pk'),
-                pk=view.kwargs.get('dictionary_pk')
-            ).first()
-        except Dictionary.DoesNotExist:
+        dictionary = Dictionary.objects.select_related('folder').filter(
+            folder__pk=view.kwargs.get('folder_pk'),
+            pk=view.kwargs.get('dictionary_pk')
+        ).first()
+        if dictionary is None:
             raise serializers.ValidationError(_('Dictionary not found.'))
 
-        user = dictionary.folder.user
         word = validated_data.get('word').title()
 
-        if DictionaryEntry.objects.filter(dictionary__folder__user=user, word=word).exists():
+        if DictionaryEntry.objects.filter(dictionary__folder__user=dictionary.folder.user_id, word=word).exists():
             raise serializers.ValidationError(
                 _('A dictionary entry with this word already exists in your dictionaries.')
             )
@@ -308,19 +452,20 @@ class CreateDictionaryEntrySerializer(serializers.ModelSerializer):
             **validated_data
         )
 
-        for meaning_data in meanings_data:
-            Meaning.objects.create(entry=entry, **meaning_data)
-
-        for example_data in examples_data:
-            Example.objects.create(entry=entry, **example_data)
+        # Seed the prefetch cache so rendering the response does not read the rows back.
+        entry._prefetched_objects_cache = {
+            'meanings': bulk_create_meanings(entry, meanings_data),
+            'examples': bulk_create_examples(entry, examples_data),
+        }
 
         return entry
 
+    @transaction.atomic
     def update(self, instance: DictionaryEntry, validated_data: dict) -> DictionaryEntry:
         """
         Update an existing dictionary entry with new meanings and examples.
 
-        Deletes and recreates nested meanings and examples.
+        Nested meanings and examples are synced, so only changed rows are written.
 
         Args:
             instance (DictionaryEntry): Existing DictionaryEntry to update.
@@ -340,20 +485,16 @@ class CreateDictionaryEntrySerializer(serializers.ModelSerializer):
 
         # Handle the nested `meanings` updates
         if meanings_data:
-            instance.meanings.all().delete()
-            for meaning_data in meanings_data:
-                Meaning.objects.create(entry=instance, **meaning_data)
+            sync_meanings(instance, meanings_data)
 
         # Handle the nested `examples` updates
         if examples_data:
-            instance.examples.all().delete()
-            for example_data in examples_data:
-                Example.objects.create(entry=instance, **example_data)
+            sync_examples(instance, examples_data)
 
         return instance
 
 
-class SearchDictionaryEntrySerializer(serializers.ModelSerializer):
+class SearchDictionaryEntrySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for searching dictionary entries."""
     meanings = MeaningSerializer(many=True)
     author = MiniCustomUserSerializer(source='dictionary.folder.user', read_only=True)
@@ -1,6 +1,6 @@
 import random
 
-from django.template.loader import render_to_string
+from django.http import HttpResponse
 from django_filters import rest_framework as filters
 from drf_spectacular.utils import extend_schema
 from rest_framework import status, viewsets
@@ -10,12 +10,15 @@ from rest_framework.mixins import ListModelMixin, RetrieveModelMixin
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
-from weasyprint import HTML
 
-from accounts.models import CustomUser
+from dictionary.caching import FOLDERS_NAMESPACE, get_cache_generations, user_namespace
+from dictionary.generation import fetch_data_from_openai
 from dictionary.models import Dictionary, DictionaryEntry, DictionaryFolder
-from dictionary.views.entries import fetch_data_from_openai
+from dictionary.pdf import render_pdf
+from .conditional import ConditionalGetMixin
+from .fast import FastDictionaryEntrySerializer, FastPathMixin, FastSearchDictionaryEntrySerializer
 from .filters import *
+from .pagination import CreatedAtCursorPagination, DictionaryEntryCursorPagination
 from .permissions import IsDictionaryAuthorOrReadOnly, IsFolderAuthorOrReadOnly
 from .serializers import (
     CreateDictionaryEntrySerializer,
@@ -25,33 +28,59 @@ from .serializers import (
     FlashcardFrontTypeSerializer,
     InitiateEntrySerializer,
     MiniDictionarySerializer,
-    SearchDictionaryEntrySerializer
+    SearchDictionaryEntrySerializer,
+    get_prefetch_lookups
 )
 
 
 @extend_schema(tags=['Dictionaries'])
-class HomeSearchAPIListView(ListAPIView):
+class HomeSearchAPIListView(FastPathMixin, ListAPIView):
     """
     API view for searching dictionary entries across all dictionaries.
 
-    Provides a paginated list of dictionary entries with
+    Provides a cursor-paginated list of dictionary entries with
     search and filtering capabilities.
     """
     queryset = DictionaryEntry.objects.select_related(
         'dictionary',
         'dictionary__folder__user'
-    ).prefetch_related(
-        'meanings',
-        'meanings__target_language'
-    ).order_by('-created_at')
+    ).order_by('-created_at', '-id')
     serializer_class = SearchDictionaryEntrySerializer
+    fast_serializer_class = FastSearchDictionaryEntrySerializer
     permission_classes = (IsAuthenticatedOrReadOnly,)
+    pagination_class = CreatedAtCursorPagination
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = HomeEntrySearchFilter
 
+    def get_queryset(self):
+        """
+        Prefetch only the relations rendered for the requested fields,
+        or select plain rows for the fast path.
+        """
+        queryset = super().get_queryset()
+        if self.use_fast_path():
+            return queryset.values(*self.fast_serializer_class.values_fields)
+        return queryset.prefetch_related(*get_prefetch_lookups(self.get_serializer()))
+
+
+def folder_content_version(folder):
+    """
+    Return the resource version of a folder and everything inside it.
+
+    Args:
+        folder (DictionaryFolder): Folder, or None if it does not exist.
+
+    Returns:
+        tuple: Version token and last modification time, or None.
+    """
+    if folder is None:
+        return None
+    last_modified = max(filter(None, (folder.updated_at, folder.content_updated_at)))
+    return f'{folder.pk}:{folder.content_version}:{folder.updated_at.isoformat()}', last_modified
+
 
 @extend_schema(tags=['Dictionaries'])
-class DictionaryFolderViewSet(ModelViewSet):
+class DictionaryFolderViewSet(ConditionalGetMixin, ModelViewSet):
     """
     ViewSet for managing dictionary folders.
 
@@ -61,14 +90,42 @@ class DictionaryFolderViewSet(ModelViewSet):
     queryset = DictionaryFolder.objects.select_related(
         'user',
         'language'
-    ).prefetch_related(
-        'dictionaries'
-    ).order_by('-created_at')
+    ).order_by('-created_at', '-id')
     serializer_class = DictionaryFolderSerializer
     permission_classes = (IsAuthenticatedOrReadOnly, IsFolderAuthorOrReadOnly)
+    pagination_class = CreatedAtCursorPagination
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = DictionaryFolderFilter
 
+    def get_queryset(self):
+        """
+        Prefetch only the relations rendered for the requested fields.
+
+        Returns:
+            Queryset of dictionary folders.
+        """
+        return super().get_queryset().prefetch_related(*get_prefetch_lookups(self.get_serializer()))
+
+    def get_resource_version(self):
+        """
+        Version folders by their content versions.
+
+        A single folder is versioned by its own row. A listing is versioned
+        by the cache generation of the user it is filtered by, or of the
+        folders of all users, which the signals bump on every change to
+        folders and their content, so it costs no scan of the folders.
+        """
+        if self.action == 'retrieve':
+            folder = DictionaryFolder.objects.filter(pk=self.kwargs.get('pk')).only(
+                'updated_at', 'content_version', 'content_updated_at'
+            ).first()
+            return folder_content_version(folder)
+
+        user_id = self.request.query_params.get('user', '')
+        namespace = user_namespace(int(user_id)) if user_id.isdigit() else FOLDERS_NAMESPACE
+        generation, = get_cache_generations([namespace])
+        return f'{namespace}:{generation}', None
+
     def get_serializer_class(self):
         """
         Dynamically select serializer based on action.
@@ -113,7 +170,7 @@ class DictionaryFolderViewSet(ModelViewSet):
         entries = DictionaryEntry.objects.filter(
             dictionary__folder=folder
         ).prefetch_related(
-            'meanings',
+            'meanings__target_language',
             'examples'
         ).order_by(
             'dictionary__name',
@@ -127,11 +184,8 @@ class DictionaryFolderViewSet(ModelViewSet):
             'entries': entries
         }
 
-        # Render the HTML content for the PDF using a template
-        html_content = render_to_string('dictionary/folder-pdf.html', data)
-
-        # Generate PDF from HTML
-        pdf = HTML(string=html_content).write_pdf()
+        # Render the template to a PDF
+        pdf = render_pdf('dictionary/folder-pdf.html', data)
         filename = f'Folder {folder.name}.pdf'
 
         # Return PDF as a response
@@ -191,7 +245,7 @@ class DictionaryFolderViewSet(ModelViewSet):
 
 
 @extend_schema(tags=['Dictionaries'])
-class DictionaryViewSet(ModelViewSet):
+class DictionaryViewSet(ConditionalGetMixin, ModelViewSet):
     """
     ViwSet for managing dictionaries within a folder.
 
@@ -207,19 +261,25 @@ class DictionaryViewSet(ModelViewSet):
         """
         Filter queryset to dictionaries within a specific folder.
 
+        Entries and their meanings and examples are only prefetched when
+        the current action renders them.
+
         Returns:
             Filtered queryset of dictionaries.
         """
         folder_pk = self.kwargs.get('folder_pk', '')
+        if self.action == 'download_dictionary_pdf':
+            lookups = ('entries__examples', 'entries__meanings__target_language')
+        elif self.action == 'generate_dictionary_flashcards':
+            lookups = ('entries', 'entries__meanings')
+        else:
+            lookups = get_prefetch_lookups(self.get_serializer())
         return Dictionary.objects.filter(
             folder__pk=folder_pk
         ).select_related(
             'folder__user'
         ).prefetch_related(
-            'entries',
-            'entries__examples',
-            'entries__meanings',
-            'entries__meanings__target_language'
+            *lookups
         ).order_by('-created_at')
 
     def dispatch(self, request, *args, **kwargs):
@@ -241,6 +301,12 @@ class DictionaryViewSet(ModelViewSet):
             ).select_related('user').first()
         return super().dispatch(request, *args, **kwargs)
 
+    def get_resource_version(self):
+        """
+        Version responses by the content version of the enclosing folder.
+        """
+        return folder_content_version(getattr(self.request, '_cached_folder', None))
+
     def get_serializer_class(self):
         """
         Dynamically select serializer based on action.
@@ -262,9 +328,7 @@ class DictionaryViewSet(ModelViewSet):
             Context dictionary with folder.
         """
         context = super().get_serializer_context()
-        folder_pk = self.kwargs.get('folder_pk', '')
-        folder = DictionaryFolder.objects.filter(pk=folder_pk).first()
-        context['folder'] = folder
+        context['folder'] = getattr(self.request, '_cached_folder', None)
         return context
 
     @action(
@@ -286,10 +350,7 @@ class DictionaryViewSet(ModelViewSet):
             HTTP response with PDF attachment.
         """
         dictionary = self.get_object()
-        folder_pk = self.kwargs.get('folder_pk', '')
-        author = CustomUser.objects.filter(
-            folders__pk=folder_pk
-        ).first()
+        author = dictionary.folder.user
         entries = dictionary.entries.all()
 
         # Data to be passed to the template for rendering
@@ -299,11 +360,8 @@ class DictionaryViewSet(ModelViewSet):
             'entries': entries
         }
 
-        # Render the HTML content for the PDF using a template
-        html_content = render_to_string('dictionary/dictionary-pdf.html', data)
-
-        # Generate PDF from HTML
-        pdf = HTML(string=html_content).write_pdf()
+        # Render the template to a PDF
+        pdf = render_pdf('dictionary/dictionary-pdf.html', data)
         filename = f'Dictionary {dictionary.name}.pdf'
 
         # Return PDF as a response
@@ -359,7 +417,7 @@ class DictionaryViewSet(ModelViewSet):
 
 
 @extend_schema(tags=['Dictionaries'])
-class DictionaryEntryViewSet(ModelViewSet):
+class DictionaryEntryViewSet(ConditionalGetMixin, FastPathMixin, ModelViewSet):
     """
     ViewSet for managing dictionary entries within a dictionary.
 
@@ -367,6 +425,8 @@ class DictionaryEntryViewSet(ModelViewSet):
     actions for entry generation using OpenAI.
     """
     permission_classes = (IsAuthenticatedOrReadOnly, IsDictionaryAuthorOrReadOnly)
+    fast_serializer_class = FastDictionaryEntrySerializer
+    pagination_class = DictionaryEntryCursorPagination
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = DictionaryEntryFilter
 
@@ -379,16 +439,21 @@ class DictionaryEntryViewSet(ModelViewSet):
         """
         folder_pk = self.kwargs.get('folder_pk', '')
         dictionary_pk = self.kwargs.get('dictionary_pk', '')
+        if self.use_fast_path():
+            return DictionaryEntry.objects.filter(
+                dictionary__pk=dictionary_pk,
+                dictionary__folder__pk=folder_pk
+            ).values(
+                *self.fast_serializer_class.values_fields
+            ).order_by('-created_at', '-id')
         return DictionaryEntry.objects.filter(
             dictionary__pk=dictionary_pk,
             dictionary__folder__pk=folder_pk
         ).select_related(
             'dictionary__folder__user'
         ).prefetch_related(
-            'meanings',
-            'meanings__target_language',
-            'examples'
-        ).order_by('-created_at')
+            *get_prefetch_lookups(self.get_serializer())
+        ).order_by('-created_at', '-id')
 
     def dispatch(self, request, *args, **kwargs):
         """
@@ -409,6 +474,12 @@ class DictionaryEntryViewSet(ModelViewSet):
             ).select_related('user').first()
         return super().dispatch(request, *args, **kwargs)
 
+    def get_resource_version(self):
+        """
+        Version responses by the content version of the enclosing folder.
+        """
+        return folder_content_version(getattr(self.request, '_cached_folder', None))
+
     def get_serializer_class(self):
         """
         Dynamically select serializer based on action.
@@ -420,6 +491,8 @@ class DictionaryEntryViewSet(ModelViewSet):
             return InitiateEntrySerializer
         if self.action in ['create', 'update']:
             return CreateDictionaryEntrySerializer
+        if self.use_fast_path():
+            return self.fast_serializer_class
         return DictionaryEntrySerializer
 
     @action(detail=False, methods=['post'])
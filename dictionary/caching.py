@@ -0,0 +1,136 @@
+import hashlib
+import time
+from functools import wraps
+from typing import Callable, Iterable, List
+
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .resolvers import resolve_slug_path
+
+
+PUBLIC_PAGE_CACHE_TIMEOUT = 60 * 10
+
+LEADERBOARD_NAMESPACE = 'leaderboard'
+
+# Namespace of everything rendered from any user's folders, e.g., the
+# unfiltered folder listing of the API.
+FOLDERS_NAMESPACE = 'folders'
+
+
+def user_namespace(user_id: int) -> str:
+    """
+    Return the cache namespace of every page rendered from a user's content.
+    """
+    return f'user:{user_id}'
+
+
+def _generation_key(namespace: str) -> str:
+    return f'cache-generation:{namespace}'
+
+
+def get_cache_generations(namespaces: Iterable[str]) -> List[int]:
+    """
+    Return the current generation of each cache namespace.
+
+    Cached pages include the generations of their namespaces in their keys,
+    so bumping a generation invalidates every page of the namespace at once,
+    on any cache backend. A missing generation starts from the current time,
+    so that a generation evicted from the cache never brings stale pages back.
+
+    Args:
+        namespaces (Iterable[str]): Cache namespaces.
+
+    Returns:
+        List[int]: Generation of each namespace, in the given order.
+    """
+    keys = [_generation_key(namespace) for namespace in namespaces]
+    generations = cache.get_many(keys)
+    missing = [key for key in keys if key not in generations]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), None)
+        # Read back, in case another process started the generation first.
+        generations.update(cache.get_many(missing))
+    return [generations.get(key) for key in keys]
+
+
+def invalidate_cache_namespaces(*namespaces: str) -> None:
+    """
+    Invalidate every cached page of the given namespaces.
+
+    Args:
+        *namespaces (str): Cache namespaces whose content changed.
+    """
+    for namespace in set(namespaces):
+        try:
+            cache.incr(_generation_key(namespace))
+        except ValueError:
+            # No generation yet: the next read starts a fresh one anyway.
+            pass
+
+
+def owner_namespaces(request, user_slug: str, **kwargs) -> List[str]:
+    """
+    Return the cache namespaces of a page rendered from the content of the
+    user addressed by the URL.
+
+    Raises:
+        Http404: If no user matches the slug.
+    """
+    return [user_namespace(resolve_slug_path(user_slug).user_id)]
+
+
+def cache_public_page(namespaces: Callable[..., Iterable[str]], timeout: int = PUBLIC_PAGE_CACHE_TIMEOUT):
+    """
+    Cache the pages a view renders for anonymous visitors in the shared cache.
+
+    Anonymous visitors all see the same page for a URL, so it is rendered
+    once and served from the cache until one of its namespaces is
+    invalidated by a model signal. Requests of signed-in users, requests
+    with pending messages and responses that are not a plain 200, set
+    cookies or embed a CSRF token are never cached.
+
+    Args:
+        namespaces (Callable): Called with the request and the URL keyword
+            arguments, returns the cache namespaces the page depends on.
+        timeout (int): Seconds a page is kept at most.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if (
+                request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+                or len(messages.get_messages(request))
+            ):
+                return view_func(request, *args, **kwargs)
+
+            generations = get_cache_generations(namespaces(request, **kwargs))
+            key_source = '|'.join(map(str, (request.get_full_path(), *generations)))
+            key = f'public-page:{hashlib.md5(key_source.encode()).hexdigest()}'
+
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+
+            response = view_func(request, *args, **kwargs)
+
+            def store(response):
+                if (
+                    response.status_code == 200
+                    and not response.streaming
+                    and not response.cookies
+                    and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+                ):
+                    cache.set(key, (response.content, response['Content-Type']), timeout)
+
+            if getattr(response, 'is_rendered', True):
+                store(response)
+            else:
+                response.add_post_render_callback(store)
+            return response
+        return wrapper
+    return decorator
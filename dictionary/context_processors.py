@@ -1,14 +1,14 @@
-from django.db.models import Count
 from django.http import HttpRequest
 
-from accounts.models import UserProfile
 from .filters import HomeEntrySearchFilter
-from .models import Language, DictionaryEntry
+from .models import DictionaryEntry
 
 
 def folder_language_data(request: HttpRequest) -> dict:
     """
-    Retrieve distinct languages for the authenticated user's folders.
+    Retrieve distinct language names for the authenticated user's folders.
+
+    Uses the list cached on the user row, so no query is issued.
 
     Args:
         request (HttpRequest): Request object.
@@ -17,11 +17,8 @@ def folder_language_data(request: HttpRequest) -> dict:
         Dictionary with folder languages or None if user is not authenticated.
     """
     if request.user.is_authenticated:
-        folder_languages = Language.objects.filter(
-            folders__user=request.user
-        ).distinct()
         return {
-            'folder_languages': folder_languages,
+            'folder_languages': request.user.folder_languages,
         }
     return {
         'folder_languages': None,
@@ -0,0 +1,203 @@
+import random
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Dict, List
+
+from django.contrib.auth.hashers import make_password
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Now
+
+from accounts.models import CustomUser, UserProfile
+from leaderboard.models import UserStatistics
+from .caching import LEADERBOARD_NAMESPACE, invalidate_cache_namespaces
+from .models import Dictionary, DictionaryEntry, DictionaryFolder, Example, Language, Meaning
+from .signals import invalidate_owner_pages
+
+# Sample words and example sentence patterns of every supported language.
+SAMPLE_WORDS = {
+    'English': ('apple', 'river', 'city', 'leaf', 'bake', 'journey', 'window', 'cloud'),
+    'Georgian': ('კაცი', 'დედა', 'წიგნი', 'მთა', 'ქალაქი', 'სახლი', 'ზღვა', 'ხე'),
+    'Korean': ('사과', '구름', '바다', '학교', '친구', '하늘', '나무', '도시'),
+    'French': ('journal', 'bateau', 'maison', 'livre', 'arbre', 'ville', 'nuage', 'chat'),
+    'Spanish': ('niño', 'luz', 'casa', 'libro', 'árbol', 'ciudad', 'nube', 'perro'),
+    'German': ('Haus', 'Baum', 'Stadt', 'Buch', 'Wolke', 'Fluss', 'Fenster', 'Hund'),
+    'Mandarin': ('苹果', '河流', '城市', '叶子', '旅行', '窗户', '云彩', '朋友'),
+}
+SAMPLE_SENTENCES = {
+    'English': ('I saw the {word} yesterday.', 'Every {word} tells a story.'),
+    'Georgian': ('{word} ძალიან ლამაზია.', 'გუშინ {word} ვნახე.'),
+    'Korean': ('{word}는 정말 좋아요.', '어제 {word}를 봤어요.'),
+    'French': ('Le {word} est beau.', "J'ai vu le {word} hier."),
+    'Spanish': ('El {word} es bonito.', 'Vi el {word} ayer.'),
+    'German': ('Das {word} ist schön.', 'Ich sah das {word} gestern.'),
+    'Mandarin': ('我昨天看到了{word}。', '这个{word}很好。'),
+}
+
+DATASET_PASSWORD = 'dataset-password'
+
+
+@dataclass
+class DatasetSize:
+    """Shape of a generated corpus; every count but ``users`` is per parent row."""
+    users: int = 10
+    folders: int = 2
+    dictionaries: int = 2
+    entries: int = 25
+    meanings: int = 2
+    examples: int = 2
+
+    def scaled(self, factor: int) -> 'DatasetSize':
+        """Return the size with ``factor`` times the users and entries."""
+        return DatasetSize(**{**asdict(self), 'users': self.users * factor, 'entries': self.entries * factor})
+
+    def total_entries(self) -> int:
+        return self.users * self.folders * self.dictionaries * self.entries
+
+
+def generate_dataset(size: DatasetSize, prefix: str = 'dataset', seed: int = 0,
+                     batch_size: int = 1000) -> Dict[str, List]:
+    """
+    Generate a synthetic corpus of users, folders in every supported
+    language, dictionaries, entries, meanings and examples.
+
+    Rows are written with bulk inserts, which skip the signals maintaining
+    counters, so the counters of the new rows are recomputed afterwards.
+
+    Args:
+        size (DatasetSize): Number of rows to generate at each level.
+        prefix (str): Prefix of the generated usernames, which must not be taken.
+        seed (int): Seed of the random choices, for reproducible corpora.
+        batch_size (int): Number of rows per INSERT statement.
+
+    Returns:
+        Dict[str, List]: The generated ``users``, ``folders``, ``dictionaries`` and ``entries``.
+    """
+    rng = random.Random(seed)
+    languages = [
+        Language.objects.get_or_create(name=name, defaults={'slug': name.lower()})[0]
+        for name, _ in Language.LANGUAGE_CHOICES
+    ]
+    password = make_password(DATASET_PASSWORD)
+
+    users = CustomUser.objects.bulk_create(
+        [
+            CustomUser(
+                username=f'{prefix}-{index}', slug=f'{prefix}-{index}',
+                email=f'{prefix}-{index}@example.com', password=password, is_verified=True,
+            )
+            for index in range(size.users)
+        ],
+        batch_size=batch_size,
+    )
+    UserProfile.objects.bulk_create([UserProfile(user=user) for user in users], batch_size=batch_size)
+    UserStatistics.objects.bulk_create([UserStatistics(user=user) for user in users], batch_size=batch_size)
+
+    folders = DictionaryFolder.objects.bulk_create(
+        [
+            DictionaryFolder(
+                user=user, language=languages[(user_index + index) % len(languages)],
+                name=f'Folder {index}', slug=f'folder-{index}',
+            )
+            for user_index, user in enumerate(users)
+            for index in range(size.folders)
+        ],
+        batch_size=batch_size,
+    )
+    dictionaries = Dictionary.objects.bulk_create(
+        [
+            Dictionary(folder=folder, name=f'Dictionary {index}', slug=f'dictionary-{index}')
+            for folder in folders
+            for index in range(size.dictionaries)
+        ],
+        batch_size=batch_size,
+    )
+
+    entries = []
+    for dictionary in dictionaries:
+        words = SAMPLE_WORDS[dictionary.folder.language.name]
+        for index in range(size.entries):
+            word = f'{rng.choice(words)}{index}'
+            entries.append(DictionaryEntry(dictionary=dictionary, word=word, slug=f'entry-{index}'))
+    entries = DictionaryEntry.objects.bulk_create(entries, batch_size=batch_size)
+
+    Meaning.objects.bulk_create(
+        [
+            Meaning(entry=entry, description=f'Meaning {index} of {entry.word}', target_language=rng.choice(languages))
+            for entry in entries
+            for index in range(size.meanings)
+        ],
+        batch_size=batch_size,
+    )
+    examples = []
+    for entry in entries:
+        patterns = SAMPLE_SENTENCES[entry.dictionary.folder.language.name]
+        for index in range(size.examples):
+            example = Example(
+                entry=entry, sentence=patterns[index % len(patterns)].format(word=entry.word),
+                source='user' if index % 2 == 0 else 'generated',
+            )
+            example.refresh_derived_fields()
+            examples.append(example)
+    Example.objects.bulk_create(examples, batch_size=batch_size)
+
+    recompute_counters([user.pk for user in users])
+    return {'users': users, 'folders': folders, 'dictionaries': dictionaries, 'entries': entries}
+
+
+def _count_of(queryset, field: str, outer_field: str = 'pk'):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef(outer_field)})
+            .order_by()
+            .values(field)
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        0,
+    )
+
+
+def recompute_counters(user_ids: List[int]):
+    """
+    Recompute the counters and cached lists of the given users' rows, and
+    of their leaderboard statistics, from the rows themselves.
+
+    Args:
+        user_ids (List[int]): Primary keys of the users to recompute.
+    """
+    entries = DictionaryEntry.objects.all()
+    Dictionary.objects.filter(folder__user__in=user_ids).update(
+        entry_count=_count_of(entries, 'dictionary'),
+    )
+    DictionaryFolder.objects.filter(user__in=user_ids).update(
+        dictionary_count=_count_of(Dictionary.objects.all(), 'folder'),
+        entry_count=_count_of(entries, 'dictionary__folder'),
+    )
+    UserProfile.objects.filter(user__in=user_ids).update(
+        folder_count=_count_of(DictionaryFolder.objects.all(), 'user', 'user'),
+        dictionary_count=_count_of(Dictionary.objects.all(), 'folder__user', 'user'),
+        entry_count=_count_of(entries, 'dictionary__folder__user', 'user'),
+    )
+
+    languages = {}
+    for user_id, language in (
+        DictionaryFolder.objects.filter(user__in=user_ids).values_list('user_id', 'language__name').distinct()
+    ):
+        languages.setdefault(user_id, set()).add(language)
+    for user_id, names in languages.items():
+        CustomUser.objects.filter(pk=user_id).update(folder_languages=sorted(names))
+
+    user_examples = Example.objects.filter(source='user')
+    UserStatistics.objects.filter(user__in=user_ids).update(
+        total_entries=_count_of(entries, 'dictionary__folder__user', 'user'),
+        weekly_entries=_count_of(entries, 'dictionary__folder__user', 'user'),
+        total_examples=_count_of(user_examples, 'entry__dictionary__folder__user', 'user'),
+        weekly_examples=_count_of(user_examples, 'entry__dictionary__folder__user', 'user'),
+        last_entry_date=date.today(),
+        current_streak=1,
+        max_streak=1,
+        updated_at=Now(),
+    )
+
+    invalidate_owner_pages(*user_ids)
+    invalidate_cache_namespaces(LEADERBOARD_NAMESPACE)
@@ -0,0 +1,110 @@
+import json
+from functools import lru_cache
+
+from django.conf import settings
+
+
+@lru_cache(maxsize=None)
+def get_openai_client():
+    """
+    Return the OpenAI client of the process, created on first use.
+
+    The OpenAI SDK is imported here rather than with this module, so that
+    web and Celery workers which never generate an entry do not pay for
+    loading it, and the client's connection pool is reused across calls.
+    """
+    from openai import OpenAI
+
+    return OpenAI(api_key=settings.OPEN_API_KEY)
+
+
+def fetch_data_from_openai(entry_word, entry_language, target_languages):
+    """
+    Fetch data for a word using OpenAI's API.
+
+    Generates dictionary definition, translations, and example sentences
+    for a given word in a specific language.
+
+    Args:
+        entry_word (str): The word to look up.
+        entry_language (str): The language of the word to look up.
+        target_languages (list): A list of languages for translation.
+
+    Returns:
+        tuple: A tuple containing:
+            - definition (str): Word definition
+            - translations_data (list): Translations in target languages.
+            - examples_data (list): Example sentences.
+        Returns None if word is invalid in the given language.
+    """
+    client = get_openai_client()
+    word = entry_word
+    language = entry_language
+    languages = target_languages
+
+    prompt = (
+        f"Please check if the word '{word}' is in language '{language}'. "
+        f"If the word '{word}' does **not** belong to the language '{language}', "
+        "return **only** this message: 'Incorrect Instructions'."
+        "If it does belong, proceed with the following steps:\n"
+        f"Please provide a dictionary definition and example sentences for the word '{word}'. "
+        f"The word is in {language}. If the word is valid in {language}, then the definition should be in "
+        "the word's original language, and translations should **only** be provided in the "
+        f"following strict list of languages: {languages}. "
+        "This is a strict and exhaustive list of target languages. **Do not** add or include any other languages. "
+        "If a translation for a requested language is unavailable, "
+        "indicate it explicitly as 'No translation available'.\n\n"
+        "References:\n"
+        "- For Georgian translations, use this as a reference: https://dictionary.ge/.\n"
+        "- For example sentences in Korean, use this as a reference: https://wordrow.kr/basicn/ko/meaning/.\n\n"
+        "Create a total of 6 example sentences in the word's original language, "
+        "ensuring they are clear, relevant, and suitable for language learners. "
+        "Adjust the complexity of the sentences to match the word's difficulty. "
+        "Include:\n"
+        "- 2 beginner-level sentences,\n"
+        "- 2 intermediate-level sentences,\n"
+        "- 2 advanced-level sentences.\n\n"
+        "Do not include any formatting markers like ```json or other delimiters. "
+        "Do **not** include any text before or after the JSON."
+        "Create the response strictly as a valid JSON object, ready for parsing, in the format as follows:\n\n"
+        "{\n"
+        '  "word": "{word}",\n'
+        '  "definition": [\n'
+        '    {"language": "{language}", "definition": "{definition}"},\n'
+        "  ],\n"
+        '  "translations": [\n'
+        '    {"language": "{language1}", "translation": "{translation1}"},\n'
+        '    {"language": "{language2}", "translation": "{translation2}"}\n'
+        "  ],\n"
+        '  "examples": [\n'
+        '    {"sentence": "{example1}"},\n'
+        '    {"sentence": "{example2}"},\n'
+        '    {"sentence": "{example3}"},\n'
+        '    {"sentence": "{example4}"},\n'
+        '    {"sentence": "{example5}"},\n'
+        '    {"sentence": "{example6}"},\n'
+        "  ]\n"
+        "}"
+    )
+
+    completion = client.chat.completions.create(
+        model="gpt-4o",
+        messages=[
+            {"role": "developer", "content": "You are a helpful assistant."},
+            {"role": "user", "content": prompt}
+        ],
+    )
+
+    content = completion.choices[0].message.content
+    if content.startswith('Incorrect'):
+        return None
+    if content.startswith("```json"):
+        content = content.lstrip("```json").rstrip("```").strip()
+
+    # Parse content
+    data = json.loads(content)
+    definition = data['definition'][0]['definition']
+    translations_data = data['translations']
+    examples_data = data['examples']
+
+    return definition, translations_data, examples_data
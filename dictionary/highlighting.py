@@ -0,0 +1,284 @@
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from django.utils.html import escape
+
+
+# Number of compiled highlighters kept; each (word, language) pair needs one.
+HIGHLIGHTER_CACHE_SIZE = 1024
+
+
+class Matcher:
+    """
+    Generates the inflected forms of a word in one language.
+
+    The base matcher only matches the word itself. Language matchers are
+    registered with ``register_matcher`` under the name of their Language.
+    """
+    # Whether matches must start and end at word boundaries. Languages
+    # written without spaces between words match anywhere.
+    word_boundaries = True
+
+    def inflections(self, word: str) -> Iterable[str]:
+        """
+        Return the forms of a lowercase word to highlight, the word included.
+        """
+        return (word,)
+
+
+MATCHERS: Dict[str, Matcher] = {}
+
+DEFAULT_MATCHER = Matcher()
+
+
+def register_matcher(*languages: str):
+    """
+    Class decorator registering a matcher for the given language names.
+    """
+    def decorator(matcher_class):
+        for language in languages:
+            MATCHERS[language] = matcher_class()
+        return matcher_class
+    return decorator
+
+
+def get_matcher(language: Optional[str]) -> Matcher:
+    """
+    Return the matcher of a language, or the default matcher if it has none.
+    """
+    return MATCHERS.get(language, DEFAULT_MATCHER)
+
+
+@register_matcher('English')
+class EnglishMatcher(Matcher):
+    """Plural, third person, past and progressive forms."""
+
+    def inflections(self, word):
+        forms = {word, word + 's', word + 'es', word + "'s", word + 'ed', word + 'ing'}
+        if word.endswith('y') and word[-2:-1] not in ('', 'a', 'e', 'i', 'o', 'u'):
+            forms.update((word[:-1] + 'ies', word[:-1] + 'ied'))  # e.g., "city" -> "cities"
+        elif word.endswith('fe'):
+            forms.add(word[:-2] + 'ves')  # e.g., "life" -> "lives"
+        elif word.endswith('f'):
+            forms.add(word[:-1] + 'ves')  # e.g., "leaf" -> "leaves"
+        if word.endswith('e'):
+            forms.update((word + 'd', word[:-1] + 'ing'))  # e.g., "bake" -> "baked", "baking"
+        return forms
+
+
+@register_matcher('Korean')
+class KoreanMatcher(Matcher):
+    """Nouns followed by their particles."""
+    particles = (
+        '은', '는', '이', '가', '을', '를', '과', '와', '에', '의', '도', '만', '로', '으로',
+        '에서', '에게', '한테', '께', '보다', '처럼', '까지', '부터', '이나', '나', '랑', '이랑', '하고',
+    )
+
+    def inflections(self, word):
+        return {word, *(word + particle for particle in self.particles)}
+
+
+@register_matcher('Georgian')
+class GeorgianMatcher(Matcher):
+    """Case and plural endings of nouns, and the common attached postpositions."""
+    consonant_stem_endings = (
+        'ი', 'მა', 'ს', 'ის', 'ით', 'ად', 'ო', 'ში', 'ზე', 'თან', 'იდან', 'ისთვის',
+        'ები', 'ებმა', 'ებს', 'ების', 'ებით', 'ებად', 'ებში', 'ებზე',
+    )
+    vowel_stem_endings = ('მ', 'ს', 'ით', 'დ', 'ში', 'ზე', 'სთან', 'დან', 'სთვის')
+
+    def inflections(self, word):
+        if word.endswith('ი'):  # e.g., "კაცი" -> "კაცმა", "კაცები"
+            stem = word[:-1]
+            return {word, *(stem + ending for ending in self.consonant_stem_endings)}
+
+        forms = {word, *(word + ending for ending in self.vowel_stem_endings)}
+        # Stems in -ა lose it before the genitive and the plural, e.g., "დედა" -> "დედის", "დედები"
+        stem = word[:-1] if word.endswith('ა') else word
+        forms.update(stem + ending for ending in ('ის', 'ები', 'ებს', 'ების', 'ებით'))
+        return forms
+
+
+@register_matcher('French')
+class FrenchMatcher(Matcher):
+    """Plural and feminine forms of nouns and adjectives."""
+
+    def inflections(self, word):
+        forms = {word, word + 's', word + 'e', word + 'es'}
+        if word.endswith(('au', 'eu')):
+            forms.add(word + 'x')  # e.g., "bateau" -> "bateaux"
+        elif word.endswith('al'):
+            forms.add(word[:-2] + 'aux')  # e.g., "journal" -> "journaux"
+        return forms
+
+
+@register_matcher('Spanish')
+class SpanishMatcher(Matcher):
+    """Plural and feminine forms of nouns and adjectives."""
+
+    def inflections(self, word):
+        forms = {word, word + 's', word + 'es'}
+        if word.endswith('z'):
+            forms.add(word[:-1] + 'ces')  # e.g., "luz" -> "luces"
+        elif word.endswith('o'):
+            forms.update((word[:-1] + 'a', word[:-1] + 'as'))  # e.g., "niño" -> "niña", "niñas"
+        return forms
+
+
+@register_matcher('German')
+class GermanMatcher(Matcher):
+    """Plural and case endings of nouns and adjectives."""
+    endings = ('e', 'en', 'n', 'er', 'ern', 'es', 's', 'em', 'nen')
+
+    def inflections(self, word):
+        return {word, *(word + ending for ending in self.endings)}
+
+
+@register_matcher('Mandarin')
+class MandarinMatcher(Matcher):
+    """Words are not inflected, nor separated by spaces."""
+    word_boundaries = False
+
+
+def _fold(text: str) -> str:
+    """
+    Lowercase a text character by character, keeping its length, so that
+    match offsets in the folded text are valid in the original one.
+    """
+    folded = []
+    for char in text:
+        lower = char.lower()
+        folded.append(lower if len(lower) == 1 else char)
+    return ''.join(folded)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class InflectionAutomaton:
+    """
+    Aho–Corasick automaton matching a set of inflected forms in one pass.
+
+    The forms are compiled into a trie with failure links once, after which
+    finding every form in a sentence takes time linear in its length,
+    however many forms there are.
+    """
+    def __init__(self, forms: Iterable[str], word_boundaries: bool = True):
+        self.word_boundaries = word_boundaries
+        self.transitions = [{}]
+        self.failures = [0]
+        self.outputs = [()]
+
+        for form in set(filter(None, map(_fold, forms))):
+            state = 0
+            for char in form:
+                if char not in self.transitions[state]:
+                    self.transitions[state][char] = len(self.transitions)
+                    self.transitions.append({})
+                    self.failures.append(0)
+                    self.outputs.append(())
+                state = self.transitions[state][char]
+            self.outputs[state] = (len(form),)
+
+        # Breadth-first, so the failure state of a node is final before its children need it.
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.transitions[state].items():
+                queue.append(child)
+                failure = self.failures[state]
+                while failure and char not in self.transitions[failure]:
+                    failure = self.failures[failure]
+                self.failures[child] = self.transitions[failure].get(char, 0)
+                # Also report the forms that end here as suffixes of longer ones.
+                self.outputs[child] += self.outputs[self.failures[child]]
+
+    def _at_boundaries(self, text: str, start: int, end: int) -> bool:
+        return (
+            (start == 0 or not _is_word_char(text[start - 1]))
+            and (end == len(text) or not _is_word_char(text[end]))
+        )
+
+    def find(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Yield the (start, end) offsets of the leftmost-longest, non-overlapping
+        forms found in the text, ignoring case.
+        """
+        transitions, failures, outputs = self.transitions, self.failures, self.outputs
+        longest = {}
+        state = 0
+        for index, char in enumerate(_fold(text)):
+            while state and char not in transitions[state]:
+                state = failures[state]
+            state = transitions[state].get(char, 0)
+            end = index + 1
+            for length in outputs[state]:
+                start = end - length
+                if end > longest.get(start, 0) and (
+                    not self.word_boundaries or self._at_boundaries(text, start, end)
+                ):
+                    longest[start] = end
+
+        position = 0
+        for start in sorted(longest):
+            if start >= position:
+                position = longest[start]
+                yield start, position
+
+    def highlight(self, sentence: str) -> str:
+        """
+        Render a sentence as escaped HTML with every match wrapped in a ``highlight`` span.
+        """
+        parts = []
+        position = 0
+        for start, end in self.find(sentence):
+            parts.append(escape(sentence[position:start]))
+            parts.append(f'<span class="highlight">{escape(sentence[start:end])}</span>')
+            position = end
+        parts.append(escape(sentence[position:]))
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=HIGHLIGHTER_CACHE_SIZE)
+def get_highlighter(word: str, language: Optional[str] = None) -> InflectionAutomaton:
+    """
+    Return the automaton matching the forms of a word in a language.
+
+    Automata are memoized in a bounded LRU, so a word is only compiled once
+    however many sentences are highlighted with it.
+
+    Args:
+        word (str): The base word.
+        language (str, optional): Name of the word's language.
+
+    Returns:
+        InflectionAutomaton: Automaton matching the word and its inflections.
+    """
+    matcher = get_matcher(language)
+    return InflectionAutomaton(matcher.inflections(_fold(word)), matcher.word_boundaries)
+
+
+def highlight_sentence(sentence: str, word: str, language: Optional[str] = None) -> str:
+    """
+    Render a sentence as HTML with every form of a word wrapped in a
+    ``highlight`` span.
+
+    The sentence is escaped, so the result is safe to output as is.
+
+    Args:
+        sentence (str): The sentence to highlight.
+        word (str): The base word to highlight.
+        language (str, optional): Name of the word's language, which selects
+            the inflections matched. Only the word itself is matched for
+            languages without a registered matcher.
+
+    Returns:
+        str: HTML of the sentence with matched words highlighted.
+    """
+    if not sentence:
+        return ''
+    if not word:
+        return escape(sentence)
+    return get_highlighter(word, language).highlight(sentence)
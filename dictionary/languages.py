@@ -0,0 +1,121 @@
+import time
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional
+
+from .caching import get_cache_generations, invalidate_cache_namespaces
+from .models import Language
+
+
+# Cache namespace whose generation versions the registries of every process.
+LANGUAGES_NAMESPACE = 'languages'
+
+# Seconds a registry is used before its generation is checked again.
+REGISTRY_CHECK_INTERVAL = 1.0
+
+
+class LanguageRegistry(NamedTuple):
+    """
+    Read-only snapshot of the Language table, indexed by name and by primary key.
+    """
+    by_name: Mapping[str, Language]
+    by_pk: Mapping[int, Language]
+    generation: int
+
+
+_registry: Optional[LanguageRegistry] = None
+_checked_at = 0.0
+
+
+def load_language_registry() -> LanguageRegistry:
+    """
+    Load every language into a fresh registry and make it the current one.
+
+    The generation is read before the languages, so that a change made
+    while they load bumps it past the registry's.
+
+    Returns:
+        LanguageRegistry: The new registry.
+    """
+    global _registry, _checked_at
+    [generation] = get_cache_generations([LANGUAGES_NAMESPACE])
+    languages = list(Language.objects.order_by('name'))
+    _registry = LanguageRegistry(
+        by_name=MappingProxyType({language.name: language for language in languages}),
+        by_pk=MappingProxyType({language.pk: language for language in languages}),
+        generation=generation,
+    )
+    _checked_at = time.monotonic()
+    return _registry
+
+
+def clear_language_registry() -> None:
+    """
+    Drop the current registry and make the registries of other processes
+    stale, so that they are all reloaded on next use.
+    """
+    global _registry
+    _registry = None
+    invalidate_cache_namespaces(LANGUAGES_NAMESPACE)
+
+
+def get_language_registry() -> LanguageRegistry:
+    """
+    Return the current registry, loading it on first use and reloading it
+    once another process changed the languages.
+
+    The shared generation is checked at most every ``REGISTRY_CHECK_INTERVAL``
+    seconds, so that per-row lookups do not each hit the cache.
+    """
+    global _checked_at
+    if _registry is None:
+        return load_language_registry()
+    if time.monotonic() - _checked_at >= REGISTRY_CHECK_INTERVAL:
+        if get_cache_generations([LANGUAGES_NAMESPACE]) != [_registry.generation]:
+            return load_language_registry()
+        _checked_at = time.monotonic()
+    return _registry
+
+
+def refresh_language_registry() -> LanguageRegistry:
+    """
+    Return the current registry, reloading it right away if another process
+    changed the languages, regardless of when the generation was last checked.
+    """
+    global _checked_at
+    if _registry is None or get_cache_generations([LANGUAGES_NAMESPACE]) != [_registry.generation]:
+        return load_language_registry()
+    _checked_at = time.monotonic()
+    return _registry
+
+
+def get_languages() -> Mapping[str, Language]:
+    """
+    Return all languages keyed by name.
+    """
+    return get_language_registry().by_name
+
+
+def get_language(name: Optional[str] = None, pk: Optional[int] = None) -> Language:
+    """
+    Look up a language by name or primary key without querying the database.
+
+    A miss reloads the registry if another process changed the languages
+    since it was loaded, so that unknown names or keys do not each reload it.
+
+    Args:
+        name (str, optional): Name of the language.
+        pk (int, optional): Primary key of the language.
+
+    Returns:
+        Language: The matching language.
+
+    Raises:
+        Language.DoesNotExist: If no language matches.
+    """
+    def find(registry):
+        return registry.by_name.get(name) if pk is None else registry.by_pk.get(pk)
+
+    language = find(get_language_registry()) or find(refresh_language_registry())
+    if language is None:
+        raise Language.DoesNotExist(f'Language {name if pk is None else pk!r} does not exist.')
+    return language
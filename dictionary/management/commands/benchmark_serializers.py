@@ -0,0 +1,112 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import CustomUser
+from dictionary.api.fast import FastDictionaryEntrySerializer, FastSearchDictionaryEntrySerializer
+from dictionary.api.serializers import DictionaryEntrySerializer, SearchDictionaryEntrySerializer
+from dictionary.models import Dictionary, DictionaryEntry, DictionaryFolder, Example, Language, Meaning
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure rows per second of the regular and the fast path serializers '
+        'of the entry list and search endpoints. Sample data is created in a '
+        'transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entries', type=int, default=500, help='Number of sample entries.')
+        parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs per serializer.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            dictionary = self.create_sample_data(options['entries'])
+            request = Request(APIRequestFactory().get('/api/'))
+            entries = DictionaryEntry.objects.filter(dictionary=dictionary).order_by('-created_at', '-id')
+
+            cases = (
+                (
+                    'entries',
+                    lambda: DictionaryEntrySerializer(
+                        entries.prefetch_related('meanings', 'examples'), many=True, context={'request': request}
+                    ).data,
+                    lambda: FastDictionaryEntrySerializer(
+                        entries.values(*FastDictionaryEntrySerializer.values_fields), context={'request': request}
+                    ).data,
+                ),
+                (
+                    'search',
+                    lambda: SearchDictionaryEntrySerializer(
+                        entries.select_related('dictionary__folder__user').prefetch_related('meanings'),
+                        many=True, context={'request': request}
+                    ).data,
+                    lambda: FastSearchDictionaryEntrySerializer(
+                        entries.values(*FastSearchDictionaryEntrySerializer.values_fields),
+                        context={'request': request}
+                    ).data,
+                ),
+            )
+            for name, regular, fast in cases:
+                self.compare(name, regular, fast, options['entries'], options['repeat'])
+
+            transaction.set_rollback(True)
+
+    def create_sample_data(self, count: int) -> Dictionary:
+        """
+        Create a dictionary with ``count`` entries, each with three meanings and three examples.
+        """
+        languages = [
+            Language.objects.get_or_create(name=name, defaults={'slug': name.lower()})[0]
+            for name, _label in Language.LANGUAGE_CHOICES[:3]
+        ]
+        user = CustomUser.objects.create_user(
+            email='benchmark@example.com', password='benchmark', username='benchmark-user'
+        )
+        folder = DictionaryFolder.objects.create(name='Benchmark', user=user, language=languages[0])
+        dictionary = Dictionary.objects.create(name='Benchmark', folder=folder)
+
+        entries = DictionaryEntry.objects.bulk_create(
+            DictionaryEntry(
+                dictionary=dictionary, word=f'Word {index}', slug=f'word-{index}',
+                notes=f'Notes {index}', image=f'entry_images/{index}.png' if index % 2 else '',
+            )
+            for index in range(count)
+        )
+        Meaning.objects.bulk_create(
+            Meaning(entry=entry, description=f'Meaning {index} of {entry.word}', target_language=language)
+            for entry in entries
+            for index, language in enumerate(languages)
+        )
+        Example.objects.bulk_create(
+            Example(entry=entry, sentence=f'Example {index} of {entry.word}', source=source)
+            for entry in entries
+            for index, source in enumerate(('generated', 'user', 'generated'))
+        )
+        return dictionary
+
+    def compare(self, name, regular, fast, rows, repeat):
+        """
+        Time both serializers and report rows per second.
+
+        Their output is checked to be identical by ``FastSerializerTests``.
+        """
+        renderer = JSONRenderer()
+        rates = {}
+        for label, serialize in (('regular', regular), ('fast', fast)):
+            timings = []
+            for _run in range(repeat):
+                started = time.perf_counter()
+                renderer.render(serialize())
+                timings.append(time.perf_counter() - started)
+            rates[label] = rows / min(timings)
+
+        regular_rate, fast_rate = rates['regular'], rates['fast']
+        self.stdout.write(
+            f'{name}: regular {regular_rate:,.0f} rows/s, fast {fast_rate:,.0f} rows/s '
+            f'({fast_rate / regular_rate:.1f}x)'
+        )
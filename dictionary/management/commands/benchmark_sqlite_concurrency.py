@@ -0,0 +1,97 @@
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Tuple
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, OperationalError
+from django.db.utils import ConnectionHandler
+
+from personalized_dictionary.database import sqlite_database
+
+
+def _connect(settings_dict: Dict):
+    """Open a connection with the given settings, apart from the project's databases."""
+    return ConnectionHandler({DEFAULT_DB_ALIAS: settings_dict})[DEFAULT_DB_ALIAS]
+
+
+def run_writer(settings_dict: Dict, transactions: int) -> Tuple[int, int]:
+    """
+    Run ``transactions`` read-then-write transactions, like creating an
+    entry and updating its counters, and return how many committed, how
+    many failed with "database is locked".
+    """
+    connection = _connect(settings_dict)
+    connection.ensure_connection()
+    begin = f'BEGIN {connection.transaction_mode}' if connection.transaction_mode else 'BEGIN'
+    committed = locked = 0
+    for _transaction in range(transactions):
+        with connection.cursor() as cursor:
+            in_transaction = False
+            try:
+                cursor.execute(begin)
+                in_transaction = True
+                cursor.execute('SELECT value FROM benchmark_counter WHERE id = 1')
+                value = cursor.fetchone()[0]
+                cursor.execute('INSERT INTO benchmark_entry (word) VALUES (%s)', [f'word {value}'])
+                cursor.execute('UPDATE benchmark_counter SET value = %s WHERE id = 1', [value + 1])
+                cursor.execute('COMMIT')
+                committed += 1
+            except OperationalError as error:
+                if 'locked' not in str(error):
+                    raise
+                locked += 1
+                if in_transaction:
+                    cursor.execute('ROLLBACK')
+    connection.close()
+    return committed, locked
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the throughput and "database is locked" error rate of '
+        'concurrent writer processes on a temporary SQLite database, with '
+        "Django's default SQLite settings and with the tuned ones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help='Number of writer processes.')
+        parser.add_argument('--transactions', type=int, default=200, help='Transactions per writer.')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            configurations = (
+                ('default', {'ENGINE': 'django.db.backends.sqlite3', 'NAME': Path(directory) / 'default.sqlite3'}),
+                ('tuned', sqlite_database(Path(directory) / 'tuned.sqlite3')),
+            )
+            for label, settings_dict in configurations:
+                self.create_schema(settings_dict)
+                self.benchmark(label, settings_dict, options['writers'], options['transactions'])
+
+    def create_schema(self, settings_dict: Dict):
+        connection = _connect(settings_dict)
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE TABLE benchmark_entry (id INTEGER PRIMARY KEY, word TEXT NOT NULL)')
+            cursor.execute('CREATE TABLE benchmark_counter (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)')
+            cursor.execute('INSERT INTO benchmark_counter (id, value) VALUES (1, 0)')
+        connection.close()
+
+    def benchmark(self, label: str, settings_dict: Dict, writers: int, transactions: int):
+        """
+        Run the writers in parallel processes and report their throughput and lock errors.
+        """
+        context = multiprocessing.get_context('fork')
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=writers, mp_context=context) as executor:
+            results = list(executor.map(run_writer, [settings_dict] * writers, [transactions] * writers))
+        elapsed = time.perf_counter() - started
+
+        committed = sum(result[0] for result in results)
+        locked = sum(result[1] for result in results)
+        attempted = committed + locked
+        self.stdout.write(
+            f'{label}: {committed / elapsed:,.0f} committed transactions/s, '
+            f'{locked} of {attempted} failed with "database is locked" ({locked / attempted:.1%})'
+        )
@@ -0,0 +1,74 @@
+import json
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Dependencies only some requests and tasks need, which must not be
+# imported when a worker starts.
+LAZY_MODULES = ('weasyprint', 'openai')
+
+STARTUP_SCRIPT = '''
+import json, os, resource, sys, time
+
+started = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+for module in sys.argv[2:]:
+    __import__(module)
+print(json.dumps({
+    'seconds': time.perf_counter() - started,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'lazy_modules_loaded': [module for module in json.loads(sys.argv[1]) if module in sys.modules],
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the time and peak memory of starting a process that sets up '
+        'Django and loads every view, as web and Celery workers do, then the '
+        'extra cost of each lazily imported dependency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Number of processes started per case.')
+
+    def handle(self, *args, **options):
+        baseline = self.measure([], options['repeat'])
+        if baseline['lazy_modules_loaded']:
+            raise CommandError(
+                f'Starting up imports {", ".join(baseline["lazy_modules_loaded"])}, which should be imported lazily.'
+            )
+        self.stdout.write(
+            f'startup: {baseline["seconds"] * 1000:.0f} ms, {baseline["max_rss_kb"] / 1024:.1f} MB peak RSS'
+        )
+        for module in LAZY_MODULES:
+            try:
+                result = self.measure([module], options['repeat'])
+            except CommandError as error:
+                self.stdout.write(self.style.WARNING(f'  + {module}: cannot be imported: {error}'))
+                continue
+            self.stdout.write(
+                f'  + {module}: +{(result["seconds"] - baseline["seconds"]) * 1000:.0f} ms, '
+                f'+{(result["max_rss_kb"] - baseline["max_rss_kb"]) / 1024:.1f} MB, only paid when first used'
+            )
+
+    def measure(self, modules, repeat):
+        """
+        Start ``repeat`` processes importing ``modules`` after startup and
+        return the fastest run.
+        """
+        runs = []
+        for _run in range(repeat):
+            completed = subprocess.run(
+                [sys.executable, '-c', STARTUP_SCRIPT, json.dumps(LAZY_MODULES), *modules],
+                cwd=settings.BASE_DIR, capture_output=True, text=True,
+            )
+            if completed.returncode:
+                raise CommandError(completed.stderr.strip().splitlines()[-1])
+            runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+        return min(runs, key=lambda run: run['seconds'])
@@ -0,0 +1,181 @@
+import json
+import statistics
+import time
+from contextlib import ExitStack
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.test import Client, override_settings
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from django.urls import reverse
+
+from dictionary.datasets import SAMPLE_WORDS, DatasetSize, generate_dataset
+from personalized_dictionary.instrumentation import QueryRecorder, get_query_budget
+from personalized_dictionary.testing import TEST_SETTINGS
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the latency, throughput and queries per request of the search, '
+        'folder, dictionary, flashcards, PDF and leaderboard pages over synthetic '
+        'datasets of increasing scale, as the owner of the content. Datasets are '
+        'created in a test database, like the one tests run on, with a cache local '
+        'to the process, so neither the project\'s data nor its shared cache are '
+        'touched. Results can be written as JSON and compared with those of an '
+        'earlier run.'
+    )
+
+    def add_arguments(self, parser):
+        defaults = DatasetSize()
+        parser.add_argument('--scales', default='1,10',
+                            help='Comma separated multipliers of the users and entries of the base dataset.')
+        parser.add_argument('--users', type=int, default=defaults.users, help='Users of the base dataset.')
+        parser.add_argument('--entries', type=int, default=defaults.entries,
+                            help='Entries per dictionary of the base dataset.')
+        parser.add_argument('--requests', type=int, default=20, help='Timed requests per endpoint.')
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+        parser.add_argument('--compare', help='Compare the results with those of this JSON file.')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Relative p95 latency increase over the baseline reported as a regression.')
+
+    def handle(self, *args, **options):
+        try:
+            scales = [int(scale) for scale in options['scales'].split(',')]
+        except ValueError:
+            raise CommandError('--scales must be comma separated integers.')
+        base = DatasetSize(users=options['users'], entries=options['entries'])
+
+        results = {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'requests': options['requests'],
+            'dataset': base.__dict__,
+            'scales': {},
+        }
+        setup_test_environment()
+        databases = setup_databases(options['verbosity'], interactive=False, serialized_aliases=set())
+        try:
+            # Replicas would not see the uncommitted datasets
+            with override_settings(CACHES=TEST_SETTINGS['CACHES'], READ_REPLICAS=TEST_SETTINGS['READ_REPLICAS']):
+                for scale in scales:
+                    results['scales'][str(scale)] = self.benchmark_scale(base.scaled(scale), options['requests'])
+        finally:
+            teardown_databases(databases, options['verbosity'])
+            teardown_test_environment()
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f'Results written to {options["output"]}')
+        if options['compare']:
+            with open(options['compare']) as baseline:
+                self.compare(json.load(baseline), results, options['tolerance'])
+
+    def benchmark_scale(self, size: DatasetSize, requests: int) -> dict:
+        """
+        Generate a dataset of the given size and measure every endpoint on
+        it, in a transaction rolled back before the next scale.
+        """
+        with transaction.atomic():
+            dataset = generate_dataset(size, prefix='benchmark')
+            folder, dictionary = dataset['folders'][0], dataset['dictionaries'][0]
+            user = folder.user
+            folder_kwargs = {'user_slug': user.slug, 'folder_slug': folder.slug}
+            dictionary_kwargs = {**folder_kwargs, 'dictionary_slug': dictionary.slug}
+
+            client = Client()
+            client.force_login(user)
+            endpoints = (
+                ('search', 'dictionaries:search', 'get', {},
+                 {'search': SAMPLE_WORDS[folder.language.name][0]}),
+                ('folder-detail', 'dictionaries:folder-detail', 'get', folder_kwargs, {}),
+                ('dictionary-detail', 'dictionaries:dictionary-detail', 'get', dictionary_kwargs, {}),
+                ('folder-flashcards', 'dictionaries:folder-flashcards', 'post', folder_kwargs,
+                 {'front_type': 'word'}),
+                ('dictionary-flashcards', 'dictionaries:dictionary-flashcards', 'post', dictionary_kwargs,
+                 {'front_type': 'meaning'}),
+                ('folder-pdf-download', 'dictionaries:folder-pdf-download', 'get', folder_kwargs, {}),
+                ('dictionary-pdf-download', 'dictionaries:dictionary-pdf-download', 'get', dictionary_kwargs, {}),
+                ('leaderboard', 'leaderboard:leaderboard', 'get', {}, {}),
+            )
+
+            self.stdout.write(f'{size.users} users, {size.total_entries():,} entries:')
+            measurements = {}
+            for name, view_name, method, kwargs, data in endpoints:
+                url = reverse(view_name, kwargs=kwargs)
+                measurements[name] = self.measure(client, view_name, method, url, data, requests)
+                self.report(name, measurements[name])
+
+            transaction.set_rollback(True)
+        return {'users': size.users, 'entries': size.total_entries(), 'endpoints': measurements}
+
+    def measure(self, client: Client, view_name: str, method: str, url: str, data: dict, requests: int) -> dict:
+        """
+        Count the queries of one request to the endpoint, after a first one
+        warming up the session and the caches, then time ``requests`` more.
+        """
+        send = getattr(client, method)
+        send(url, data)
+        queries = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            response = send(url, data)
+        if response.status_code != 200:
+            return {'error': f'HTTP {response.status_code}'}
+
+        timings = []
+        for _request in range(requests):
+            started = time.perf_counter()
+            send(url, data)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        return {
+            'queries': queries.count,
+            'budget': get_query_budget(view_name),
+            'mean_ms': statistics.fmean(timings) * 1000,
+            'p50_ms': timings[len(timings) // 2] * 1000,
+            'p95_ms': timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+            'requests_per_second': len(timings) / sum(timings),
+        }
+
+    def report(self, name: str, measurement: dict):
+        if 'error' in measurement:
+            self.stdout.write(self.style.ERROR(f'  {name}: {measurement["error"]}'))
+            return
+        budget = measurement['budget']
+        queries = f'{measurement["queries"]} queries' + (f' (budget {budget})' if budget is not None else '')
+        self.stdout.write(
+            f'  {name}: p50 {measurement["p50_ms"]:.1f} ms, p95 {measurement["p95_ms"]:.1f} ms, '
+            f'{measurement["requests_per_second"]:.1f} req/s, {queries}'
+        )
+
+    def compare(self, baseline: dict, results: dict, tolerance: float):
+        """
+        Report the endpoints issuing more queries or over ``tolerance`` slower
+        at p95 than in the baseline, and fail if there are any.
+        """
+        regressions = []
+        for scale, current in results['scales'].items():
+            previous = baseline['scales'].get(scale)
+            if previous is None:
+                continue
+            for name, measurement in current['endpoints'].items():
+                before = previous['endpoints'].get(name)
+                if before is None or 'error' in before:
+                    continue
+                if 'error' in measurement:
+                    regressions.append(f'x{scale} {name}: {measurement["error"]}')
+                    continue
+                if measurement['queries'] > before['queries']:
+                    regressions.append(f'x{scale} {name}: {before["queries"]} -> {measurement["queries"]} queries')
+                if measurement['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+                    regressions.append(
+                        f'x{scale} {name}: p95 {before["p95_ms"]:.1f} -> {measurement["p95_ms"]:.1f} ms'
+                    )
+
+        if regressions:
+            raise CommandError('Regressions against the baseline:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline.'))
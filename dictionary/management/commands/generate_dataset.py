@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts.models import CustomUser
+from dictionary.datasets import DATASET_PASSWORD, DatasetSize, generate_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a synthetic corpus of users, folders in every supported language, '
+        'dictionaries, entries, meanings and examples with bulk inserts, then '
+        'recompute the counters of the new rows.'
+    )
+
+    def add_arguments(self, parser):
+        defaults = DatasetSize()
+        parser.add_argument('--users', type=int, default=defaults.users, help='Number of users.')
+        parser.add_argument('--folders', type=int, default=defaults.folders, help='Folders per user.')
+        parser.add_argument('--dictionaries', type=int, default=defaults.dictionaries, help='Dictionaries per folder.')
+        parser.add_argument('--entries', type=int, default=defaults.entries, help='Entries per dictionary.')
+        parser.add_argument('--meanings', type=int, default=defaults.meanings, help='Meanings per entry.')
+        parser.add_argument('--examples', type=int, default=defaults.examples, help='Examples per entry.')
+        parser.add_argument('--prefix', default='dataset', help='Prefix of the generated usernames.')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random choices.')
+
+    def handle(self, *args, **options):
+        size = DatasetSize(**{
+            field: options[field] for field in ('users', 'folders', 'dictionaries', 'entries', 'meanings', 'examples')
+        })
+        prefix = options['prefix']
+        if CustomUser.objects.filter(username__startswith=f'{prefix}-').exists():
+            raise CommandError(f'Users prefixed with "{prefix}-" already exist; choose another --prefix.')
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            generate_dataset(size, prefix=prefix, seed=options['seed'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {size.users} users and {size.total_entries():,} entries in {elapsed:.1f}s. '
+            f'Users sign in as {prefix}-<n>@example.com with the password "{DATASET_PASSWORD}".'
+        ))
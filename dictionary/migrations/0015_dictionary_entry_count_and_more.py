@@ -0,0 +1,64 @@
+# Generated by Django 5.1.3 on 2026-10-18 12:00
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    """Backfill dictionary and folder counters from existing rows."""
+    Dictionary = apps.get_model("dictionary", "Dictionary")
+    DictionaryEntry = apps.get_model("dictionary", "DictionaryEntry")
+    DictionaryFolder = apps.get_model("dictionary", "DictionaryFolder")
+
+    def count_of(queryset, field):
+        return Coalesce(
+            Subquery(
+                queryset.filter(**{field: OuterRef("pk")})
+                .order_by()
+                .values(field)
+                .annotate(total=Count("pk"))
+                .values("total")
+            ),
+            0,
+        )
+
+    Dictionary.objects.update(
+        entry_count=count_of(DictionaryEntry.objects.all(), "dictionary")
+    )
+    DictionaryFolder.objects.update(
+        dictionary_count=count_of(Dictionary.objects.all(), "folder"),
+        entry_count=count_of(DictionaryEntry.objects.all(), "dictionary__folder"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0014_dictionary_accessibility_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dictionary",
+            name="entry_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="number of entries"
+            ),
+        ),
+        migrations.AddField(
+            model_name="dictionaryfolder",
+            name="dictionary_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="number of dictionaries"
+            ),
+        ),
+        migrations.AddField(
+            model_name="dictionaryfolder",
+            name="entry_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="number of entries"
+            ),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
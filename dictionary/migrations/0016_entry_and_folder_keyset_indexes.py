@@ -0,0 +1,34 @@
+# Generated by Django 5.1.3 on 2026-10-19 00:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0015_dictionary_entry_count_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dictionaryentry",
+            index=models.Index(
+                fields=["created_at", "id"], name="entry_created_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dictionaryentry",
+            index=models.Index(
+                fields=["dictionary", "created_at", "id"],
+                name="entry_dict_created_at_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dictionaryfolder",
+            index=models.Index(
+                fields=["created_at", "id"], name="folder_created_at_id_idx"
+            ),
+        ),
+    ]
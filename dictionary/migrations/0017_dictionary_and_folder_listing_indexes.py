@@ -0,0 +1,28 @@
+# Generated by Django 5.1.3 on 2026-10-19 00:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0016_entry_and_folder_keyset_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dictionary",
+            index=models.Index(
+                fields=["folder", "-created_at"], name="dictionary_folder_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dictionaryfolder",
+            index=models.Index(
+                fields=["user", "accessibility", "-created_at"],
+                name="folder_user_access_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.3 on 2026-10-19 00:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0017_dictionary_and_folder_listing_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dictionaryfolder",
+            name="content_updated_at",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="content updated at"
+            ),
+        ),
+        migrations.AddField(
+            model_name="dictionaryfolder",
+            name="content_version",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="content version"
+            ),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.1.3 on 2026-10-19 00:21
+
+import re
+
+from django.db import migrations, models
+from django.utils.html import escape
+
+
+# Frozen copy of the highlighter of this migration, so that it keeps
+# producing what it did whatever becomes of dictionary.highlighting.
+KOREAN_PARTICLES = ("은", "는", "이", "가", "을", "를", "과", "와", "에", "의")
+
+
+def get_word_variations(word):
+    variations = [word, word + "s", word + "es"]
+    if word.endswith("y"):
+        variations.append(word[:-1] + "ies")
+    elif word.endswith("f"):
+        variations.append(word[:-1] + "ves")
+    elif word.endswith("fe"):
+        variations.append(word[:-2] + "ves")
+    variations.extend(word + particle for particle in KOREAN_PARTICLES)
+    return variations
+
+
+def highlight_sentence(sentence, word):
+    if not sentence:
+        return ""
+    if not word:
+        return escape(sentence)
+    alternatives = "|".join(re.escape(escape(variation)) for variation in get_word_variations(word))
+    pattern = re.compile(r"\b(" + alternatives + r")\b", re.IGNORECASE)
+    return pattern.sub(r'<span class="highlight">\1</span>', escape(sentence))
+
+
+def populate_highlighted_sentences(apps, schema_editor):
+    """Backfill the highlighted sentence of existing examples."""
+    Example = apps.get_model("dictionary", "Example")
+
+    examples = Example.objects.select_related("entry").only("sentence", "entry__word")
+    batch = []
+    for example in examples.iterator(chunk_size=1000):
+        example.highlighted_sentence = highlight_sentence(example.sentence, example.entry.word)
+        batch.append(example)
+        if len(batch) == 1000:
+            Example.objects.bulk_update(batch, ["highlighted_sentence"])
+            batch = []
+    Example.objects.bulk_update(batch, ["highlighted_sentence"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0018_folder_content_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="example",
+            name="highlighted_sentence",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="highlighted example sentence"
+            ),
+        ),
+        migrations.RunPython(populate_highlighted_sentences, migrations.RunPython.noop),
+    ]
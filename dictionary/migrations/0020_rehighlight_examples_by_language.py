@@ -0,0 +1,143 @@
+# Generated by Django 5.1.3 on 2026-10-19 01:05
+
+import re
+
+from django.db import migrations
+from django.utils.html import escape
+
+
+# Frozen copy of the highlighter of this migration, so that it keeps
+# producing what it did whatever becomes of dictionary.highlighting. The
+# inflections are those of its language matchers, and the pattern tries
+# the longest form first, which finds the same leftmost-longest matches
+# as its automaton.
+def english_inflections(word):
+    forms = {word, word + "s", word + "es", word + "'s", word + "ed", word + "ing"}
+    if word.endswith("y") and word[-2:-1] not in ("", "a", "e", "i", "o", "u"):
+        forms.update((word[:-1] + "ies", word[:-1] + "ied"))
+    elif word.endswith("fe"):
+        forms.add(word[:-2] + "ves")
+    elif word.endswith("f"):
+        forms.add(word[:-1] + "ves")
+    if word.endswith("e"):
+        forms.update((word + "d", word[:-1] + "ing"))
+    return forms
+
+
+KOREAN_PARTICLES = (
+    "은", "는", "이", "가", "을", "를", "과", "와", "에", "의", "도", "만", "로", "으로",
+    "에서", "에게", "한테", "께", "보다", "처럼", "까지", "부터", "이나", "나", "랑", "이랑", "하고",
+)
+
+
+def korean_inflections(word):
+    return {word, *(word + particle for particle in KOREAN_PARTICLES)}
+
+
+GEORGIAN_CONSONANT_STEM_ENDINGS = (
+    "ი", "მა", "ს", "ის", "ით", "ად", "ო", "ში", "ზე", "თან", "იდან", "ისთვის",
+    "ები", "ებმა", "ებს", "ების", "ებით", "ებად", "ებში", "ებზე",
+)
+GEORGIAN_VOWEL_STEM_ENDINGS = ("მ", "ს", "ით", "დ", "ში", "ზე", "სთან", "დან", "სთვის")
+
+
+def georgian_inflections(word):
+    if word.endswith("ი"):
+        stem = word[:-1]
+        return {word, *(stem + ending for ending in GEORGIAN_CONSONANT_STEM_ENDINGS)}
+    forms = {word, *(word + ending for ending in GEORGIAN_VOWEL_STEM_ENDINGS)}
+    stem = word[:-1] if word.endswith("ა") else word
+    forms.update(stem + ending for ending in ("ის", "ები", "ებს", "ების", "ებით"))
+    return forms
+
+
+def french_inflections(word):
+    forms = {word, word + "s", word + "e", word + "es"}
+    if word.endswith(("au", "eu")):
+        forms.add(word + "x")
+    elif word.endswith("al"):
+        forms.add(word[:-2] + "aux")
+    return forms
+
+
+def spanish_inflections(word):
+    forms = {word, word + "s", word + "es"}
+    if word.endswith("z"):
+        forms.add(word[:-1] + "ces")
+    elif word.endswith("o"):
+        forms.update((word[:-1] + "a", word[:-1] + "as"))
+    return forms
+
+
+GERMAN_ENDINGS = ("e", "en", "n", "er", "ern", "es", "s", "em", "nen")
+
+
+def german_inflections(word):
+    return {word, *(word + ending for ending in GERMAN_ENDINGS)}
+
+
+INFLECTIONS = {
+    "English": english_inflections,
+    "Korean": korean_inflections,
+    "Georgian": georgian_inflections,
+    "French": french_inflections,
+    "Spanish": spanish_inflections,
+    "German": german_inflections,
+}
+# Languages written without spaces between words, matched anywhere
+UNBOUNDED_LANGUAGES = {"Mandarin"}
+
+
+def fold(text):
+    return "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+
+def highlight_sentence(sentence, word, language):
+    if not sentence:
+        return ""
+    if not word:
+        return escape(sentence)
+    word = fold(word)
+    forms = sorted(set(filter(None, map(fold, INFLECTIONS.get(language, lambda word: {word})(word)))),
+                   key=len, reverse=True)
+    pattern = "|".join(map(re.escape, forms))
+    if language not in UNBOUNDED_LANGUAGES:
+        pattern = rf"(?<!\w)(?:{pattern})(?!\w)"
+    parts, position = [], 0
+    for match in re.finditer(pattern, sentence, re.IGNORECASE):
+        parts.append(escape(sentence[position:match.start()]))
+        parts.append(f'<span class="highlight">{escape(match.group())}</span>')
+        position = match.end()
+    parts.append(escape(sentence[position:]))
+    return "".join(parts)
+
+
+def rehighlight_examples(apps, schema_editor):
+    """Re-render highlighted sentences with the inflections of each folder's language."""
+    Example = apps.get_model("dictionary", "Example")
+
+    examples = Example.objects.select_related("entry__dictionary__folder__language").only(
+        "sentence", "entry__word", "entry__dictionary__folder__language__name"
+    )
+    batch = []
+    for example in examples.iterator(chunk_size=1000):
+        entry = example.entry
+        example.highlighted_sentence = highlight_sentence(
+            example.sentence, entry.word, entry.dictionary.folder.language.name
+        )
+        batch.append(example)
+        if len(batch) == 1000:
+            Example.objects.bulk_update(batch, ["highlighted_sentence"])
+            batch = []
+    Example.objects.bulk_update(batch, ["highlighted_sentence"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0019_example_highlighted_sentence"),
+    ]
+
+    operations = [
+        migrations.RunPython(rehighlight_examples, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-19 00:30
+
+import accounts.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0021_dictionaryentry_image_derivatives_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="dictionaryentry",
+            name="image",
+            field=models.ImageField(blank=True, null=True, storage=accounts.storage.image_storage, upload_to="entry_images/"),
+        ),
+    ]
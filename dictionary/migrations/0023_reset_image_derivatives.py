@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-19 02:10
+
+from django.db import migrations
+
+
+def reset_image_derivatives(apps, schema_editor):
+    """
+    Forget derivatives recorded before they had widths and modern formats,
+    so that the generate_image_derivatives command generates them again.
+    """
+    DictionaryEntry = apps.get_model("dictionary", "DictionaryEntry")
+    DictionaryEntry.objects.exclude(image_derivatives={}).update(image_hash="", image_derivatives={})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0022_alter_dictionaryentry_image"),
+    ]
+
+    operations = [
+        migrations.RunPython(reset_image_derivatives, migrations.RunPython.noop),
+    ]
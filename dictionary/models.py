@@ -1,10 +1,12 @@
 from django.db import models
-from django.db.models import UniqueConstraint, Count
+from django.db.models import Index, UniqueConstraint
 from django.urls import reverse
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
-from accounts.models import CustomUser
+from accounts.models import DenormalizedFieldsMixin, CustomUser, ImageDerivativesMixin
+from accounts.storage import image_storage
+from .highlighting import highlight_sentence
 
 
 class Language(models.Model):
@@ -36,7 +38,7 @@ class Language(models.Model):
         super().save(*args, **kwargs)
 
 
-class DictionaryFolder(models.Model):
+class DictionaryFolder(DenormalizedFieldsMixin):
     """Represents a dictionary folder."""
     ACCESSIBILITY_CHOICES = [
         ('Public', _('Public')),
@@ -47,9 +49,15 @@ class DictionaryFolder(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='folders')
     language = models.ForeignKey(Language, on_delete=models.CASCADE, related_name='folders')
     accessibility = models.CharField(choices=ACCESSIBILITY_CHOICES, max_length=10, default='Public')
+    dictionary_count = models.PositiveIntegerField(_('number of dictionaries'), default=0, editable=False)
+    entry_count = models.PositiveIntegerField(_('number of entries'), default=0, editable=False)
+    content_version = models.PositiveIntegerField(_('content version'), default=0, editable=False)
+    content_updated_at = models.DateTimeField(_('content updated at'), null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    denormalized_fields = ('dictionary_count', 'entry_count', 'content_version', 'content_updated_at')
+
     class Meta:
         verbose_name = _('Dictionary Folder')
         verbose_name_plural = _('Dictionary Folders')
@@ -57,6 +65,10 @@ class DictionaryFolder(models.Model):
             UniqueConstraint(fields=('user', 'name'), name='unique_folder_per_user'),
             UniqueConstraint(fields=('user', 'slug'), name='unique_slug_per_user'),
         ]
+        indexes = [
+            Index(fields=('created_at', 'id'), name='folder_created_at_id_idx'),
+            Index(fields=('user', 'accessibility', '-created_at'), name='folder_user_access_created_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -75,18 +87,8 @@ class DictionaryFolder(models.Model):
             kwargs={'folder_slug': self.slug, 'user_slug': self.user.slug}
         )
 
-    @classmethod
-    def annotate_all_statistics(cls, queryset):
-        """
-        Annotates the folder queryset with dictionary and entry counts.
-        """
-        return queryset.annotate(
-            dictionary_count=Count('dictionaries', distinct=True),
-            entry_count=Count('dictionaries__entries', distinct=True),
-        )
-
 
-class Dictionary(models.Model):
+class Dictionary(DenormalizedFieldsMixin):
     """Represents a dictionary inside a folder."""
     ACCESSIBILITY_CHOICES = [
         ('Public', _('Public')),
@@ -97,9 +99,12 @@ class Dictionary(models.Model):
     description = models.TextField(_('dictionary description'), blank=True, null=True)
     folder = models.ForeignKey(DictionaryFolder, on_delete=models.CASCADE, related_name='dictionaries')
     accessibility = models.CharField(choices=ACCESSIBILITY_CHOICES, max_length=10, default='Public')
+    entry_count = models.PositiveIntegerField(_('number of entries'), default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    denormalized_fields = ('entry_count',)
+
     class Meta:
         verbose_name = _('Dictionary')
         verbose_name_plural = _('Dictionaries')
@@ -107,6 +112,9 @@ class Dictionary(models.Model):
             UniqueConstraint(fields=('folder', 'name'), name='unique_dictionary_per_folder'),
             UniqueConstraint(fields=('folder', 'slug'), name='unique_slug_per_folder'),
         ]
+        indexes = [
+            Index(fields=('folder', '-created_at'), name='dictionary_folder_created_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -127,16 +135,22 @@ class Dictionary(models.Model):
         })
 
 
-class DictionaryEntry(models.Model):
-    """Represents a word entry in a dictionary."""
+class DictionaryEntry(ImageDerivativesMixin, DenormalizedFieldsMixin):
+    """
+    Represents a word entry in a dictionary.
+
+    Resized versions of the entry image are generated in the background.
+    """
     dictionary = models.ForeignKey(Dictionary, on_delete=models.CASCADE, related_name='entries')
     word = models.CharField(_('dictionary entry'), max_length=255)
     slug = models.SlugField(_('slug'), allow_unicode=True)
     notes = models.TextField(_('entry notes'), blank=True, null=True)
-    image = models.ImageField(upload_to='entry_images/', blank=True, null=True)
+    image = models.ImageField(upload_to='entry_images/', blank=True, null=True, storage=image_storage)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    denormalized_fields = ('image_hash', 'image_derivatives')
+
     class Meta:
         verbose_name = _('Dictionary Entry')
         verbose_name_plural = _('Dictionary Entries')
@@ -144,6 +158,10 @@ class DictionaryEntry(models.Model):
             UniqueConstraint(fields=('dictionary', 'word'), name='unique_entry_per_dictionary'),
             UniqueConstraint(fields=('dictionary', 'slug'), name='unique_slug_per_dictionary'),
         ]
+        indexes = [
+            Index(fields=('created_at', 'id'), name='entry_created_at_id_idx'),
+            Index(fields=('dictionary', 'created_at', 'id'), name='entry_dict_created_at_id_idx'),
+        ]
 
     def __str__(self):
         return self.word
@@ -171,9 +189,13 @@ class Example(models.Model):
     Represents an example sentence associated with a dictionary entry.
     """
     sentence = models.TextField(_('example sentence'))
+    highlighted_sentence = models.TextField(_('highlighted example sentence'), blank=True, editable=False)
     source = models.CharField(_('source'), max_length=120, null=True, blank=True)
     entry = models.ForeignKey(DictionaryEntry, on_delete=models.CASCADE, related_name='examples')
 
+    # Fields computed from other fields, refreshed by ``refresh_derived_fields``.
+    derived_fields = ('highlighted_sentence',)
+
     class Meta:
         verbose_name = _('Example')
         verbose_name_plural = _('Examples')
@@ -181,6 +203,22 @@ class Example(models.Model):
     def __str__(self):
         return self.sentence
 
+    def refresh_derived_fields(self):
+        """
+        Render the sentence as HTML with the entry word and its inflections
+        in the folder's language highlighted, so that it can be output as is.
+        Also called before bulk writes.
+        """
+        language = self.entry.dictionary.folder.language
+        self.highlighted_sentence = highlight_sentence(self.sentence, self.entry.word, language.name)
+
+    def save(self, *args, **kwargs):
+        self.refresh_derived_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, *self.derived_fields}
+        super().save(*args, **kwargs)
+
 
 class Meaning(models.Model):
     """
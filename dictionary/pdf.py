@@ -0,0 +1,25 @@
+from typing import Dict, Optional
+
+from django.template.loader import render_to_string
+
+
+def render_pdf(template_name: str, context: Dict, base_url: Optional[str] = None) -> bytes:
+    """
+    Render a template to a PDF document.
+
+    WeasyPrint is imported by the first call rather than with this module,
+    so that web and Celery workers which never export a PDF do not pay for
+    loading it and its font and layout libraries.
+
+    Args:
+        template_name (str): Name of the HTML template.
+        context (Dict): Template context.
+        base_url (str, optional): URL relative links of the template resolve against.
+
+    Returns:
+        bytes: The PDF document.
+    """
+    from weasyprint import HTML
+
+    html_content = render_to_string(template_name, context)
+    return HTML(string=html_content, base_url=base_url).write_pdf()
@@ -0,0 +1,197 @@
+import hashlib
+from typing import NamedTuple, Optional
+
+from django.core.cache import cache
+from django.db.models import F
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.translation import gettext_lazy as _
+
+from accounts.models import CustomUser
+from .models import Dictionary, DictionaryEntry, DictionaryFolder
+
+
+SLUG_PATH_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class SlugPath(NamedTuple):
+    """
+    Primary keys of the objects addressed by a nested URL.
+
+    Levels below the deepest slug in the URL are None.
+    """
+    user_id: int
+    folder_id: Optional[int] = None
+    dictionary_id: Optional[int] = None
+    entry_id: Optional[int] = None
+
+
+def slug_path_cache_key(*slugs: str) -> str:
+    """
+    Build the cache key for a slug tuple.
+
+    Slugs may contain unicode characters, so the joined path is hashed
+    to keep the key safe for every cache backend.
+
+    Args:
+        *slugs: User, folder, dictionary and entry slugs, outermost first.
+
+    Returns:
+        str: Cache key for the slug tuple.
+    """
+    path = '/'.join(slugs)
+    return f'slug-path:{len(slugs)}:{hashlib.md5(path.encode()).hexdigest()}'
+
+
+SLUG_PATH_MODELS = (CustomUser, DictionaryFolder, Dictionary, DictionaryEntry)
+SLUG_PATH_RELATIONS = ('user', 'folder', 'dictionary')
+
+
+def _slug_path_prefixes(depth: int) -> list:
+    """
+    Return the lookup prefix from the model at ``depth`` of the hierarchy to
+    each of its levels, outermost first; the model's own level is empty.
+    """
+    return ['__'.join(reversed(SLUG_PATH_RELATIONS[level:depth])) for level in range(depth + 1)]
+
+
+def _slug_path_lookups(*slugs: str):
+    """
+    Return the filters matching a slug tuple and the ``values()`` names of
+    the primary keys it addresses, for the model of its deepest level.
+    """
+    prefixes = _slug_path_prefixes(len(slugs) - 1)
+    filters = {f'{prefix}__slug' if prefix else 'slug': slug for prefix, slug in zip(prefixes, slugs)}
+    pk_names = [f'{prefix}_id' if prefix else 'pk' for prefix in prefixes]
+    return filters, pk_names
+
+
+def _query_slug_path(*slugs: str):
+    """
+    Resolve a slug tuple to primary keys with a single query.
+
+    Returns:
+        SlugPath or None: Resolved primary keys, or None if nothing matches.
+    """
+    filters, pk_names = _slug_path_lookups(*slugs)
+    row = SLUG_PATH_MODELS[len(slugs) - 1].objects.filter(**filters).values_list(*pk_names).first()
+    return SlugPath(*row) if row else None
+
+
+def resolve_slug_path(user_slug: str,
+                      folder_slug: Optional[str] = None,
+                      dictionary_slug: Optional[str] = None,
+                      entry_slug: Optional[str] = None) -> SlugPath:
+    """
+    Resolve the slugs of a nested URL to the primary keys of its objects.
+
+    Results are cached, so a warm lookup issues no query and a cold one
+    issues exactly one.
+
+    Args:
+        user_slug (str): Slug of the owner.
+        folder_slug (str, optional): Slug of the folder.
+        dictionary_slug (str, optional): Slug of the dictionary.
+        entry_slug (str, optional): Slug of the entry.
+
+    Returns:
+        SlugPath: Primary keys of the addressed objects.
+
+    Raises:
+        Http404: If no object matches the slugs.
+    """
+    slugs = [slug for slug in (user_slug, folder_slug, dictionary_slug, entry_slug) if slug is not None]
+    key = slug_path_cache_key(*slugs)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return SlugPath(*cached)
+
+    path = _query_slug_path(*slugs)
+    if path is None:
+        raise Http404(_('The requested page does not exist.'))
+
+    cache.set(key, tuple(path), SLUG_PATH_CACHE_TIMEOUT)
+    return path
+
+
+def get_object_by_slug_path(queryset, *slugs: str):
+    """
+    Fetch the object addressed by the slugs of a nested URL with a single query.
+
+    A cached slug path fetches the object by primary key. Otherwise the
+    object is fetched by its slugs together with the primary keys of its
+    ancestors, which are cached for the next lookups.
+
+    Args:
+        queryset (QuerySet): Objects of the model of the deepest slug.
+        *slugs: User, folder, dictionary and entry slugs, outermost first.
+
+    Returns:
+        tuple: The resolved SlugPath and the object.
+
+    Raises:
+        Http404: If no object matches the slugs.
+    """
+    depth = len(slugs) - 1
+    if queryset.model is not SLUG_PATH_MODELS[depth]:
+        raise ValueError(f'{len(slugs)} slugs address {SLUG_PATH_MODELS[depth].__name__} objects, '
+                         f'not {queryset.model.__name__}.')
+    key = slug_path_cache_key(*slugs)
+
+    cached = cache.get(key)
+    if cached is not None:
+        path = SlugPath(*cached)
+        return path, get_object_or_404(queryset, pk=path[depth])
+
+    filters, pk_names = _slug_path_lookups(*slugs)
+    ancestors = {f'slug_path_{level}': F(name) for level, name in zip(SlugPath._fields, pk_names[:-1])}
+    instance = queryset.filter(**filters).annotate(**ancestors).first()
+    if instance is None:
+        raise Http404(_('The requested page does not exist.'))
+
+    path = SlugPath(*(instance.__dict__.pop(name) for name in ancestors), instance.pk)
+    cache.set(key, tuple(path), SLUG_PATH_CACHE_TIMEOUT)
+    return path, instance
+
+
+def subtree_slug_paths(instance) -> list:
+    """
+    Return the stored slug tuples of an object and of everything nested below it.
+
+    Args:
+        instance: A user, folder, dictionary or entry.
+
+    Returns:
+        list: Slug tuples as currently stored in the database.
+    """
+    lookups = {
+        CustomUser: {'user': 'pk', 'folder': 'user', 'dictionary': 'folder__user',
+                     'entry': 'dictionary__folder__user'},
+        DictionaryFolder: {'folder': 'pk', 'dictionary': 'folder', 'entry': 'dictionary__folder'},
+        Dictionary: {'dictionary': 'pk', 'entry': 'dictionary'},
+        DictionaryEntry: {'entry': 'pk'},
+    }[type(instance)]
+    querysets = {
+        'user': CustomUser.objects.values_list('slug'),
+        'folder': DictionaryFolder.objects.values_list('user__slug', 'slug'),
+        'dictionary': Dictionary.objects.values_list('folder__user__slug', 'folder__slug', 'slug'),
+        'entry': DictionaryEntry.objects.values_list(
+            'dictionary__folder__user__slug', 'dictionary__folder__slug', 'dictionary__slug', 'slug'
+        ),
+    }
+
+    paths = []
+    for level, lookup in lookups.items():
+        paths.extend(querysets[level].filter(**{lookup: instance.pk}))
+    return paths
+
+
+def invalidate_slug_paths(*paths) -> None:
+    """
+    Drop cached resolutions for the given slug tuples.
+
+    Args:
+        *paths: Slug tuples, outermost slug first.
+    """
+    cache.delete_many([slug_path_cache_key(*slugs) for slugs in paths])
@@ -0,0 +1,487 @@
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.db.models.functions import Greatest, Now
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import Signal, receiver
+
+from accounts.images import image_derivatives_generated
+from accounts.models import CustomUser, MediaBlob, UserProfile
+from .caching import FOLDERS_NAMESPACE, invalidate_cache_namespaces, user_namespace
+from .languages import clear_language_registry
+from .models import Dictionary, DictionaryEntry, DictionaryFolder, Example, Language, Meaning
+from .resolvers import invalidate_slug_paths, subtree_slug_paths
+
+
+# Sent after examples are inserted with ``bulk_create``, which skips ``post_save``.
+# Receivers get the ``entry`` and the list of created ``examples``.
+examples_bulk_created = Signal()
+
+
+def _change_counters(queryset, touch=False, **changes):
+    """
+    Atomically shift counter columns of every row in the queryset.
+
+    Args:
+        queryset (QuerySet): Rows whose counters should change.
+        touch (bool): Whether to also mark the content of the rows, which
+            must be folders, as changed in the same update and invalidate
+            the cached pages of their owners.
+        **changes: Mapping of counter field name to the (signed) amount.
+    """
+    updates = {
+        field: Greatest(F(field) + amount, 0)
+        for field, amount in changes.items() if amount
+    }
+    if touch:
+        updates.update(content_version=F('content_version') + 1, content_updated_at=Now())
+    if updates:
+        queryset.update(**updates)
+    if touch:
+        invalidate_owner_pages(*queryset.values_list('user_id', flat=True).distinct())
+
+
+def invalidate_owner_pages(*user_ids):
+    """
+    Invalidate the cached pages and resource versions rendered from the
+    content of the given users, and from the content of all users.
+
+    They are invalidated again once the change is committed, as a request
+    may have cached the old content with the new generations before then.
+
+    Args:
+        *user_ids: Primary keys of the users whose content changed.
+    """
+    namespaces = [FOLDERS_NAMESPACE, *(user_namespace(user_id) for user_id in user_ids if user_id)]
+    invalidate_cache_namespaces(*namespaces)
+    transaction.on_commit(lambda: invalidate_cache_namespaces(*namespaces), robust=True)
+
+
+def touch_folders(queryset):
+    """
+    Mark the content of every folder in the queryset as changed.
+
+    Bumping the content version changes the ETag of every API response
+    and the key of every template fragment rendered from the folder or
+    anything inside it.
+
+    Args:
+        queryset (QuerySet): Folders whose content changed.
+    """
+    _change_counters(queryset, touch=True)
+
+
+# Models whose rows are deleted in cascade from the rows above them.
+HIERARCHY = (CustomUser, DictionaryFolder, Dictionary, DictionaryEntry)
+
+
+def _deleted_in_cascade(sender, origin) -> bool:
+    """
+    Return whether a row is being deleted in cascade from a different model
+    of the ``HIERARCHY``, whose own handlers already cover the row.
+    """
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return origin is not None and origin_model is not sender and origin_model in HIERARCHY
+
+
+def refresh_folder_languages(*user_ids, instance=None):
+    """
+    Recompute the cached list of folder language names for the given users.
+
+    Args:
+        *user_ids: Primary keys of the users whose folders changed.
+        instance (DictionaryFolder, optional): Changed folder; its cached user
+            object, if loaded, is updated in place as well.
+    """
+    for user_id in set(user_ids):
+        languages = sorted(set(
+            DictionaryFolder.objects.filter(user_id=user_id)
+            .values_list('language__name', flat=True)
+        ))
+        CustomUser.objects.filter(pk=user_id).update(folder_languages=languages)
+
+        if instance is not None and DictionaryFolder.user.is_cached(instance):
+            if instance.user.pk == user_id:
+                instance.user.folder_languages = languages
+
+
+PARENT_FIELDS = {
+    DictionaryFolder: 'user_id',
+    Dictionary: 'folder_id',
+    DictionaryEntry: 'dictionary_id',
+}
+
+
+# Fields that determine how the examples below a row are highlighted: the
+# entry word and, through the hierarchy, the language of the folder.
+HIGHLIGHT_CONTEXT_FIELDS = {
+    DictionaryFolder: ('language_id',),
+    Dictionary: ('folder_id',),
+    DictionaryEntry: ('word', 'dictionary_id'),
+}
+
+EXAMPLE_LOOKUPS = {
+    DictionaryFolder: 'entry__dictionary__folder',
+    Dictionary: 'entry__dictionary',
+    DictionaryEntry: 'entry',
+}
+
+
+def _highlight_context(instance) -> tuple:
+    return tuple(instance.__dict__.get(name) for name in HIGHLIGHT_CONTEXT_FIELDS[type(instance)])
+
+
+def _pop_previous_parent_id(instance):
+    """
+    Return the parent id the instance was loaded with, if it has changed since,
+    and remember the current parent for subsequent saves.
+    """
+    parent_field = PARENT_FIELDS[type(instance)]
+    previous_parent_id = getattr(instance, '_loaded_parent_id', None)
+    current_parent_id = getattr(instance, parent_field)
+    instance._loaded_parent_id = current_parent_id
+    if previous_parent_id and previous_parent_id != current_parent_id:
+        return previous_parent_id
+    return None
+
+
+@receiver(post_init, sender=CustomUser)
+@receiver(post_init, sender=DictionaryFolder)
+@receiver(post_init, sender=Dictionary)
+@receiver(post_init, sender=DictionaryEntry)
+def remember_loaded_state(sender, instance, **kwargs):
+    """
+    Remember the slug and parent a row was loaded with, so that counters
+    and cached slug paths can be updated if they change before the row
+    is saved again, and what the examples below it are highlighted for,
+    so that they can be re-rendered if that changes.
+    """
+    instance._loaded_slug = instance.__dict__.get('slug')
+    if sender in PARENT_FIELDS:
+        instance._loaded_parent_id = instance.__dict__.get(PARENT_FIELDS[sender])
+    if sender in HIGHLIGHT_CONTEXT_FIELDS:
+        instance._loaded_highlight_context = _highlight_context(instance)
+    if sender is DictionaryFolder:
+        instance._loaded_language_id = instance.__dict__.get('language_id')
+
+
+@receiver(pre_save, sender=CustomUser)
+@receiver(pre_save, sender=DictionaryFolder)
+@receiver(pre_save, sender=Dictionary)
+@receiver(pre_save, sender=DictionaryEntry)
+def invalidate_slug_paths_on_rename(sender, instance, **kwargs):
+    """
+    Drop cached slug paths of a renamed or moved row and of everything below it.
+
+    Runs before the save, while the database still holds the old slugs, and
+    remembers them to be dropped again once the save is committed.
+    """
+    if instance._state.adding:
+        return
+
+    renamed = getattr(instance, '_loaded_slug', None) != instance.slug
+    moved = (
+        sender in PARENT_FIELDS
+        and getattr(instance, '_loaded_parent_id', None) != getattr(instance, PARENT_FIELDS[sender])
+    )
+    if renamed or moved:
+        instance._stale_slug_paths = subtree_slug_paths(instance)
+        invalidate_slug_paths(*instance._stale_slug_paths)
+    instance._loaded_slug = instance.slug
+
+
+@receiver(pre_delete, sender=CustomUser)
+@receiver(pre_delete, sender=DictionaryFolder)
+@receiver(pre_delete, sender=Dictionary)
+@receiver(pre_delete, sender=DictionaryEntry)
+def invalidate_slug_paths_on_deletion(sender, instance, origin=None, **kwargs):
+    """
+    Drop cached slug paths of a deleted row and of everything below it,
+    and remember them to be dropped again once the deletion is committed.
+
+    Rows deleted in cascade from a deleted ancestor are skipped, since the
+    ancestor already invalidated its whole subtree.
+    """
+    if _deleted_in_cascade(sender, origin):
+        return
+    instance._stale_slug_paths = subtree_slug_paths(instance)
+    invalidate_slug_paths(*instance._stale_slug_paths)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_save, sender=DictionaryFolder)
+@receiver(post_save, sender=Dictionary)
+@receiver(post_save, sender=DictionaryEntry)
+@receiver(post_delete, sender=CustomUser)
+@receiver(post_delete, sender=DictionaryFolder)
+@receiver(post_delete, sender=Dictionary)
+@receiver(post_delete, sender=DictionaryEntry)
+def invalidate_slug_paths_on_commit(sender, instance, **kwargs):
+    """
+    Drop the slug paths a rename, move or deletion made stale again once
+    it is committed, as a request may have resolved and cached them from
+    the rows still visible before the commit.
+    """
+    paths = instance.__dict__.pop('_stale_slug_paths', None)
+    if paths:
+        transaction.on_commit(lambda: invalidate_slug_paths(*paths), robust=True)
+
+
+@receiver(post_save, sender=DictionaryFolder)
+def update_counters_on_folder_save(sender, instance, created, **kwargs):
+    """
+    Increment the owner's folder count when a folder is created,
+    move all counts between profiles if the folder changes owner,
+    refresh the cached folder languages of the affected users if the
+    folder is new or changed owner or language, and invalidate their
+    cached pages.
+    """
+    previous_user_id = _pop_previous_parent_id(instance)
+    language_changed = getattr(instance, '_loaded_language_id', None) != instance.language_id
+    instance._loaded_language_id = instance.language_id
+    if created or previous_user_id or language_changed:
+        refresh_folder_languages(instance.user_id, *filter(None, [previous_user_id]), instance=instance)
+    invalidate_owner_pages(instance.user_id, previous_user_id)
+
+    if created:
+        _change_counters(UserProfile.objects.filter(user_id=instance.user_id), folder_count=1)
+    elif previous_user_id:
+        folder = sender.objects.get(pk=instance.pk)
+        changes = {
+            'folder_count': 1,
+            'dictionary_count': folder.dictionary_count,
+            'entry_count': folder.entry_count,
+        }
+        _change_counters(UserProfile.objects.filter(user_id=instance.user_id), **changes)
+        _change_counters(
+            UserProfile.objects.filter(user_id=previous_user_id),
+            **{field: -amount for field, amount in changes.items()}
+        )
+
+
+# Counters a deleted row's ancestors are decremented by at once, as the
+# rows below it are deleted in cascade without updating any counter.
+DELETED_COUNTER_FIELDS = {
+    DictionaryFolder: ('dictionary_count', 'entry_count'),
+    Dictionary: ('entry_count',),
+}
+
+
+@receiver(pre_delete, sender=DictionaryFolder)
+@receiver(pre_delete, sender=Dictionary)
+def remember_counters_on_deletion(sender, instance, origin=None, **kwargs):
+    """
+    Remember the counters of a row about to be deleted, read before the
+    rows below it go, unless its ancestors are deleted along with it.
+    """
+    if not _deleted_in_cascade(sender, origin):
+        instance._deleted_counters = (
+            sender.objects.filter(pk=instance.pk).values(*DELETED_COUNTER_FIELDS[sender]).first() or {}
+        )
+
+
+def _deleted_counter_changes(instance) -> dict:
+    return {field: -amount for field, amount in getattr(instance, '_deleted_counters', {}).items()}
+
+
+@receiver(post_delete, sender=DictionaryFolder)
+def update_counters_on_folder_deletion(sender, instance, origin=None, **kwargs):
+    """
+    Decrement the owner's folder, dictionary and entry counts, refresh
+    their folder languages and invalidate their cached pages when a folder
+    is deleted.
+
+    Folders deleted with their owner only invalidate the cached pages.
+    """
+    invalidate_owner_pages(instance.user_id)
+    if _deleted_in_cascade(sender, origin):
+        return
+    _change_counters(
+        UserProfile.objects.filter(user_id=instance.user_id),
+        folder_count=-1, **_deleted_counter_changes(instance)
+    )
+    refresh_folder_languages(instance.user_id, instance=instance)
+
+
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+def clear_language_registry_on_language_change(sender, instance, **kwargs):
+    """
+    Drop the language registries of every process whenever a language
+    changes, and again once the change is committed, as a process may
+    have reloaded the old languages before the commit.
+    """
+    clear_language_registry()
+    transaction.on_commit(clear_language_registry, robust=True)
+
+
+@receiver(post_save, sender=Language)
+def refresh_folder_languages_on_language_save(sender, instance, created, **kwargs):
+    """
+    Refresh cached folder languages of every user with a folder in a renamed language
+    and mark every folder as changed, since language names appear in all of them.
+    """
+    if not created:
+        refresh_folder_languages(*CustomUser.objects.filter(
+            folders__language=instance
+        ).values_list('pk', flat=True).distinct())
+        touch_folders(DictionaryFolder.objects.all())
+
+
+@receiver(post_save, sender=CustomUser)
+def touch_folders_on_user_save(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Mark the folders of a user as changed when their username or email,
+    which are rendered with every folder, may have changed.
+    """
+    if not created and (update_fields is None or {'username', 'email'} & set(update_fields)):
+        invalidate_owner_pages(instance.pk)
+        touch_folders(DictionaryFolder.objects.filter(user=instance))
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(image_derivatives_generated, sender=UserProfile)
+def invalidate_owner_pages_on_profile_save(sender, instance, created=False, **kwargs):
+    """
+    Invalidate the cached pages of a user when their profile, whose image
+    is rendered on them, is saved or gets its image derivatives.
+    """
+    if not created:
+        invalidate_owner_pages(instance.user_id)
+
+
+@receiver(post_save, sender=Dictionary)
+def update_counters_on_dictionary_save(sender, instance, created, **kwargs):
+    """
+    Increment folder and profile dictionary counts when a dictionary is created,
+    move its counts between folders if it is re-parented and mark the
+    affected folders as changed.
+    """
+    previous_folder_id = _pop_previous_parent_id(instance)
+    if created:
+        _change_counters(DictionaryFolder.objects.filter(pk=instance.folder_id), touch=True, dictionary_count=1)
+        _change_counters(UserProfile.objects.filter(user__folders=instance.folder_id), dictionary_count=1)
+    elif previous_folder_id:
+        entry_count = sender.objects.filter(pk=instance.pk).values_list('entry_count', flat=True).get()
+        for folder_id, sign in ((instance.folder_id, 1), (previous_folder_id, -1)):
+            changes = {'dictionary_count': sign, 'entry_count': sign * entry_count}
+            _change_counters(DictionaryFolder.objects.filter(pk=folder_id), touch=True, **changes)
+            _change_counters(UserProfile.objects.filter(user__folders=folder_id), **changes)
+    else:
+        touch_folders(DictionaryFolder.objects.filter(pk=instance.folder_id))
+
+
+@receiver(post_delete, sender=Dictionary)
+def update_counters_on_dictionary_deletion(sender, instance, origin=None, **kwargs):
+    """
+    Decrement folder and profile dictionary and entry counts when a
+    dictionary is deleted and mark its folder as changed.
+
+    Dictionaries deleted in cascade are covered by their folder or owner.
+    """
+    if _deleted_in_cascade(sender, origin):
+        return
+    changes = {'dictionary_count': -1, **_deleted_counter_changes(instance)}
+    _change_counters(DictionaryFolder.objects.filter(pk=instance.folder_id), touch=True, **changes)
+    _change_counters(UserProfile.objects.filter(user__folders=instance.folder_id), **changes)
+
+
+@receiver(post_save, sender=DictionaryEntry)
+def update_counters_on_entry_save(sender, instance, created, **kwargs):
+    """
+    Increment dictionary, folder and profile entry counts when an entry is created,
+    move the count between dictionaries if the entry is re-parented and mark
+    the affected folders as changed.
+    """
+    previous_dictionary_id = _pop_previous_parent_id(instance)
+    if created:
+        changes = [(instance.dictionary_id, 1)]
+    elif previous_dictionary_id:
+        changes = [(instance.dictionary_id, 1), (previous_dictionary_id, -1)]
+    else:
+        touch_folders(DictionaryFolder.objects.filter(dictionaries=instance.dictionary_id))
+        return
+
+    for dictionary_id, amount in changes:
+        _change_counters(Dictionary.objects.filter(pk=dictionary_id), entry_count=amount)
+        _change_counters(DictionaryFolder.objects.filter(dictionaries=dictionary_id), touch=True, entry_count=amount)
+        _change_counters(UserProfile.objects.filter(user__folders__dictionaries=dictionary_id), entry_count=amount)
+
+
+@receiver(post_delete, sender=DictionaryEntry)
+def update_counters_on_entry_deletion(sender, instance, origin=None, **kwargs):
+    """
+    Decrement dictionary, folder and profile entry counts when an entry is deleted
+    and mark its folder as changed.
+
+    Entries deleted in cascade are covered by their dictionary, folder or owner.
+    """
+    if _deleted_in_cascade(sender, origin):
+        return
+    dictionary_id = instance.dictionary_id
+    _change_counters(Dictionary.objects.filter(pk=dictionary_id), entry_count=-1)
+    _change_counters(DictionaryFolder.objects.filter(dictionaries=dictionary_id), touch=True, entry_count=-1)
+    _change_counters(UserProfile.objects.filter(user__folders__dictionaries=dictionary_id), entry_count=-1)
+
+
+@receiver(post_save, sender=DictionaryFolder)
+@receiver(post_save, sender=Dictionary)
+@receiver(post_save, sender=DictionaryEntry)
+def refresh_example_highlights_on_context_change(sender, instance, created, **kwargs):
+    """
+    Re-render the highlighted sentences of the examples below a row when
+    the entry word or the folder language they are highlighted for may
+    have changed.
+    """
+    previous_context = getattr(instance, '_loaded_highlight_context', None)
+    instance._loaded_highlight_context = _highlight_context(instance)
+    if created or previous_context == instance._loaded_highlight_context:
+        return
+
+    examples = list(
+        Example.objects.filter(**{EXAMPLE_LOOKUPS[sender]: instance})
+        .select_related('entry__dictionary__folder__language')
+    )
+    for example in examples:
+        example.refresh_derived_fields()
+    Example.objects.bulk_update(examples, Example.derived_fields, batch_size=1000)
+
+
+@receiver(post_save, sender=Meaning)
+@receiver(post_save, sender=Example)
+@receiver(post_delete, sender=Meaning)
+@receiver(post_delete, sender=Example)
+def touch_folder_on_entry_detail_change(sender, instance, origin=None, **kwargs):
+    """
+    Mark the folder of an entry as changed when one of its meanings or examples changes.
+
+    Rows deleted together with their entry are skipped, since the entry's
+    own deletion already marks the folder.
+    """
+    if _deleted_in_cascade(sender, origin):
+        return
+    touch_folders(DictionaryFolder.objects.filter(dictionaries__entries=instance.entry_id))
+
+
+@receiver(examples_bulk_created, sender=Example)
+def touch_folder_on_examples_bulk_creation(sender, entry, **kwargs):
+    """
+    Mark the folder of an entry as changed when examples are added to it in bulk.
+    """
+    touch_folders(DictionaryFolder.objects.filter(dictionaries=entry.dictionary_id))
+
+
+@receiver(image_derivatives_generated, sender=DictionaryEntry)
+def touch_folder_on_entry_image_derivatives(sender, instance, **kwargs):
+    """
+    Mark the folder of an entry as changed when the derivatives of its image
+    are ready, so that pages switch from the original image to them.
+    """
+    touch_folders(DictionaryFolder.objects.filter(dictionaries=instance.dictionary_id))
+
+
+@receiver(post_delete, sender=DictionaryEntry)
+def release_image_on_entry_deletion(sender, instance, **kwargs):
+    """
+    Release the reference a deleted entry held to its image blob.
+    """
+    MediaBlob.objects.release(instance.image.name)
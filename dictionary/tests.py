@@ -1,3 +1,1064 @@
-from django.test import TestCase
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.tokens import default_token_generator
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection, router
+from django.db.models.signals import pre_delete, pre_save
+from django.http import Http404, HttpResponse
+from django.test import Client, RequestFactory, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils.encoding import force_bytes
+from django.utils.html import escape
+from django.utils.http import urlsafe_base64_encode
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.images import derivative_name
+from accounts.models import CustomUser
+from personalized_dictionary.database import REPLICA_PIN_COOKIE, ReplicaMiddleware
+from personalized_dictionary.instrumentation import QueryBudgetExceeded, QueryBudgetMiddleware, query_metrics
+from personalized_dictionary.profiling import OTHER_PHASE, Profile, ProfileStore, sampler, start_profile
+from personalized_dictionary.testing import SimpleTestCase, TestCase
+from .datasets import DatasetSize, generate_dataset
+from .api.fast import FastDictionaryEntrySerializer, FastSearchDictionaryEntrySerializer
+from .api.serializers import DictionaryEntrySerializer, SearchDictionaryEntrySerializer
+from .caching import invalidate_cache_namespaces
+from .highlighting import InflectionAutomaton, get_matcher, highlight_sentence
+from .languages import LANGUAGES_NAMESPACE, get_language, get_languages, load_language_registry
+from .models import Dictionary, DictionaryEntry, DictionaryFolder, Example, Language, Meaning
+from .resolvers import get_object_by_slug_path, resolve_slug_path
+from .utils import bulk_create_examples, bulk_create_meanings, sync_examples, sync_meanings
+
+
+@skipUnlessDBFeature('supports_explaining_query_execution')
+class QueryPlanTests(TestCase):
+    """
+    Regression tests asserting that the hot slug-path lookups and
+    per-parent listings are answered from indexes.
+
+    Each query plan must search through an index and must not need a
+    temporary B-tree to sort the rows.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            email='author@example.com',
+            password='password',
+            username='author',
+        )
+        cls.language = Language.objects.create(name='English')
+        cls.folder = DictionaryFolder.objects.create(
+            name='Books', user=cls.user, language=cls.language
+        )
+        cls.dictionary = Dictionary.objects.create(name='Chapter One', folder=cls.folder)
+        cls.entry = DictionaryEntry.objects.create(dictionary=cls.dictionary, word='apple')
+
+    def assertUsesIndex(self, queryset):
+        """
+        Assert that the query plan of the queryset only reads tables through indexes.
+        """
+        if connection.vendor != 'sqlite':
+            self.skipTest('Query plan assertions are written for SQLite.')
+
+        plan = queryset.explain()
+        self.assertIn('INDEX', plan, plan)
+        self.assertNotIn('USE TEMP B-TREE', plan, plan)
+        for line in plan.splitlines():
+            if ' SCAN ' in f' {line} ':
+                self.assertIn('INDEX', line, plan)
+
+    def test_entry_slug_path_lookup(self):
+        self.assertUsesIndex(DictionaryEntry.objects.filter(
+            dictionary__folder__user__slug=self.user.slug,
+            dictionary__folder__slug=self.folder.slug,
+            dictionary__slug=self.dictionary.slug,
+            slug=self.entry.slug,
+        ))
+
+    def test_dictionary_slug_path_lookup(self):
+        self.assertUsesIndex(Dictionary.objects.filter(
+            folder__user__slug=self.user.slug,
+            folder__slug=self.folder.slug,
+            slug=self.dictionary.slug,
+        ))
+
+    def test_dictionaries_in_folder_by_newest(self):
+        self.assertUsesIndex(
+            Dictionary.objects.filter(folder=self.folder).order_by('-created_at')
+        )
+
+    def test_entries_in_dictionary_by_newest(self):
+        self.assertUsesIndex(
+            DictionaryEntry.objects.filter(dictionary=self.dictionary).order_by('-created_at')
+        )
+
+    def test_entries_in_dictionary_by_word(self):
+        self.assertUsesIndex(
+            DictionaryEntry.objects.filter(dictionary=self.dictionary).order_by('word')
+        )
+
+    def test_public_folders_of_user_by_newest(self):
+        self.assertUsesIndex(
+            DictionaryFolder.objects.filter(
+                user=self.user, accessibility='Public'
+            ).order_by('-created_at')
+        )
+
+
+class CounterTests(TestCase):
+    """
+    The folder, dictionary and entry counters of profiles, folders and
+    dictionaries follow every creation, move and deletion.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = CustomUser.objects.create_user(email='owner@example.com', password='password', username='owner')
+        cls.other = CustomUser.objects.create_user(email='other@example.com', password='password', username='other')
+        cls.language = Language.objects.create(name='English')
+
+    def setUp(self):
+        self.folder = DictionaryFolder.objects.create(name='Books', user=self.owner, language=self.language)
+        self.dictionary = Dictionary.objects.create(name='Chapter One', folder=self.folder)
+        self.entries = [
+            DictionaryEntry.objects.create(dictionary=self.dictionary, word=word) for word in ('apple', 'river')
+        ]
+
+    def assertCounters(self, instance, **expected):
+        instance.refresh_from_db()
+        self.assertEqual({field: getattr(instance, field) for field in expected}, expected, instance)
+
+    def assertProfileCounters(self, user, folders, dictionaries, entries):
+        self.assertCounters(
+            user.profile, folder_count=folders, dictionary_count=dictionaries, entry_count=entries
+        )
+
+    def test_creation(self):
+        self.assertProfileCounters(self.owner, 1, 1, 2)
+        self.assertCounters(self.folder, dictionary_count=1, entry_count=2)
+        self.assertCounters(self.dictionary, entry_count=2)
+
+    def test_save_keeps_counters_of_stale_instance(self):
+        stale_folder = DictionaryFolder.objects.get(pk=self.folder.pk)
+        Dictionary.objects.create(name='Chapter Two', folder=self.folder)
+        stale_folder.name = 'Novels'
+        stale_folder.save()
+        self.assertCounters(self.folder, name='Novels', dictionary_count=2, entry_count=2)
+
+    def test_folder_languages(self):
+        german = Language.objects.create(name='German')
+        self.assertCounters(self.owner, folder_languages=['English'])
+
+        with mock.patch('dictionary.signals.refresh_folder_languages') as refresh_folder_languages:
+            self.folder.name = 'Novels'
+            self.folder.save()
+        refresh_folder_languages.assert_not_called()
+
+        self.folder.language = german
+        self.folder.save()
+        self.assertCounters(self.owner, folder_languages=['German'])
+
+        self.folder.user = self.other
+        self.folder.save()
+        self.assertCounters(self.owner, folder_languages=[])
+        self.assertCounters(self.other, folder_languages=['German'])
+
+    def test_entry_deletion(self):
+        self.entries[0].delete()
+        self.assertProfileCounters(self.owner, 1, 1, 1)
+        self.assertCounters(self.folder, entry_count=1)
+        self.assertCounters(self.dictionary, entry_count=1)
+
+    def test_entry_queryset_deletion(self):
+        DictionaryEntry.objects.filter(dictionary=self.dictionary).delete()
+        self.assertProfileCounters(self.owner, 1, 1, 0)
+        self.assertCounters(self.folder, entry_count=0)
+        self.assertCounters(self.dictionary, entry_count=0)
+
+    def test_entry_move(self):
+        other_folder = DictionaryFolder.objects.create(name='Notes', user=self.other, language=self.language)
+        other_dictionary = Dictionary.objects.create(name='Words', folder=other_folder)
+        entry = self.entries[0]
+        entry.dictionary = other_dictionary
+        entry.save()
+        self.assertCounters(self.dictionary, entry_count=1)
+        self.assertCounters(other_dictionary, entry_count=1)
+        self.assertCounters(other_folder, entry_count=1)
+        self.assertProfileCounters(self.owner, 1, 1, 1)
+        self.assertProfileCounters(self.other, 1, 1, 1)
+
+    def test_dictionary_move(self):
+        other_folder = DictionaryFolder.objects.create(name='Notes', user=self.other, language=self.language)
+        self.dictionary.folder = other_folder
+        self.dictionary.save()
+        self.assertCounters(self.folder, dictionary_count=0, entry_count=0)
+        self.assertCounters(other_folder, dictionary_count=1, entry_count=2)
+        self.assertProfileCounters(self.owner, 1, 0, 0)
+        self.assertProfileCounters(self.other, 1, 1, 2)
+
+    def test_folder_move(self):
+        self.folder.user = self.other
+        self.folder.save()
+        self.assertProfileCounters(self.owner, 0, 0, 0)
+        self.assertProfileCounters(self.other, 1, 1, 2)
+
+    def test_dictionary_deletion(self):
+        Dictionary.objects.create(name='Chapter Two', folder=self.folder)
+        self.dictionary.delete()
+        self.assertCounters(self.folder, dictionary_count=1, entry_count=0)
+        self.assertProfileCounters(self.owner, 1, 1, 0)
+
+    def test_folder_deletion(self):
+        DictionaryFolder.objects.create(name='Notes', user=self.owner, language=self.language)
+        self.folder.delete()
+        self.assertProfileCounters(self.owner, 1, 0, 0)
+
+    def test_owner_deletion(self):
+        self.owner.delete()
+        self.assertFalse(DictionaryEntry.objects.exists())
+        self.assertProfileCounters(self.other, 0, 0, 0)
+
+    def test_cascade_deletion_updates_counters_once(self):
+        def counter_updates(folder):
+            with CaptureQueriesContext(connection) as queries:
+                folder.delete()
+            return [
+                query['sql'] for query in queries
+                if query['sql'].startswith('UPDATE') and 'entry_count' in query['sql']
+            ]
+
+        small = counter_updates(self.folder)
+        large_folder = DictionaryFolder.objects.create(name='Notes', user=self.owner, language=self.language)
+        large_dictionary = Dictionary.objects.create(name='Words', folder=large_folder)
+        for index in range(10):
+            DictionaryEntry.objects.create(dictionary=large_dictionary, word=f'word {index}')
+
+        self.assertEqual(len(counter_updates(large_folder)), len(small))
+        self.assertProfileCounters(self.owner, 0, 0, 0)
+
+
+class SyncRelatedTests(TestCase):
+    """
+    Syncing the meanings and examples of an entry keeps unchanged rows,
+    rewrites edited ones in place and only inserts or deletes the rest.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        user = CustomUser.objects.create_user(email='author@example.com', password='password', username='author')
+        cls.english = Language.objects.create(name='English')
+        cls.georgian = Language.objects.create(name='Georgian')
+        folder = DictionaryFolder.objects.create(name='Books', user=user, language=cls.english)
+        dictionary = Dictionary.objects.create(name='Chapter One', folder=folder)
+        cls.entry = DictionaryEntry.objects.create(dictionary=dictionary, word='apple')
+
+    def setUp(self):
+        self.meanings = bulk_create_meanings(self.entry, [
+            {'description': 'A fruit', 'target_language': self.english},
+            {'description': 'ვაშლი', 'target_language': self.georgian},
+        ])
+        self.examples = bulk_create_examples(self.entry, [
+            {'sentence': 'I ate an apple.', 'source': 'user'},
+            {'sentence': 'Apples grow on trees.', 'source': 'ai'},
+        ])
+
+    def meanings_by_pk(self):
+        return dict(Meaning.objects.filter(entry=self.entry).values_list('pk', 'description'))
+
+    def test_unchanged_rows_are_kept(self):
+        with self.assertNumQueries(2):
+            sync_meanings(self.entry, [
+                {'description': 'ვაშლი', 'target_language': self.georgian},
+                {'description': 'A fruit', 'target_language': self.english},
+            ])
+            sync_examples(self.entry, [
+                {'sentence': 'Apples grow on trees.', 'source': 'ai'},
+                {'sentence': 'I ate an apple.', 'source': 'user'},
+            ])
+        self.assertEqual(self.meanings_by_pk(), {meaning.pk: meaning.description for meaning in self.meanings})
+
+    def test_edited_row_is_updated_in_place(self):
+        sync_meanings(self.entry, [
+            {'description': 'A round fruit', 'target_language': self.english},
+            {'description': 'ვაშლი', 'target_language': self.georgian},
+        ])
+        self.assertEqual(self.meanings_by_pk(), {self.meanings[0].pk: 'A round fruit', self.meanings[1].pk: 'ვაშლი'})
+
+    def test_removed_row_is_deleted(self):
+        sync_meanings(self.entry, [{'description': 'ვაშლი', 'target_language': self.georgian}])
+        self.assertEqual(self.meanings_by_pk(), {self.meanings[1].pk: 'ვაშლი'})
+
+    def test_added_row_is_created(self):
+        sync_meanings(self.entry, [
+            {'description': 'A fruit', 'target_language': self.english},
+            {'description': 'ვაშლი', 'target_language': self.georgian},
+            {'description': 'A tree', 'target_language': self.english},
+        ])
+        meanings = self.meanings_by_pk()
+        self.assertEqual(sorted(meanings.values()), ['A fruit', 'A tree', 'ვაშლი'])
+        self.assertLessEqual({meaning.pk for meaning in self.meanings}, set(meanings))
+
+    def test_duplicates(self):
+        duplicate = {'description': 'A fruit', 'target_language': self.english}
+        sync_meanings(self.entry, [duplicate, duplicate, duplicate])
+        meanings = self.meanings_by_pk()
+        self.assertEqual(list(meanings.values()), ['A fruit'] * 3)
+        self.assertIn(self.meanings[0].pk, meanings)
+
+        sync_meanings(self.entry, [duplicate])
+        self.assertEqual(self.meanings_by_pk(), {self.meanings[0].pk: 'A fruit'})
+
+    def test_edited_example_is_highlighted_again(self):
+        sync_examples(self.entry, [
+            {'sentence': 'An apple a day.', 'source': 'user'},
+            {'sentence': 'Apples grow on trees.', 'source': 'ai'},
+        ])
+        example = Example.objects.get(pk=self.examples[0].pk)
+        self.assertEqual(example.sentence, 'An apple a day.')
+        self.assertEqual(example.highlighted_sentence, highlight_sentence('An apple a day.', self.entry.word, 'English'))
+        self.assertIn('apple</', example.highlighted_sentence)
+
+    def test_example_source_change_is_recreated(self):
+        sync_examples(self.entry, [
+            {'sentence': 'I ate an apple.', 'source': 'ai'},
+            {'sentence': 'Apples grow on trees.', 'source': 'ai'},
+        ])
+        examples = Example.objects.filter(entry=self.entry)
+        self.assertEqual(sorted(examples.values_list('source', flat=True)), ['ai', 'ai'])
+        self.assertNotIn(self.examples[0].pk, examples.values_list('pk', flat=True))
+
+
+class HighlightingTests(SimpleTestCase):
+    """
+    Examples are highlighted with the inflections of their entry's word in
+    the language of its folder.
+    """
+    def find(self, forms, text, word_boundaries=True):
+        """Return the matched substrings of the text."""
+        return [text[start:end] for start, end in InflectionAutomaton(forms, word_boundaries).find(text)]
+
+    def test_matches_are_leftmost_longest_and_do_not_overlap(self):
+        self.assertEqual(self.find(['ab', 'abc', 'bcd'], 'abcd', word_boundaries=False), ['abc'])
+        self.assertEqual(self.find(['ab', 'bc'], 'abc', word_boundaries=False), ['ab'])
+        self.assertEqual(self.find(['a', 'aa'], 'aaa', word_boundaries=False), ['aa', 'a'])
+
+    def test_matches_are_words(self):
+        self.assertEqual(self.find(['cat', 'cats'], 'cats concatenate cat_ cat, (Cat)'), ['cats', 'cat', 'Cat'])
+        # Without a boundary at the longest form, a shorter one may still match
+        self.assertEqual(self.find(['car', 'cars'], 'carsx car-s'), ['car'])
+
+    def test_mandarin_matches_inside_words(self):
+        self.assertEqual(highlight_sentence('我昨天看到了苹果。', '苹果', 'Mandarin'),
+                         '我昨天看到了<span class="highlight">苹果</span>。')
+        self.assertEqual(highlight_sentence('applepie', 'apple', 'English'), 'applepie')
+
+    def test_matches_ignore_case(self):
+        self.assertEqual(self.find(['straße'], 'STRASSE Straße STRAßE'), ['Straße', 'STRAßE'])
+        self.assertEqual(highlight_sentence('APPLES and Apple', 'Apple', 'English'),
+                         '<span class="highlight">APPLES</span> and <span class="highlight">Apple</span>')
+
+    def test_output_is_escaped(self):
+        self.assertEqual(
+            highlight_sentence('<b>fish & "chips"</b>', '<b>fish', 'English'),
+            '<span class="highlight">&lt;b&gt;fish</span> &amp; &quot;chips&quot;&lt;/b&gt;',
+        )
+        self.assertEqual(highlight_sentence('<i>x</i>', 'apple', 'English'), '&lt;i&gt;x&lt;/i&gt;')
+        self.assertEqual(highlight_sentence('<i>x</i>', '', 'English'), '&lt;i&gt;x&lt;/i&gt;')
+
+    def test_inflections(self):
+        cases = {
+            'English': [('city', 'cities'), ('life', 'lives'), ('leaf', 'leaves'), ('bake', 'baking'),
+                        ('apple', "apple's")],
+            'Korean': [('사과', '사과를'), ('학교', '학교에서')],
+            'Georgian': [('კაცი', 'კაცმა'), ('კაცი', 'კაცები'), ('დედა', 'დედის'), ('დედა', 'დედაში')],
+            'French': [('journal', 'journaux'), ('bateau', 'bateaux'), ('ville', 'villes')],
+            'Spanish': [('luz', 'luces'), ('niño', 'niñas'), ('ciudad', 'ciudades')],
+            'German': [('Haus', 'Hauses'), ('Freundin', 'Freundinnen')],
+        }
+        for language, pairs in cases.items():
+            for word, form in pairs:
+                with self.subTest(language=language, word=word, form=form):
+                    self.assertIn(form.lower(), set(get_matcher(language).inflections(word.lower())))
+                    self.assertEqual(highlight_sentence(form, word, language), f'<span class="highlight">{escape(form)}</span>')
+
+    def test_unknown_languages_match_the_word_only(self):
+        self.assertEqual(highlight_sentence('apple apples', 'apple', 'Klingon'),
+                         '<span class="highlight">apple</span> apples')
+
+
+class LanguageRegistryTests(TestCase):
+    """
+    Language lookups follow renames and creations, whether made by this
+    process or, through the shared cache generation, by another one.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.language = Language.objects.create(name='English')
+
+    def setUp(self):
+        cache.clear()
+        load_language_registry()
+
+    def test_rename(self):
+        self.language.name = 'German'
+        self.language.save()
+        self.assertEqual(get_language(pk=self.language.pk).name, 'German')
+        self.assertNotIn('English', get_languages())
+
+    def test_create(self):
+        language = Language.objects.create(name='French')
+        self.assertEqual(get_language(name='French'), language)
+        self.assertIn('French', get_languages())
+
+    def test_rename_by_another_process(self):
+        # Another process renames without signals reaching this one, then bumps the generation
+        Language.objects.filter(pk=self.language.pk).update(name='German')
+        self.assertEqual(get_language(pk=self.language.pk).name, 'English')
+
+        invalidate_cache_namespaces(LANGUAGES_NAMESPACE)
+        with mock.patch('dictionary.languages.REGISTRY_CHECK_INTERVAL', 0):
+            self.assertEqual(get_language(pk=self.language.pk).name, 'German')
+
+    def test_miss_reloads_only_changed_registry(self):
+        with self.assertNumQueries(0), self.assertRaises(Language.DoesNotExist):
+            get_language(name='French')
+
+        Language.objects.bulk_create([Language(name='French', slug='french')])
+        invalidate_cache_namespaces(LANGUAGES_NAMESPACE)
+        self.assertEqual(get_language(name='French').name, 'French')
+
+    def test_create_by_another_process(self):
+        Language.objects.bulk_create([Language(name='French', slug='french')])
+        invalidate_cache_namespaces(LANGUAGES_NAMESPACE)
+        with mock.patch('dictionary.languages.REGISTRY_CHECK_INTERVAL', 0):
+            self.assertIn('French', get_languages())
+
+
+class FastSerializerTests(TestCase):
+    """
+    The fast path serializers render exactly the same data as their
+    ``ModelSerializer`` counterparts.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        user = CustomUser.objects.create_user(email='author@example.com', password='password', username='author')
+        english = Language.objects.create(name='English')
+        german = Language.objects.create(name='German')
+        folder = DictionaryFolder.objects.create(name='Books', user=user, language=english)
+        cls.dictionary = Dictionary.objects.create(name='Chapter One', folder=folder)
+        apple, pear, plum = DictionaryEntry.objects.bulk_create([
+            DictionaryEntry(
+                dictionary=cls.dictionary, word='apple', slug='apple', notes='Red', image='entry_images/apple.png',
+                image_derivatives={'thumb': {'name': derivative_name('a' * 64, 'thumb', 'png'), 'width': 128}},
+            ),
+            DictionaryEntry(dictionary=cls.dictionary, word='pear', slug='pear', image='entry_images/pear.jpg'),
+            DictionaryEntry(dictionary=cls.dictionary, word='plum', slug='plum'),
+        ])
+        Meaning.objects.bulk_create([
+            Meaning(entry=apple, description='Apfel', target_language=german),
+            Meaning(entry=apple, description='apple', target_language=english),
+            Meaning(entry=pear, description='Birne', target_language=german),
+        ])
+        Example.objects.bulk_create([
+            Example(entry=apple, sentence='An apple a day.', source='user'),
+            Example(entry=plum, sentence='A plum tree.', source='generated'),
+        ])
+
+    def setUp(self):
+        self.entries = DictionaryEntry.objects.filter(dictionary=self.dictionary).order_by('-created_at', '-id')
+
+    def assertSameData(self, serializer_class, fast_serializer_class, queryset):
+        for request in (None, Request(APIRequestFactory().get('/api/'))):
+            with self.subTest(request=request):
+                context = {'request': request}
+                self.assertEqual(
+                    fast_serializer_class(self.entries.values(*fast_serializer_class.values_fields), context=context).data,
+                    serializer_class(queryset, many=True, context=context).data,
+                )
+
+    def test_entries(self):
+        self.assertSameData(
+            DictionaryEntrySerializer, FastDictionaryEntrySerializer,
+            self.entries.prefetch_related('meanings', 'examples'),
+        )
+
+    def test_search(self):
+        self.assertSameData(
+            SearchDictionaryEntrySerializer, FastSearchDictionaryEntrySerializer,
+            self.entries.select_related('dictionary__folder__user').prefetch_related('meanings'),
+        )
+
+
+class SlugPathInvalidationTests(TestCase):
+    """
+    Renamed and deleted rows stop resolving from their old slugs once
+    committed, even if a request cached the old path before the commit.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email='author@example.com', password='password', username='author')
+        language = Language.objects.create(name='English')
+        cls.folder = DictionaryFolder.objects.create(name='Books', user=cls.user, language=language)
+        cls.dictionary = Dictionary.objects.create(name='Chapter One', folder=cls.folder)
+        cls.old_path = (cls.user.slug, cls.folder.slug, cls.dictionary.slug)
+
+    def setUp(self):
+        cache.clear()
+
+    def resolve_old_path_before_writing(self, signal):
+        """
+        Resolve the old path from a receiver of ``signal`` connected after
+        the invalidating one, as a concurrent request would before the commit.
+        """
+        def resolve(sender, instance, **kwargs):
+            self.assertEqual(resolve_slug_path(*self.old_path).dictionary_id, self.dictionary.pk)
+
+        signal.connect(resolve, sender=Dictionary)
+        self.addCleanup(signal.disconnect, resolve, sender=Dictionary)
+
+    def test_rename(self):
+        self.resolve_old_path_before_writing(pre_save)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dictionary.slug = 'chapter-two'
+            self.dictionary.save()
+
+        with self.assertRaises(Http404):
+            resolve_slug_path(*self.old_path)
+        self.assertEqual(resolve_slug_path(self.user.slug, self.folder.slug, 'chapter-two').dictionary_id,
+                         self.dictionary.pk)
+
+    def test_deletion(self):
+        self.resolve_old_path_before_writing(pre_delete)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dictionary.delete()
+
+        with self.assertRaises(Http404):
+            resolve_slug_path(*self.old_path)
+
+
+class SlugPathObjectTests(TestCase):
+    """
+    The object addressed by a nested URL is fetched with a single query,
+    whether or not its slug path is cached.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email='author@example.com', password='password', username='author')
+        language = Language.objects.create(name='English')
+        cls.folder = DictionaryFolder.objects.create(name='Books', user=cls.user, language=language)
+        cls.dictionary = Dictionary.objects.create(name='Chapter One', folder=cls.folder)
+        cls.entry = DictionaryEntry.objects.create(dictionary=cls.dictionary, word='apple')
+        cls.slugs = (cls.user.slug, cls.folder.slug, cls.dictionary.slug, cls.entry.slug)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_get_object(self):
+        querysets = (CustomUser.objects, DictionaryFolder.objects, Dictionary.objects.select_related('folder'),
+                     DictionaryEntry.objects.select_related('dictionary'))
+        for depth, (queryset, instance) in enumerate(zip(querysets, (self.user, self.folder, self.dictionary,
+                                                                     self.entry))):
+            slugs = self.slugs[:depth + 1]
+            for cached in (False, True):
+                with self.subTest(model=queryset.model.__name__, cached=cached), self.assertNumQueries(1):
+                    path, fetched = get_object_by_slug_path(queryset, *slugs)
+                self.assertEqual(fetched, instance)
+                self.assertEqual(path, resolve_slug_path(*slugs))
+                self.assertFalse(any(name.startswith('slug_path_') for name in vars(fetched)))
+
+    def test_missing_object(self):
+        with self.assertRaises(Http404):
+            get_object_by_slug_path(Dictionary.objects, self.user.slug, self.folder.slug, 'missing')
+
+    def test_model_must_match_deepest_slug(self):
+        with self.assertRaises(ValueError):
+            get_object_by_slug_path(Dictionary.objects, *self.slugs)
+
+    def test_entry_initiation_view(self):
+        CustomUser.objects.filter(pk=self.user.pk).update(is_verified=True)
+        self.client.force_login(self.user)
+        url = reverse('dictionaries:initiate-entry', args=self.slugs[:3])
+        with CaptureQueriesContext(connection) as cold:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        with CaptureQueriesContext(connection) as warm:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        # Fetched by its slugs in the cold request and by its primary key in the warm one
+        for queries in (cold, warm):
+            self.assertEqual(sum('FROM "dictionary_dictionary"' in query['sql'] for query in queries), 1)
+
+
+class ConditionalGetTests(TestCase):
+    """
+    The entries API answers a current ``If-None-Match`` with 304 and tags
+    its responses anew whenever anything rendered in them changes.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email='author@example.com', password='password', username='author')
+        language = Language.objects.create(name='English')
+        folder = DictionaryFolder.objects.create(name='Books', user=cls.user, language=language)
+        dictionary = Dictionary.objects.create(name='Chapter One', folder=folder)
+        cls.entry = DictionaryEntry.objects.create(dictionary=dictionary, word='apple')
+        cls.meaning = Meaning.objects.create(entry=cls.entry, description='A fruit', target_language=language)
+        cls.example = Example.objects.create(entry=cls.entry, sentence='I ate an apple.', source='user')
+        cls.url = reverse('dictionaries_api:entry-list', kwargs={
+            'folder_pk': folder.pk, 'dictionary_pk': dictionary.pk,
+        })
+
+    def etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_matching_etag(self):
+        etag = self.etag()
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_edits_change_etag(self):
+        etags = [self.etag()]
+        self.entry.notes = 'Notes'
+        self.entry.save()
+        etags.append(self.etag())
+        self.meaning.description = 'A round fruit'
+        self.meaning.save()
+        etags.append(self.etag())
+        self.example.sentence = 'An apple a day.'
+        self.example.save()
+        etags.append(self.etag())
+        self.user.username = 'writer'
+        self.user.save()
+        etags.append(self.etag())
+        self.assertEqual(len(set(etags)), len(etags), etags)
+
+    def test_folder_listing_etag(self):
+        for url in (reverse('dictionaries_api:folder-list'),
+                    reverse('dictionaries_api:folder-list') + f'?user={self.user.pk}'):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                with self.assertNumQueries(0):
+                    self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+                self.entry.notes = f'Notes for {url}'
+                self.entry.save()
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+                self.user.username = f'writer{len(url)}'
+                self.user.save()
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_etag_is_scoped_to_user(self):
+        response = self.client.get(self.url)
+        vary = {header.strip() for header in response['Vary'].split(',')}
+        self.assertLessEqual({'Accept', 'Authorization', 'Cookie'}, vary)
+
+        self.client.force_login(self.user)
+        user_response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(user_response.status_code, 200)
+        self.assertNotEqual(user_response['ETag'], response['ETag'])
+
+
+class CursorPaginationTests(TestCase):
+    """
+    Cursor pages of the entries API neither skip nor repeat rows sharing
+    the position they are keyed on.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        user = CustomUser.objects.create_user(email='author@example.com', password='password', username='author')
+        language = Language.objects.create(name='English')
+        folder = DictionaryFolder.objects.create(name='Books', user=user, language=language)
+        cls.dictionary = Dictionary.objects.create(name='Chapter One', folder=folder)
+        for index in range(25):
+            DictionaryEntry.objects.create(dictionary=cls.dictionary, word=f'word {index:02}')
+        # Every entry but the first and last shares one timestamp
+        entries = DictionaryEntry.objects.filter(dictionary=cls.dictionary).order_by('id')
+        DictionaryEntry.objects.filter(pk__in=list(entries.values_list('pk', flat=True)[1:24])).update(
+            created_at=entries[1].created_at
+        )
+        cls.url = reverse('dictionaries_api:entry-list', kwargs={
+            'folder_pk': folder.pk, 'dictionary_pk': cls.dictionary.pk,
+        }) + '?fields=id'
+
+    def walk(self, url, link):
+        """Return the entry ids of every page from ``url`` on, following ``link``."""
+        pages = []
+        while url:
+            page = self.client.get(url).json()
+            pages.append([entry['id'] for entry in page['results']])
+            url = page[link]
+        return pages
+
+    def test_tied_created_at_pages(self):
+        expected = list(
+            DictionaryEntry.objects.filter(dictionary=self.dictionary)
+            .order_by('-created_at', '-id').values_list('pk', flat=True)
+        )
+        forward = self.walk(self.url, 'next')
+        self.assertEqual(sum(forward, []), expected)
+
+        last_page = self.client.get(self.url).json()
+        while last_page['next']:
+            last_page = self.client.get(last_page['next']).json()
+        backward = self.walk(last_page['previous'], 'previous')
+        self.assertEqual(sum(reversed(backward), []) + forward[-1], expected)
+
+
+def weasyprint_loads() -> bool:
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError):
+        return False
+    return True
+
+
+class QueryScalingTests(TestCase):
+    """
+    N+1 regression harness: requests every URL pattern of the site and API
+    apps as the owner of a small dataset, then as the owner of one with
+    more rows at every level, more folders and dictionaries than fit on a
+    page, and asserts that every request answers as expected and issues no
+    more queries on the larger one.
+
+    Caches are cleared before every counted request, so that the queries of
+    cached fragments and lookups are counted too.
+    """
+    NAMESPACES = ('dictionaries', 'dictionaries_api', 'accounts', 'accounts_api', 'leaderboard', 'leaderboard_api')
+    # URL patterns serving files, whose queries do not depend on any row count
+    SKIPPED_URL_NAMES = {'accounts:image_derivative'}
+    # Data of the URL patterns requested with POST instead of GET
+    POST_DATA = {
+        'dictionaries:folder-flashcards': {'front_type': 'word'},
+        'dictionaries:dictionary-flashcards': {'front_type': 'meaning'},
+        'dictionaries_api:folder-generate-folder-flashcards': {'front_type': 'word'},
+        'dictionaries_api:dictionary-generate-dictionary-flashcards': {'front_type': 'meaning'},
+    }
+    # URL patterns rendering PDFs, skipped where WeasyPrint cannot load its system libraries
+    PDF_URL_NAMES = {
+        'dictionaries:folder-pdf-download',
+        'dictionaries:dictionary-pdf-download',
+        'dictionaries_api:folder-download-folder-pdf',
+        'dictionaries_api:dictionary-download-dictionary-pdf',
+    }
+    # Status codes of the URL patterns not answering their owner with 200
+    EXPECTED_STATUS_CODES = {
+        # Redirected to the entry form, without an entry being initiated
+        'dictionaries:create-entry': 302,
+        # Redirected to the login page, with the email already verified or the user signed out
+        'accounts:logout': 302,
+        'accounts:verify_email': 302,
+        'accounts:resend_verification': 302,
+        # Redirected to the same form under a session token
+        'accounts:password_reset_confirm': 302,
+        # Only for anonymous clients
+        'accounts_api:signup': 403,
+        'accounts_api:verify_email': 403,
+        'accounts_api:resend_verification_email': 403,
+        'accounts_api:reset_password_request': 403,
+        'accounts_api:reset_password': 403,
+        # POST only
+        'dictionaries_api:entry-generate': 405,
+        'accounts_api:token_obtain_pair': 405,
+        'accounts_api:token_refresh': 405,
+    }
+    SIZE = DatasetSize(users=2, folders=2, dictionaries=2, entries=3, meanings=2, examples=2)
+    LARGE_SIZE = DatasetSize(users=4, folders=12, dictionaries=12, entries=6, meanings=2, examples=2)
+
+    @classmethod
+    def url_patterns(cls):
+        """
+        Yield the namespaced name and the keyword argument names of every
+        URL pattern in ``NAMESPACES``, leaving out format suffix variants.
+        """
+        def walk(patterns, namespaces):
+            for pattern in patterns:
+                if isinstance(pattern, URLResolver):
+                    yield from walk(pattern.url_patterns, namespaces + [pattern.namespace] * bool(pattern.namespace))
+                elif pattern.name and namespaces and namespaces[-1] in cls.NAMESPACES:
+                    yield ':'.join(namespaces + [pattern.name]), pattern
+
+        skipped = cls.SKIPPED_URL_NAMES if weasyprint_loads() else cls.SKIPPED_URL_NAMES | cls.PDF_URL_NAMES
+        seen = set()
+        for name, pattern in walk(get_resolver().url_patterns, []):
+            arguments = set(pattern.pattern.regex.groupindex)
+            if name in seen or name in skipped or 'format' in arguments:
+                continue
+            seen.add(name)
+            yield name, arguments
+
+    @staticmethod
+    def url_kwargs(name, arguments, dataset):
+        """
+        Fill the keyword arguments of a URL pattern from the first rows of a dataset.
+        """
+        entry = dataset['entries'][0]
+        dictionary = entry.dictionary
+        folder = dictionary.folder
+        user = folder.user
+        values = {
+            'user_slug': user.slug,
+            'folder_slug': folder.slug,
+            'dictionary_slug': dictionary.slug,
+            'entry_slug': entry.slug,
+            'user_id': user.pk,
+            'folder_pk': folder.pk,
+            'dictionary_pk': dictionary.pk,
+            'uidb64': urlsafe_base64_encode(force_bytes(user.pk)),
+            'token': default_token_generator.make_token(user),
+        }
+        if 'pk' in arguments:
+            basename = name.split(':')[-1].split('-')[0]
+            values['pk'] = {
+                'folder': folder.pk, 'dictionary': dictionary.pk, 'entry': entry.pk, 'profile': user.profile.pk,
+            }[basename]
+        return {argument: values[argument] for argument in arguments}
+
+    def count_queries(self, dataset):
+        """
+        Return the number of queries and the status code of a request to
+        every URL pattern as the owner of the first rows of the dataset.
+        """
+        owner = dataset['users'][0]
+        counts = {}
+        for name, arguments in self.url_patterns():
+            url = reverse(name, kwargs=self.url_kwargs(name, arguments, dataset))
+            client = Client()
+            client.force_login(owner)
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                if name in self.POST_DATA:
+                    response = client.post(url, self.POST_DATA[name])
+                else:
+                    response = client.get(url)
+            counts[name] = (len(queries), response.status_code)
+        return counts
+
+    def test_query_counts_do_not_grow_with_rows(self):
+        small = self.count_queries(generate_dataset(self.SIZE, prefix='small'))
+        large = self.count_queries(generate_dataset(self.LARGE_SIZE, prefix='large'))
+
+        for name, (queries, status_code) in small.items():
+            with self.subTest(url_name=name):
+                expected_status_code = self.EXPECTED_STATUS_CODES.get(name, 200)
+                self.assertEqual(status_code, expected_status_code)
+                self.assertEqual(large[name][1], expected_status_code)
+                self.assertLessEqual(large[name][0], queries, f'{name} issues more queries with more rows')
+
+
+@override_settings(QUERY_BUDGETS={'tests:view': 1})
+class QueryBudgetTests(TestCase):
+    """
+    Requests are counted per view, and requests over their view's budget
+    fail in strict mode and are logged otherwise.
+    """
+    def setUp(self):
+        query_metrics.reset()
+        self.addCleanup(query_metrics.reset)
+
+    def request(self, queries, view_name='tests:view'):
+        """Handle a request to a view issuing the given number of queries."""
+        def view(request):
+            request.resolver_match = mock.Mock(view_name=view_name)
+            for _ in range(queries):
+                Language.objects.exists()
+            return HttpResponse()
+
+        return QueryBudgetMiddleware(view)(RequestFactory().get('/'))
+
+    def test_strict_mode_fails_requests_over_budget(self):
+        self.request(1)
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'tests:view issued 2 queries for a budget of 1'):
+            self.request(2)
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    def test_requests_over_budget_are_logged(self):
+        with self.assertLogs('personalized_dictionary.instrumentation', 'WARNING') as logs:
+            self.request(2)
+        self.assertIn('tests:view issued 2 queries for a budget of 1', logs.output[0])
+
+    def test_metrics_are_labelled_with_the_view_only(self):
+        with self.assertLogs('personalized_dictionary.instrumentation', 'INFO') as logs:
+            self.request(1)
+            self.request(0)
+            self.request(3, view_name='tests:"other"')
+
+        metrics = query_metrics.render()
+        self.assertIn('django_view_requests_total{view="tests:view"} 2\n', metrics)
+        self.assertIn('django_view_db_queries_total{view="tests:view"} 1\n', metrics)
+        self.assertIn('django_view_db_queries_max{view="tests:\\"other\\""} 3\n', metrics)
+        self.assertIn('django_view_db_slowest_query_seconds{view="tests:view"} ', metrics)
+        self.assertNotIn('SELECT', metrics)
+        self.assertIn('Slowest query of tests:view so far', logs.output[0])
+        self.assertIn('SELECT', logs.output[0])
+
+
+@override_settings(PROFILING_INTERVAL=0.001)
+class ProfilingTests(SimpleTestCase):
+    """
+    Samples are taken from the profiled threads only and attributed to the
+    phase of the innermost library they run in, and stored profiles are
+    pruned oldest first.
+    """
+    @staticmethod
+    def frame_in(module: str):
+        """Return a frame running in the given module, called from this test."""
+        namespace = {'__name__': module, 'sys': sys}
+        exec('def current_frame():\n    return sys._getframe()', namespace)
+        return namespace['current_frame']()
+
+    def test_samples_are_attributed_to_the_innermost_phase(self):
+        profile = Profile('request', 'tests:view', sampled=True)
+        profile.add_sample(self.frame_in('django.db.backends.sqlite3.base'))
+        profile.add_sample(self.frame_in('PIL.Image'))
+        profile.add_sample(self.frame_in('dictionary.views'))
+        profile.add_sample(self.frame_in('dictionary.views'))
+
+        self.assertEqual(profile.phases, {'db': 1, 'pillow': 1, OTHER_PHASE: 2})
+        self.assertTrue(any(stack.endswith(';PIL.Image.current_frame:2') for stack in profile.stacks))
+
+    def test_sampler_samples_profiled_threads_while_they_run(self):
+        profile = Profile('request', 'tests:view', sampled=True)
+        profile.start()
+        thread = sampler.thread
+        deadline = time.monotonic() + 5
+        while not profile.phases and time.monotonic() < deadline:
+            sum(range(1000))
+        profile.stop()
+
+        self.assertTrue(profile.phases)
+        self.assertTrue(all('test_sampler_samples_profiled_threads' in stack for stack in profile.stacks))
+        samples = sum(profile.phases.values())
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(sampler.thread)
+        self.assertEqual(sum(profile.phases.values()), samples)
+
+    @override_settings(PROFILING_SAMPLE_RATE=0, PROFILING_SLOW_THRESHOLD=0)
+    def test_unsampled_runs_are_not_profiled_without_a_threshold(self):
+        self.assertIsNone(start_profile('request', 'tests:view'))
+
+    def test_store_prunes_the_oldest_profiles(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        store = ProfileStore(directory.name, max_profiles=2)
+
+        names = []
+        for index in range(3):
+            profile = Profile('task', f'tests.task_{index}', sampled=True)
+            profile.started_at += index
+            profile.stacks['tests.main;tests.work'] = 1
+            names.append(store.save(profile).name)
+
+        self.assertCountEqual([path.name for path in Path(directory.name).glob('*.json')], names[1:])
+        self.assertEqual(len(list(Path(directory.name).glob('*.folded'))), 2)
+        self.assertTrue(names[2].endswith('-task-tests-task_2.json'), names[2])
+
+
+@override_settings(READ_REPLICAS=['replica_1'], REPLICA_STICKINESS_SECONDS=10)
+class ReplicaRoutingTests(SimpleTestCase):
+    """
+    Safe requests read from a replica until they write, and clients that
+    wrote read from the primary for a while.
+    """
+    def setUp(self):
+        cache.clear()
+
+    def request(self, method='get', write=False, cookies=None, user=None, headers=None, view_user=None):
+        """
+        Return the databases a view reads from before and after writing, and
+        the response. ``user`` is signed in with the session, ``view_user``
+        is set by the view, as token authentication does.
+        """
+        databases = []
+
+        def view(request):
+            databases.append(router.db_for_read(DictionaryEntry))
+            if view_user is not None:
+                request.user = view_user
+            if write:
+                router.db_for_write(DictionaryEntry)
+                databases.append(router.db_for_read(DictionaryEntry))
+            return HttpResponse()
+
+        request = getattr(RequestFactory(), method)('/', headers=headers)
+        request.COOKIES.update(cookies or {})
+        if user is not None:
+            request.user = user
+        response = ReplicaMiddleware(view)(request)
+        return databases, response
+
+    @staticmethod
+    def token_headers(user_id):
+        """Return the headers authenticating with an access token of the given user."""
+        token = AccessToken()
+        token[jwt_settings.USER_ID_CLAIM] = user_id
+        return {'Authorization': f'Bearer {token}'}
+
+    def test_safe_request_reads_from_replica(self):
+        databases, response = self.request()
+        self.assertEqual(databases, ['replica_1'])
+        self.assertNotIn(REPLICA_PIN_COOKIE, response.cookies)
+
+    def test_unsafe_request_reads_from_primary_and_pins_client(self):
+        databases, response = self.request('post', write=True)
+        self.assertEqual(databases, ['default', 'default'])
+
+        cookies = {REPLICA_PIN_COOKIE: response.cookies[REPLICA_PIN_COOKIE].value}
+        databases, _response = self.request(cookies=cookies)
+        self.assertEqual(databases, ['default'])
+
+    def test_reads_after_write_go_to_primary(self):
+        databases, response = self.request(write=True)
+        self.assertEqual(databases, ['replica_1', 'default'])
+        self.assertIn(REPLICA_PIN_COOKIE, response.cookies)
+
+    def test_expired_pin_reads_from_replica(self):
+        databases, _response = self.request(cookies={REPLICA_PIN_COOKIE: '0'})
+        self.assertEqual(databases, ['replica_1'])
+        self.assertEqual(router.db_for_read(DictionaryEntry), 'default')
+
+    def test_user_pin_holds_for_token_clients(self):
+        user = mock.Mock(is_authenticated=True, pk=7)
+        databases, _response = self.request('post', write=True, headers=self.token_headers(7), view_user=user)
+        self.assertEqual(databases, ['default', 'default'])
+
+        databases, _response = self.request(headers=self.token_headers(7))
+        self.assertEqual(databases, ['default'])
+        databases, _response = self.request(headers=self.token_headers(8))
+        self.assertEqual(databases, ['replica_1'])
+        databases, _response = self.request(headers={'Authorization': 'Bearer invalid'})
+        self.assertEqual(databases, ['replica_1'])
+
+    def test_user_pin_holds_for_other_session_clients(self):
+        user = mock.Mock(is_authenticated=True, pk=7)
+        self.request(write=True, user=user)
+
+        databases, _response = self.request(user=user)
+        self.assertEqual(databases, ['default'])
+
+    def test_related_reads_follow_the_instance(self):
+        entry = DictionaryEntry()
+        entry._state.db = 'default'
+        databases = []
+
+        def view(request):
+            databases.append(router.db_for_read(Dictionary, instance=entry))
+            databases.append(router.db_for_read(Dictionary))
+            return HttpResponse()
+
+        ReplicaMiddleware(view)(RequestFactory().get('/'))
+        self.assertEqual(databases, ['default', 'replica_1'])
+
+    def test_sessions_are_read_from_primary(self):
+        request = RequestFactory().get('/')
+        response = ReplicaMiddleware(lambda request: HttpResponse(router.db_for_read(Session)))(request)
+        self.assertEqual(response.content, b'default')
@@ -0,0 +1,199 @@
+from typing import Iterable
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .languages import get_languages, load_language_registry
+from .models import DictionaryEntry, Example, Language, Meaning
+from .signals import examples_bulk_created
+
+
+def get_languages_by_name(names: Iterable[str]) -> dict:
+    """
+    Resolve language names to Language objects from the language registry.
+
+    Args:
+        names (Iterable[str]): Language names, duplicates allowed.
+
+    Returns:
+        dict: Mapping of language name to Language.
+
+    Raises:
+        Language.DoesNotExist: If any of the names is not a known language.
+    """
+    names = set(names)
+    registry = get_languages()
+    if not names.issubset(registry):
+        registry = load_language_registry().by_name
+
+    languages = {name: registry[name] for name in names if name in registry}
+    missing = names.difference(languages)
+    if missing:
+        raise Language.DoesNotExist(
+            _('Unknown languages: %(names)s') % {'names': ', '.join(sorted(missing))}
+        )
+    return languages
+
+
+def bulk_create_meanings(entry: DictionaryEntry, meanings_data: Iterable[dict]) -> list:
+    """
+    Create all meanings of an entry with a single insert.
+
+    Args:
+        entry (DictionaryEntry): Entry the meanings belong to.
+        meanings_data (Iterable[dict]): Meaning field values, with
+            ``target_language`` given as a Language object.
+
+    Returns:
+        list: Created Meaning instances.
+    """
+    return Meaning.objects.bulk_create(
+        Meaning(entry=entry, **meaning_data) for meaning_data in meanings_data
+    )
+
+
+def bulk_create_examples(entry: DictionaryEntry, examples_data: Iterable[dict]) -> list:
+    """
+    Create all examples of an entry with a single insert.
+
+    ``bulk_create`` does not call ``save``, so derived fields are refreshed
+    here, and it does not send ``post_save``, so ``examples_bulk_created``
+    is sent instead to keep the example statistics up to date.
+
+    Args:
+        entry (DictionaryEntry): Entry the examples belong to.
+        examples_data (Iterable[dict]): Example field values.
+
+    Returns:
+        list: Created Example instances.
+    """
+    examples = [Example(entry=entry, **example_data) for example_data in examples_data]
+    for example in examples:
+        example.refresh_derived_fields()
+    examples = Example.objects.bulk_create(examples)
+    if examples:
+        examples_bulk_created.send(sender=Example, entry=entry, examples=examples)
+    return examples
+
+
+def _content_key(model, values, fields: tuple) -> tuple:
+    """
+    Build a hashable key from the content of a row, with related objects
+    reduced to their primary keys.
+
+    Args:
+        model: Model class of the row.
+        values: Model instance or dict of field values.
+        fields (tuple): Names of the fields that make up the content.
+
+    Returns:
+        tuple: Content key of the row.
+    """
+    key = []
+    for name in fields:
+        if isinstance(values, dict):
+            value = values[name]
+            key.append(value.pk if isinstance(value, models.Model) else value)
+        else:
+            key.append(getattr(values, model._meta.get_field(name).attname))
+    return tuple(key)
+
+
+def _sync_related(model, existing, rows, fields: tuple, create, match_fields: tuple = ()) -> None:
+    """
+    Make the existing related rows of an entry match the incoming ones with
+    the smallest set of writes.
+
+    Rows whose content is unchanged are left alone. Leftover existing rows
+    are rewritten in place with leftover incoming rows sharing the same
+    ``match_fields``, and only what is left after that is inserted or deleted.
+    The ``derived_fields`` of the model, if any, are refreshed and written
+    along with rewritten rows.
+
+    Args:
+        model: Model class of the related rows.
+        existing (Iterable): Rows currently stored for the entry.
+        rows (Iterable[dict]): Incoming field values.
+        fields (tuple): Names of the fields compared and updated.
+        create (callable): Inserts a list of incoming rows.
+        match_fields (tuple): Fields that must be equal for a row to be
+            updated in place instead of being deleted and recreated.
+    """
+    unchanged = {}
+    for obj in existing:
+        unchanged.setdefault(_content_key(model, obj, fields), []).append(obj)
+
+    added = []
+    for row in rows:
+        matches = unchanged.get(_content_key(model, row, fields))
+        if matches:
+            matches.pop(0)
+        else:
+            added.append(row)
+
+    removed = {}
+    for objs in unchanged.values():
+        for obj in objs:
+            removed.setdefault(_content_key(model, obj, match_fields), []).append(obj)
+
+    derived_fields = getattr(model, 'derived_fields', ())
+    updated, created = [], []
+    for row in added:
+        candidates = removed.get(_content_key(model, row, match_fields))
+        if candidates:
+            obj = candidates.pop(0)
+            for name in fields:
+                setattr(obj, name, row[name])
+            if derived_fields:
+                obj.refresh_derived_fields()
+            updated.append(obj)
+        else:
+            created.append(row)
+
+    if updated:
+        model.objects.bulk_update(updated, (*fields, *derived_fields))
+    if created:
+        create(created)
+
+    deleted = [obj.pk for objs in removed.values() for obj in objs]
+    if deleted:
+        model.objects.filter(pk__in=deleted).delete()
+
+
+def sync_meanings(entry: DictionaryEntry, meanings_data: Iterable[dict]) -> None:
+    """
+    Update the meanings of an entry to match the given ones, touching only changed rows.
+
+    Args:
+        entry (DictionaryEntry): Entry whose meanings are updated.
+        meanings_data (Iterable[dict]): Meaning field values, with
+            ``target_language`` given as a Language object.
+    """
+    _sync_related(
+        Meaning,
+        entry.meanings.all(),
+        meanings_data,
+        fields=('description', 'target_language'),
+        create=lambda rows: bulk_create_meanings(entry, rows),
+    )
+
+
+def sync_examples(entry: DictionaryEntry, examples_data: Iterable[dict]) -> None:
+    """
+    Update the examples of an entry to match the given ones, touching only changed rows.
+
+    Only examples of the same source are rewritten in place, so the example
+    statistics, which count user-sourced examples, stay correct.
+
+    Args:
+        entry (DictionaryEntry): Entry whose examples are updated.
+        examples_data (Iterable[dict]): Example field values.
+    """
+    _sync_related(
+        Example,
+        entry.examples.all(),
+        examples_data,
+        fields=('sentence', 'source'),
+        create=lambda rows: bulk_create_examples(entry, rows),
+        match_fields=('source',),
+    )
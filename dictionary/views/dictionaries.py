@@ -4,9 +4,7 @@ from django.contrib import messages
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.core.exceptions import PermissionDenied
 from django.db import IntegrityError
-from django.db.models import Prefetch
-from django.http import HttpResponse
-from django.template.loader import render_to_string
+from django.http import Http404, HttpResponse
 from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
@@ -19,13 +17,15 @@ from django.views.generic import (
     UpdateView
 )
 from django.views.generic.list import MultipleObjectMixin
-from weasyprint import HTML
 
 from accounts.decorators import verified_email_required
 from accounts.models import CustomUser
+from dictionary.caching import cache_public_page, owner_namespaces
 from dictionary.filters import DictionariesFilter, DictionaryEntryFilter
-from dictionary.models import Dictionary, DictionaryEntry, DictionaryFolder
-from .mixins import CustomLoginRequiredMixin
+from dictionary.models import Dictionary, DictionaryEntry
+from dictionary.pdf import render_pdf
+from dictionary.resolvers import get_object_by_slug_path, resolve_slug_path
+from .mixins import CustomLoginRequiredMixin, SlugPathMixin
 
 
 class DictionaryListView(ListView):
@@ -79,7 +79,8 @@ class DictionaryListView(ListView):
         return context
 
 
-class DictionaryDetailView(DetailView, MultipleObjectMixin):
+@method_decorator(cache_public_page(owner_namespaces), name='dispatch')
+class DictionaryDetailView(SlugPathMixin, DetailView, MultipleObjectMixin):
     """
     Detailed view for a specific dictionary.
 
@@ -95,33 +96,13 @@ class DictionaryDetailView(DetailView, MultipleObjectMixin):
     paginate_by = 10
 
     def get_queryset(self):
-        user_slug = self.kwargs.get('user_slug')
-        folder_slug = self.kwargs.get('folder_slug')
-
-        entries_queryset = (
-            DictionaryEntry.objects
-            .select_related('dictionary')
-            .prefetch_related('meanings')
-            .order_by('-created_at')
-        )
-        prefetch_entries = Prefetch('entries', queryset=entries_queryset)
-
-        return (
-            Dictionary.objects
-            .select_related('folder', 'folder__user__profile')
-            .prefetch_related(prefetch_entries)
-            .filter(
-                folder__user__slug=user_slug,
-                folder__slug=folder_slug
-            ).order_by('-created_at')
-        )
+        return Dictionary.objects.select_related('folder', 'folder__user__profile')
 
     def get_object(self, queryset=None):
         if queryset is None:
             queryset = self.get_queryset()
 
-        dictionary_slug = self.kwargs.get('dictionary_slug')
-        dictionary = get_object_or_404(queryset, slug=dictionary_slug)
+        dictionary = self.get_slug_path_object(queryset)
 
         if dictionary.folder.user != self.request.user and dictionary.accessibility != 'Public':
             raise PermissionDenied(_('You do not have permission to view this dictionary.'))
@@ -129,8 +110,12 @@ class DictionaryDetailView(DetailView, MultipleObjectMixin):
         return dictionary
 
     def get_context_data(self, **kwargs):
-        dictionary = self.object
-        entries = dictionary.entries.all()
+        entries = (
+            DictionaryEntry.objects
+            .filter(dictionary=self.object)
+            .prefetch_related('meanings')
+            .order_by('-created_at')
+        )
 
         entry_filter = DictionaryEntryFilter(self.request.GET, queryset=entries)
         context = super().get_context_data(object_list=entry_filter.qs, **kwargs)
@@ -139,7 +124,7 @@ class DictionaryDetailView(DetailView, MultipleObjectMixin):
 
 
 @method_decorator(verified_email_required, name='dispatch')
-class DictionaryCreateView(CustomLoginRequiredMixin, CreateView):
+class DictionaryCreateView(CustomLoginRequiredMixin, SlugPathMixin, CreateView):
     """
     View for creating a new dictionary.
 
@@ -170,10 +155,7 @@ class DictionaryCreateView(CustomLoginRequiredMixin, CreateView):
 
     def form_valid(self, form):
         try:
-            user_slug = self.kwargs.get('user_slug')
-            folder_slug = self.kwargs.get('folder_slug')
-            folder = DictionaryFolder.objects.get(user__slug=user_slug, slug=folder_slug)
-            form.instance.folder = folder
+            form.instance.folder_id = self.get_slug_path().folder_id
 
             try:
                 return super().form_valid(form)
@@ -181,13 +163,13 @@ class DictionaryCreateView(CustomLoginRequiredMixin, CreateView):
                 messages.error(self.request, _('A dictionary with that name already exists in the folder.'))
                 return self.form_invalid(form)
 
-        except DictionaryFolder.DoesNotExist:
+        except Http404:
             messages.error(self.request, _('Selected folder does not exist.'))
             return self.form_invalid(form)
 
 
 @method_decorator(verified_email_required, name='dispatch')
-class DictionaryUpdateView(CustomLoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class DictionaryUpdateView(CustomLoginRequiredMixin, SlugPathMixin, UserPassesTestMixin, UpdateView):
     """
     View for updating an existing dictionary.
 
@@ -202,14 +184,8 @@ class DictionaryUpdateView(CustomLoginRequiredMixin, UserPassesTestMixin, Update
 
     def get_object(self, queryset=None):
         if not hasattr(self, '_object'):
-            user_slug = self.kwargs.get('user_slug')
-            folder_slug = self.kwargs.get('folder_slug')
-            dictionary_slug = self.kwargs.get('dictionary_slug')
-            self._object = get_object_or_404(
-                Dictionary.objects.select_related('folder__user'),
-                folder__user__slug=user_slug,
-                folder__slug=folder_slug,
-                slug=dictionary_slug
+            self._object = self.get_slug_path_object(
+                Dictionary.objects.select_related('folder__user')
             )
         return self._object
 
@@ -225,20 +201,11 @@ class DictionaryUpdateView(CustomLoginRequiredMixin, UserPassesTestMixin, Update
 
     def form_valid(self, form):
         try:
-            folder_slug = self.kwargs.get('folder_slug')
-            folder = DictionaryFolder.objects.get(slug=folder_slug)
-            form.instance.folder = folder
-
-            try:
-                response = super().form_valid(form)
-                messages.success(self.request, _('The dictionary has been updated.'))
-                return response
-            except IntegrityError:
-                messages.error(self.request, _('A dictionary with that name already exists in the folder.'))
-                return self.form_invalid(form)
-
-        except DictionaryFolder.DoesNotExist:
-            messages.error(self.request, _('Selected folder does not exist.'))
+            response = super().form_valid(form)
+            messages.success(self.request, _('The dictionary has been updated.'))
+            return response
+        except IntegrityError:
+            messages.error(self.request, _('A dictionary with that name already exists in the folder.'))
             return self.form_invalid(form)
 
     def test_func(self):
@@ -247,7 +214,7 @@ class DictionaryUpdateView(CustomLoginRequiredMixin, UserPassesTestMixin, Update
 
 
 @method_decorator(verified_email_required, name='dispatch')
-class DictionaryDeleteView(CustomLoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class DictionaryDeleteView(CustomLoginRequiredMixin, SlugPathMixin, UserPassesTestMixin, DeleteView):
     """
     View for deleting a dictionary.
 
@@ -261,14 +228,8 @@ class DictionaryDeleteView(CustomLoginRequiredMixin, UserPassesTestMixin, Delete
 
     def get_object(self, queryset=None):
         if not hasattr(self, '_object'):
-            user_slug = self.kwargs.get('user_slug')
-            folder_slug = self.kwargs.get('folder_slug')
-            dictionary_slug = self.kwargs.get('dictionary_slug')
-            self._object = get_object_or_404(
-                Dictionary.objects.select_related('folder__user'),
-                folder__user__slug=user_slug,
-                folder__slug=folder_slug,
-                slug=dictionary_slug
+            self._object = self.get_slug_path_object(
+                Dictionary.objects.select_related('folder__user')
             )
         return self._object
 
@@ -300,15 +261,16 @@ def generate_dictionary_flashcards(request, user_slug, folder_slug, dictionary_s
     Returns:
         HttpResponse: Rendered flashcards page.
     """
-    dictionary = get_object_or_404(Dictionary, folder__user__slug=user_slug,
-                                   folder__slug=folder_slug, slug=dictionary_slug)
+    path = resolve_slug_path(user_slug, folder_slug, dictionary_slug)
 
     if request.method == "POST":
         front_type = request.POST.get('front_type')
         if front_type not in ['word', 'meaning']:
             messages.error(request, _('Invalid front type selected.'))
 
-        entries = dictionary.entries.prefetch_related('meanings').all()
+        entries = DictionaryEntry.objects.filter(
+            dictionary_id=path.dictionary_id
+        ).prefetch_related('meanings')
         flashcards = []
 
         for entry in entries:
@@ -344,14 +306,13 @@ def download_dictionary_pdf(request, user_slug, folder_slug, dictionary_slug):
     Returns:
         HttpResponse: PDF file download.
     """
-    author = get_object_or_404(CustomUser, slug=user_slug)
-    dictionary = get_object_or_404(
-        Dictionary,
-        folder__user__slug=user_slug,
-        slug=dictionary_slug
+    _path, dictionary = get_object_by_slug_path(
+        Dictionary.objects.select_related('folder__user'),
+        user_slug, folder_slug, dictionary_slug
     )
+    author = dictionary.folder.user
     entries = dictionary.entries.prefetch_related(
-        'meanings',
+        'meanings__target_language',
         'examples'
     ).order_by('word', 'created_at')
 
@@ -362,12 +323,8 @@ def download_dictionary_pdf(request, user_slug, folder_slug, dictionary_slug):
         'entries': entries
     }
 
-    # Render the HTML content for the PDF using a template
-    html_content = render_to_string('dictionary/dictionary-pdf.html', data)
-
-    # Generate the PDF from the HTML
-    base_url = request.build_absolute_uri('/')
-    pdf = HTML(string=html_content, base_url=base_url).write_pdf()
+    # Render the template to a PDF
+    pdf = render_pdf('dictionary/dictionary-pdf.html', data, base_url=request.build_absolute_uri('/'))
     filename = f'Dictionary {dictionary.name}.pdf'
 
     # Return the PDF as a response
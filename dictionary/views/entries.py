@@ -1,126 +1,47 @@
 import json
 
 from django import forms
-from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.db import IntegrityError, transaction
 from django.urls import reverse, reverse_lazy
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
-from django.shortcuts import get_object_or_404, redirect, render
+from django.shortcuts import redirect, render
 from django.views.generic import (
     CreateView,
     DeleteView,
     DetailView,
     UpdateView
 )
-from openai import OpenAI
 
 from accounts.decorators import verified_email_required
+from dictionary.caching import cache_public_page, owner_namespaces
 from dictionary.forms import DictionaryEntryForm
-from dictionary.models import Dictionary, DictionaryEntry, Example, Language, Meaning
-from .mixins import CustomLoginRequiredMixin
+from dictionary.generation import fetch_data_from_openai
+from dictionary.languages import get_languages
+from dictionary.models import Dictionary, DictionaryEntry, Language
+from dictionary.resolvers import get_object_by_slug_path
+from dictionary.utils import (
+    bulk_create_examples,
+    bulk_create_meanings,
+    get_languages_by_name,
+    sync_examples,
+    sync_meanings
+)
+from .mixins import CustomLoginRequiredMixin, SlugPathMixin
 
 
-def fetch_data_from_openai(entry_word, entry_language, target_languages):
-    """
-    Fetch data for a word using OpenAI's API.
-
-    Generates dictionary definition, translations, and example sentences
-    for a given word in a specific language.
-
-    Args:
-        entry_word (str): The word to look up.
-        entry_language (str): The language of the word to look up.
-        target_languages (list): A list of languages for translation.
-
-    Returns:
-        tuple: A tuple containing:
-            - definition (str): Word definition
-            - translations_data (list): Translations in target languages.
-            - examples_data (list): Example sentences.
-        Returns None if word is invalid in the given language.
-    """
-    client = OpenAI(api_key=settings.OPEN_API_KEY)
-    word = entry_word
-    language = entry_language
-    languages = target_languages
-
-    prompt = (
-        f"Please check if the word '{word}' is in language '{language}'. "
-        f"If the word '{word}' does **not** belong to the language '{language}', "
-        "return **only** this message: 'Incorrect Instructions'."
-        "If it does belong, proceed with the following steps:\n"
-        f"Please provide a dictionary definition and example sentences for the word '{word}'. "
-        f"The word is in {language}. If the word is valid in {language}, then the definition should be in "
-        "the word's original language, and translations should **only** be provided in the "
-        f"following strict list of languages: {languages}. "
-        "This is a strict and exhaustive list of target languages. **Do not** add or include any other languages. "
-        "If a translation for a requested language is unavailable, "
-        "indicate it explicitly as 'No translation available'.\n\n"
-        "References:\n"
-        "- For Georgian translations, use this as a reference: https://dictionary.ge/.\n"
-        "- For example sentences in Korean, use this as a reference: https://wordrow.kr/basicn/ko/meaning/.\n\n"
-        "Create a total of 6 example sentences in the word's original language, "
-        "ensuring they are clear, relevant, and suitable for language learners. "
-        "Adjust the complexity of the sentences to match the word's difficulty. "
-        "Include:\n"
-        "- 2 beginner-level sentences,\n"
-        "- 2 intermediate-level sentences,\n"
-        "- 2 advanced-level sentences.\n\n"
-        "Do not include any formatting markers like ```json or other delimiters. "
-        "Do **not** include any text before or after the JSON."
-        "Create the response strictly as a valid JSON object, ready for parsing, in the format as follows:\n\n"
-        "{\n"
-        '  "word": "{word}",\n'
-        '  "definition": [\n'
-        '    {"language": "{language}", "definition": "{definition}"},\n'
-        "  ],\n"
-        '  "translations": [\n'
-        '    {"language": "{language1}", "translation": "{translation1}"},\n'
-        '    {"language": "{language2}", "translation": "{translation2}"}\n'
-        "  ],\n"
-        '  "examples": [\n'
-        '    {"sentence": "{example1}"},\n'
-        '    {"sentence": "{example2}"},\n'
-        '    {"sentence": "{example3}"},\n'
-        '    {"sentence": "{example4}"},\n'
-        '    {"sentence": "{example5}"},\n'
-        '    {"sentence": "{example6}"},\n'
-        "  ]\n"
-        "}"
-    )
-
-    completion = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "developer", "content": "You are a helpful assistant."},
-            {"role": "user", "content": prompt}
-        ],
-    )
-
-    content = completion.choices[0].message.content
-    if content.startswith('Incorrect'):
-        return None
-    if content.startswith("```json"):
-        content = content.lstrip("```json").rstrip("```").strip()
-
-    # Parse content
-    data = json.loads(content)
-    definition = data['definition'][0]['definition']
-    translations_data = data['translations']
-    examples_data = data['examples']
-
-    return definition, translations_data, examples_data
-
-
-class EntryDetailView(DetailView):
+@method_decorator(cache_public_page(owner_namespaces), name='dispatch')
+class EntryDetailView(SlugPathMixin, DetailView):
     """
     Detailed view for a dictionary entry.
 
     Retrieves and displays comprehensive information about a specific
     dictionary entry, including associated meanings and examples.
+
+    Meanings and examples are passed to the template as lazy querysets, so
+    they are only loaded when the cached entry card has to be re-rendered.
     """
     model = DictionaryEntry
     template_name = 'dictionary/entry-detail.html'
@@ -129,28 +50,23 @@ class EntryDetailView(DetailView):
     slug_field = 'slug'
 
     def get_object(self, queryset=None):
-        user_slug = self.kwargs.get('user_slug')
-        folder_slug = self.kwargs.get('folder_slug')
-        dictionary_slug = self.kwargs.get('dictionary_slug')
-
-        return get_object_or_404(
+        return self.get_slug_path_object(
             DictionaryEntry.objects.select_related(
                 'dictionary',
+                'dictionary__folder__language',
                 'dictionary__folder__user__profile'
-            ).prefetch_related(
-                'meanings',
-                'meanings__target_language',
-                'examples'
-            ),
-            dictionary__folder__user__slug=user_slug,
-            dictionary__folder__slug=folder_slug,
-            dictionary__slug=dictionary_slug,
-            slug=self.kwargs.get('entry_slug'),
+            )
         )
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['meanings'] = self.object.meanings.select_related('target_language')
+        context['examples'] = self.object.examples.all()
+        return context
+
 
 @method_decorator(verified_email_required, name='dispatch')
-class EntryInitiateView(CustomLoginRequiredMixin, CreateView):
+class EntryInitiateView(CustomLoginRequiredMixin, SlugPathMixin, CreateView):
     """
     Initial view for creating a new dictionary entry.
 
@@ -163,18 +79,17 @@ class EntryInitiateView(CustomLoginRequiredMixin, CreateView):
     template_name = 'dictionary/entry-form.html'
     form_class = DictionaryEntryForm
 
+    def get_dictionary(self):
+        if not hasattr(self, '_dictionary'):
+            self._dictionary = self.get_slug_path_object(
+                Dictionary.objects.select_related('folder')
+            )
+        return self._dictionary
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        user_slug = self.kwargs.get('user_slug')
-        folder_slug = self.kwargs.get('folder_slug')
-        dictionary_slug = self.kwargs.get('dictionary_slug')
-        dictionary = Dictionary.objects.get(
-            folder__user__slug=user_slug,
-            folder__slug=folder_slug,
-            slug=dictionary_slug
-        )
-        context['languages'] = Language.objects.only('name')
-        context['dictionary'] = dictionary
+        context['languages'] = get_languages().values()
+        context['dictionary'] = self.get_dictionary()
         return context
 
     def get_form_kwargs(self):
@@ -183,37 +98,20 @@ class EntryInitiateView(CustomLoginRequiredMixin, CreateView):
         return kwargs
 
     def form_valid(self, form):
-        user_slug = self.kwargs.get('user_slug')
-        folder_slug = self.kwargs.get('folder_slug')
-        dictionary_slug = self.kwargs.get('dictionary_slug')
-        dictionary = Dictionary.objects.get(
-            folder__user__slug=user_slug,
-            folder__slug=folder_slug,
-            slug=dictionary_slug
-        )
-
-        word = form.cleaned_data['word']
-        entry_language = form.cleaned_data['entry_language'],
-        entry_language = entry_language[0]
-        target_languages = form.cleaned_data['target_languages'],
-        target_languages = target_languages[0]
+        # Raises Http404 if the dictionary was deleted or renamed since the form was displayed
+        self.get_slug_path()
+        slugs = {name: self.kwargs[name] for name in ('user_slug', 'folder_slug', 'dictionary_slug')}
 
         # Store data in session for further processing
         self.request.session['entry_creation_data'] = {
-            'word': word,
-            'target_languages': ', '.join(target_languages),
-            'entry_language': entry_language,
-            'user_slug': user_slug,
-            'folder_slug': folder_slug,
-            'dictionary_slug': dictionary_slug,
+            'word': form.cleaned_data['word'],
+            'target_languages': ', '.join(form.cleaned_data['target_languages']),
+            'entry_language': form.cleaned_data['entry_language'],
+            **slugs,
         }
 
         # Redirect to the next step
-        url = reverse('dictionaries:create-entry', kwargs={
-            'user_slug': user_slug,
-            'folder_slug': folder_slug,
-            'dictionary_slug': dictionary_slug,
-        })
+        url = reverse('dictionaries:create-entry', kwargs=slugs)
         return redirect(url)
 
     def form_invalid(self, form):
@@ -308,10 +206,14 @@ class EntryCreateView(CustomLoginRequiredMixin, CreateView):
                                     folder_slug=entry_data['folder_slug'],
                                     dictionary_slug=entry_data['dictionary_slug'])
 
-                dictionary = Dictionary.objects.get(
-                    folder__user__slug=entry_data['user_slug'],
-                    folder__slug=entry_data['folder_slug'],
-                    slug=entry_data['dictionary_slug']
+                _path, dictionary = get_object_by_slug_path(
+                    Dictionary.objects.select_related(
+                        'folder__language',
+                        'folder__user'
+                    ),
+                    entry_data['user_slug'],
+                    entry_data['folder_slug'],
+                    entry_data['dictionary_slug']
                 )
 
                 # Save the entry with the image
@@ -329,41 +231,40 @@ class EntryCreateView(CustomLoginRequiredMixin, CreateView):
                 meanings = request.POST.getlist('meaning_description[]')
                 meaning_languages = request.POST.getlist('meaning_language[]')
 
-                if definition:
-                    Meaning.objects.create(
-                        entry=entry,
-                        description=definition,
-                        target_language=entry.dictionary.folder.language,
+                translated = [
+                    (language, description)
+                    for language, description in (
+                        *zip(translation_languages, translations),
+                        *zip(meaning_languages, meanings),
                     )
+                    if language and description
+                ]
+                languages = get_languages_by_name(language for language, _description in translated)
 
-                for language, translation in zip(translation_languages, translations):
-                    if language and translation:
-                        target_language = Language.objects.get(name=language)
-                        Meaning.objects.create(
-                            entry=entry,
-                            description=translation,
-                            target_language=target_language,
-                        )
-
-                for language, description in zip(meaning_languages, meanings):
-                    if language and description:
-                        Meaning.objects.create(
-                            entry=entry,
-                            description=description,
-                            target_language=Language.objects.get(name=language)
-                        )
+                meanings_data = []
+                if definition:
+                    meanings_data.append({
+                        'description': definition,
+                        'target_language': entry.dictionary.folder.language,
+                    })
+                meanings_data.extend(
+                    {'description': description, 'target_language': languages[language]}
+                    for language, description in translated
+                )
+                bulk_create_meanings(entry, meanings_data)
 
                 # Handle example sentences
                 example_sentences_json = request.POST.get('example_sentences[]', '[]')
                 try:
                     example_sentences = json.loads(example_sentences_json)
-                    for sentence_data in example_sentences:
-                        if sentence_data['sentence'].strip():
-                            Example.objects.create(
-                                sentence=sentence_data['sentence'],
-                                source='user' if sentence_data['isCustom'] else 'generated',
-                                entry=entry
-                            )
+                    bulk_create_examples(entry, (
+                        {
+                            'sentence': sentence_data['sentence'],
+                            'source': 'user' if sentence_data['isCustom'] else 'generated',
+                        }
+                        for sentence_data in example_sentences
+                        if sentence_data['sentence'].strip()
+                    ))
                 except json.JSONDecodeError as error:
                     print("Error decoding JSON:", error)
 
@@ -388,7 +289,7 @@ class EntryCreateView(CustomLoginRequiredMixin, CreateView):
 
 
 @method_decorator(verified_email_required, name='dispatch')
-class EntryUpdateView(CustomLoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class EntryUpdateView(CustomLoginRequiredMixin, SlugPathMixin, UserPassesTestMixin, UpdateView):
     """
     View for updating an existing dictionary entry.
 
@@ -414,11 +315,7 @@ class EntryUpdateView(CustomLoginRequiredMixin, UserPassesTestMixin, UpdateView)
 
     def get_object(self, queryset=None):
         if not hasattr(self, '_object'):
-            user_slug = self.kwargs.get('user_slug')
-            folder_slug = self.kwargs.get('folder_slug')
-            dictionary_slug = self.kwargs.get('dictionary_slug')
-
-            self._object = get_object_or_404(
+            self._object = self.get_slug_path_object(
                 DictionaryEntry.objects.select_related(
                     'dictionary__folder__user',
                     'dictionary__folder__language'
@@ -426,24 +323,15 @@ class EntryUpdateView(CustomLoginRequiredMixin, UserPassesTestMixin, UpdateView)
                     'meanings',
                     'meanings__target_language',
                     'examples'
-                ),
-                dictionary__folder__user__slug=user_slug,
-                dictionary__folder__slug=folder_slug,
-                dictionary__slug=dictionary_slug,
-                slug=self.kwargs.get('entry_slug'),
+                )
             )
         return self._object
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         entry = self.get_object()
-        dictionary = Dictionary.objects.get(
-            folder__user__slug=self.kwargs.get('user_slug'),
-            folder__slug=self.kwargs.get('folder_slug'),
-            slug=self.kwargs.get('dictionary_slug')
-        )
         languages = [language[0] for language in Language.LANGUAGE_CHOICES]
-        context['dictionary'] = dictionary
+        context['dictionary'] = entry.dictionary
         context['meanings'] = entry.meanings.all()
         context['examples'] = entry.examples.all()
         context['languages'] = languages
@@ -452,47 +340,30 @@ class EntryUpdateView(CustomLoginRequiredMixin, UserPassesTestMixin, UpdateView)
     @transaction.atomic
     def form_valid(self, form):
         try:
-            dictionary = Dictionary.objects.get(
-                folder__user__slug=self.kwargs.get('user_slug'),
-                folder__slug=self.kwargs.get('folder_slug'),
-                slug=self.kwargs.get('dictionary_slug')
-            )
-            form.instance.dictionary = dictionary
-
             entry = form.save()
 
             # Handle meanings
             meaning_descriptions = self.request.POST.getlist('meaning_description[]')
             meaning_languages = self.request.POST.getlist('meaning_language[]')
-            valid_meanings = []
-
-            for description, language_name in zip(meaning_descriptions, meaning_languages):
-                if description.strip():
-                    language = Language.objects.get(name=language_name)
-                    meaning, created = Meaning.objects.get_or_create(
-                        entry=entry,
-                        description=description,
-                        target_language=language,
-                    )
-                    valid_meanings.append(meaning.id)
-
-            entry.meanings.exclude(id__in=valid_meanings).delete()
+            meanings = [
+                (description, language_name)
+                for description, language_name in zip(meaning_descriptions, meaning_languages)
+                if description.strip()
+            ]
+            languages = get_languages_by_name(language_name for _description, language_name in meanings)
+            sync_meanings(entry, [
+                {'description': description, 'target_language': languages[language_name]}
+                for description, language_name in meanings
+            ])
 
             # Handle examples
             example_sentences = self.request.POST.getlist('example_sentence[]')
             example_sources = self.request.POST.getlist('example_source[]')
-            valid_examples = []
-
-            for sentence, source in zip(example_sentences, example_sources):
-                if sentence.strip():
-                    example, created = Example.objects.get_or_create(
-                        sentence=sentence.strip(),
-                        source=source.strip(),
-                        entry=entry,
-                    )
-                    valid_examples.append(example.id)
-
-            entry.examples.exclude(id__in=valid_examples).delete()
+            sync_examples(entry, [
+                {'sentence': sentence.strip(), 'source': source.strip()}
+                for sentence, source in zip(example_sentences, example_sources)
+                if sentence.strip()
+            ])
 
             messages.success(self.request, _('Entry updated successfully.'))
             try:
@@ -501,9 +372,6 @@ class EntryUpdateView(CustomLoginRequiredMixin, UserPassesTestMixin, UpdateView)
                 messages.error(self.request, _('You have already added this word.'))
                 return self.form_invalid(form)
 
-        except Dictionary.DoesNotExist:
-            messages.error(self.request, _('Selected dictionary does not exist.'))
-            return self.form_invalid(form)
         except Language.DoesNotExist:
             messages.error(self.request, _('One of the selected languages does not exist.'))
             return self.form_invalid(form)
@@ -517,7 +385,7 @@ class EntryUpdateView(CustomLoginRequiredMixin, UserPassesTestMixin, UpdateView)
 
 
 @method_decorator(verified_email_required, name='dispatch')
-class EntryDeleteView(CustomLoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class EntryDeleteView(CustomLoginRequiredMixin, SlugPathMixin, UserPassesTestMixin, DeleteView):
     """
     View for deleting a dictionary entry.
 
@@ -532,18 +400,10 @@ class EntryDeleteView(CustomLoginRequiredMixin, UserPassesTestMixin, DeleteView)
 
     def get_object(self, queryset=None):
         if not hasattr(self, '_object'):
-            user_slug = self.kwargs.get('user_slug')
-            folder_slug = self.kwargs.get('folder_slug')
-            dictionary_slug = self.kwargs.get('dictionary_slug')
-
-            self._object = get_object_or_404(
+            self._object = self.get_slug_path_object(
                 DictionaryEntry.objects.select_related(
                     'dictionary__folder__user',
-                ),
-                dictionary__folder__user__slug=user_slug,
-                dictionary__folder__slug=folder_slug,
-                dictionary__slug=dictionary_slug,
-                slug=self.kwargs.get('entry_slug'),
+                )
             )
         return self._object
 
@@ -5,7 +5,6 @@ from django.contrib.auth.mixins import UserPassesTestMixin
 from django.core.exceptions import PermissionDenied
 from django.db import IntegrityError
 from django.http import HttpResponse
-from django.template.loader import render_to_string
 from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
@@ -17,15 +16,18 @@ from django.views.generic import (
     ListView,
     UpdateView
 )
-from weasyprint import HTML
 
 from accounts.decorators import verified_email_required
 from accounts.models import CustomUser
+from dictionary.caching import cache_public_page, owner_namespaces
 from dictionary.filters import DictionaryFilter, DictionaryFolderFilter
-from dictionary.models import DictionaryFolder, DictionaryEntry
-from .mixins import CustomLoginRequiredMixin
+from dictionary.models import DictionaryFolder, DictionaryEntry, Language
+from dictionary.pdf import render_pdf
+from dictionary.resolvers import get_object_by_slug_path, resolve_slug_path
+from .mixins import CustomLoginRequiredMixin, SlugPathMixin
 
 
+@method_decorator(cache_public_page(owner_namespaces), name='dispatch')
 class FolderListView(ListView):
     """
     A view that lists all dictionary folders for a specific user.
@@ -79,7 +81,7 @@ class FolderListView(ListView):
         return context
 
 
-class FolderDetailView(DetailView):
+class FolderDetailView(SlugPathMixin, DetailView):
     """
     A view that displays the details of a specific dictionary folder.
 
@@ -94,14 +96,11 @@ class FolderDetailView(DetailView):
 
     def get_queryset(self):
         """
-        Returns a queryset of dictionary folders with related entries.
+        Returns a queryset of dictionary folders with their authors.
         """
-        return DictionaryFolder.annotate_all_statistics(
-            DictionaryFolder.objects.select_related(
-                'user',
-                'user__profile'
-            )
-            .prefetch_related('dictionaries__entries')
+        return DictionaryFolder.objects.select_related(
+            'user',
+            'user__profile'
         ).order_by('-created_at')
 
     def get_object(self, queryset=None) -> DictionaryFolder:
@@ -110,14 +109,7 @@ class FolderDetailView(DetailView):
         If the folder is not public and does not belong to the current user, raises a PermissionDenied error.
         """
         queryset = self.get_queryset()
-
-        user_slug = self.kwargs.get('user_slug')
-        folder_slug = self.kwargs.get('folder_slug')
-
-        folder = get_object_or_404(
-            queryset,
-            user__slug=user_slug,
-            slug=folder_slug)
+        folder = self.get_slug_path_object(queryset)
 
         if folder.user != self.request.user and folder.accessibility != 'Public':
             raise PermissionDenied(_('You do not have permission to view this folder.'))
@@ -197,7 +189,7 @@ class FolderCreateView(CustomLoginRequiredMixin, CreateView):
 
 
 @method_decorator(verified_email_required, name='dispatch')
-class FolderUpdateView(CustomLoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class FolderUpdateView(CustomLoginRequiredMixin, SlugPathMixin, UserPassesTestMixin, UpdateView):
     """
     A view for updating an existing dictionary folder.
 
@@ -224,12 +216,8 @@ class FolderUpdateView(CustomLoginRequiredMixin, UserPassesTestMixin, UpdateView
         Retrieves the folder object based on the user and folder slugs from the URL.
         """
         if not hasattr(self, '_object'):
-            user_slug = self.kwargs.get('user_slug')
-            folder_slug = self.kwargs.get('folder_slug')
-            self._object = get_object_or_404(
-                DictionaryFolder.objects.select_related('user'),
-                user__slug=user_slug,
-                slug=folder_slug
+            self._object = self.get_slug_path_object(
+                DictionaryFolder.objects.select_related('user')
             )
         return self._object
 
@@ -263,7 +251,7 @@ class FolderUpdateView(CustomLoginRequiredMixin, UserPassesTestMixin, UpdateView
 
 
 @method_decorator(verified_email_required, name='dispatch')
-class FolderDeleteView(CustomLoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class FolderDeleteView(CustomLoginRequiredMixin, SlugPathMixin, UserPassesTestMixin, DeleteView):
     """
     A view for deleting an existing dictionary folder.
 
@@ -279,12 +267,8 @@ class FolderDeleteView(CustomLoginRequiredMixin, UserPassesTestMixin, DeleteView
         Retrieves the folder object based on the user and folder slug from the URL.
         """
         if not hasattr(self, '_object'):
-            user_slug = self.kwargs.get('user_slug')
-            folder_slug = self.kwargs.get('folder_slug')
-            self._object = get_object_or_404(
-                DictionaryFolder.objects.select_related('user'),
-                user__slug=user_slug,
-                slug=folder_slug
+            self._object = self.get_slug_path_object(
+                DictionaryFolder.objects.select_related('user')
             )
         return self._object
 
@@ -312,7 +296,7 @@ def generate_folder_flashcards(request, user_slug, folder_slug):
         user_slug (str): The slug of the user who owns the folder.
         folder_slug (str): The slug of the folder to generate flashcards for.
     """
-    folder = get_object_or_404(DictionaryFolder, user__slug=user_slug, slug=folder_slug)
+    path = resolve_slug_path(user_slug, folder_slug)
 
     if request.method == "POST":
         front_type = request.POST.get('front_type')
@@ -320,8 +304,7 @@ def generate_folder_flashcards(request, user_slug, folder_slug):
             messages.error(request, _('Invalid front type selected.'))
 
         entries = DictionaryEntry.objects.filter(
-            dictionary__folder__user__slug=user_slug,
-            dictionary__folder__slug=folder_slug,
+            dictionary__folder_id=path.folder_id,
         ).prefetch_related('meanings')
 
         flashcards = []
@@ -353,16 +336,15 @@ def download_folder_pdf(request, user_slug, folder_slug):
         user_slug (str): The slug of the user who owns the folder.
         folder_slug (str): The slug of the folder to download as PDF.
     """
-    author = get_object_or_404(CustomUser, slug=user_slug)
-    folder = get_object_or_404(
-        DictionaryFolder,
-        user__slug=user_slug,
-        slug=folder_slug
+    _path, folder = get_object_by_slug_path(
+        DictionaryFolder.objects.select_related('user'),
+        user_slug, folder_slug
     )
+    author = folder.user
     entries = DictionaryEntry.objects.filter(
         dictionary__folder=folder
     ).prefetch_related(
-        'meanings',
+        'meanings__target_language',
         'examples'
     ).order_by(
         'dictionary__name',
@@ -376,12 +358,8 @@ def download_folder_pdf(request, user_slug, folder_slug):
         'entries': entries
     }
 
-    # Render the HTML content for the PDF using a template
-    html_content = render_to_string('dictionary/folder-pdf.html', data)
-
-    # Generate the PDF from the HTML
-    base_url = request.build_absolute_uri('/')
-    pdf = HTML(string=html_content, base_url=base_url).write_pdf()
+    # Render the template to a PDF
+    pdf = render_pdf('dictionary/folder-pdf.html', data, base_url=request.build_absolute_uri('/'))
     filename = f'Folder {folder.name}.pdf'
 
     # Return the PDF as a response
@@ -1,5 +1,7 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import redirect
+from django.shortcuts import get_object_or_404, redirect
+
+from dictionary.resolvers import SlugPath, get_object_by_slug_path, resolve_slug_path
 
 
 class CustomLoginRequiredMixin(LoginRequiredMixin):
@@ -17,3 +19,42 @@ class CustomLoginRequiredMixin(LoginRequiredMixin):
         if not request.user.is_authenticated:
             return redirect(f"{self.get_login_url()}?next={request.path}")
         return super().dispatch(request, *args, **kwargs)
+
+
+class SlugPathMixin:
+    """
+    A mixin that resolves the nested slugs of the requested URL once per request.
+
+    The slugs are mapped to primary keys through the slug path cache, so that
+    objects can be fetched by primary key instead of through a chain of joins.
+    """
+    def get_slug_path(self) -> SlugPath:
+        """
+        Returns the primary keys addressed by the URL's slugs.
+
+        Raises:
+            Http404: If no object matches the slugs.
+        """
+        if not hasattr(self, '_slug_path'):
+            self._slug_path = resolve_slug_path(*self.get_slugs())
+        return self._slug_path
+
+    def get_slugs(self) -> list:
+        """
+        Returns the slugs of the URL, outermost first.
+        """
+        slugs = (self.kwargs.get(f'{level}_slug') for level in ('user', 'folder', 'dictionary', 'entry'))
+        return [slug for slug in slugs if slug is not None]
+
+    def get_slug_path_object(self, queryset):
+        """
+        Returns the object addressed by the URL's deepest slug with a single query,
+        resolving the slug path along the way.
+
+        Raises:
+            Http404: If no object matches the slugs.
+        """
+        if hasattr(self, '_slug_path'):
+            return get_object_or_404(queryset, pk=self._slug_path[len(self.get_slugs()) - 1])
+        self._slug_path, instance = get_object_by_slug_path(queryset, *self.get_slugs())
+        return instance
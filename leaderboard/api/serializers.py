@@ -18,4 +18,7 @@ class LeaderboardSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = UserStatistics
-        fields = '__all__'
+        fields = (
+            'id', 'user', 'total_entries', 'weekly_entries', 'total_examples', 'weekly_examples',
+            'last_entry_date', 'current_streak', 'max_streak',
+        )
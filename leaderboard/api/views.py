@@ -3,12 +3,14 @@ from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 
+from dictionary.api.conditional import ConditionalGetMixin
+from dictionary.caching import LEADERBOARD_NAMESPACE, get_cache_generations
 from leaderboard.models import UserStatistics
 from .serializers import LeaderboardSerializer
 
 
 @extend_schema(tags=['Leaderboard'])
-class LeaderboardAPIListView(ListAPIView):
+class LeaderboardAPIListView(ConditionalGetMixin, ListAPIView):
     """
     API view for retrieving user leaderboard statistics.
 
@@ -37,7 +39,22 @@ class LeaderboardAPIListView(ListAPIView):
         """
         return self.queryset.order_by(f'-{field}', secondary_field)[:limit]
 
+    def get_resource_version(self):
+        """
+        Version the leaderboard by the cache generation of its namespace,
+        which signals bump whenever statistics, or the names and profiles
+        shown next to them, change.
+        """
+        generation, = get_cache_generations([LEADERBOARD_NAMESPACE])
+        return str(generation), None
+
     def get(self, request, *args, **kwargs):
+        """
+        Answer conditional requests, otherwise generate the leaderboard.
+        """
+        return self.conditional_response(request, self.get_leaderboard, *args, **kwargs)
+
+    def get_leaderboard(self, request, *args, **kwargs):
         """
         Generate leaderboard data across different categories.
 
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-19 00:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leaderboard", "0002_userstatistics_weekly_entries_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userstatistics",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -19,6 +19,7 @@ class UserStatistics(models.Model):
     last_entry_date = models.DateField(_('last entry date'), null=True, blank=True)
     current_streak = models.IntegerField(_('current streak in days'), default=0)
     max_streak = models.IntegerField(_('highest streak in days'), default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = _('User Statistic')
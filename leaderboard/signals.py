@@ -1,10 +1,15 @@
 from datetime import date, timedelta
 
 from django.db.models import F
+from django.db.models.functions import Greatest, Now
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from accounts.images import image_derivatives_generated
+from accounts.models import CustomUser, UserProfile
+from dictionary.caching import LEADERBOARD_NAMESPACE, invalidate_cache_namespaces
 from dictionary.models import DictionaryEntry, Example
+from dictionary.signals import examples_bulk_created
 from .models import UserStatistics
 
 
@@ -66,17 +71,65 @@ def update_statistics_on_example_creation(sender, instance, created, **kwargs):
         ).update(
             total_examples=F('total_examples') + 1,
             weekly_examples=F('weekly_examples') + 1,
+            updated_at=Now(),
         )
+        invalidate_cache_namespaces(LEADERBOARD_NAMESPACE)
+
+
+@receiver(examples_bulk_created, sender=Example)
+def update_statistics_on_examples_bulk_creation(sender, entry, examples, **kwargs):
+    """
+    Update user statistics when examples are inserted in bulk.
+
+    Increments total and weekly example counts by the number of user-generated examples.
+    """
+    added = sum(1 for example in examples if example.source == 'user')
+    if added:
+        UserStatistics.objects.filter(
+            user=entry.dictionary.folder.user_id
+        ).update(
+            total_examples=F('total_examples') + added,
+            weekly_examples=F('weekly_examples') + added,
+            updated_at=Now(),
+        )
+        invalidate_cache_namespaces(LEADERBOARD_NAMESPACE)
 
 
 @receiver(post_delete, sender=Example)
 def update_statistics_on_example_deletion(sender, instance, **kwargs):
     """
-    Adjust user statistics when an example is deleted.
+    Adjust user statistics when a user-generated example is deleted.
 
     Decrements total and weekly example counts.
     """
-    statistics = UserStatistics.objects.get(user=instance.entry.dictionary.folder.user)
-    statistics.total_examples = max(statistics.total_examples - 1, 0)
-    statistics.weekly_examples = max(statistics.weekly_examples - 1, 0)
-    statistics.save()
+    if instance.source == 'user':
+        UserStatistics.objects.filter(
+            user__folders__dictionaries__entries=instance.entry_id
+        ).update(
+            total_examples=Greatest(F('total_examples') - 1, 0),
+            weekly_examples=Greatest(F('weekly_examples') - 1, 0),
+            updated_at=Now(),
+        )
+        invalidate_cache_namespaces(LEADERBOARD_NAMESPACE)
+
+
+@receiver(post_save, sender=UserStatistics)
+@receiver(post_delete, sender=UserStatistics)
+@receiver(post_save, sender=UserProfile)
+@receiver(image_derivatives_generated, sender=UserProfile)
+def invalidate_leaderboard_page(sender, instance, **kwargs):
+    """
+    Invalidate the cached leaderboard page when statistics or a profile,
+    whose image is shown next to them, change.
+    """
+    invalidate_cache_namespaces(LEADERBOARD_NAMESPACE)
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_leaderboard_page_on_user_save(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Invalidate the cached leaderboard page when the username or email of a
+    user, which are shown next to their statistics, may have changed.
+    """
+    if not created and (update_fields is None or {'username', 'email'} & set(update_fields)):
+        invalidate_cache_namespaces(LEADERBOARD_NAMESPACE)
@@ -1,5 +1,7 @@
 from celery import shared_task
+from django.db.models.functions import Now
 
+from dictionary.caching import LEADERBOARD_NAMESPACE, invalidate_cache_namespaces
 from .models import UserStatistics
 
 
@@ -10,5 +12,7 @@ def reset_weekly_stats():
     """
     UserStatistics.objects.all().update(
         weekly_entries=0,
-        weekly_examples=0
+        weekly_examples=0,
+        updated_at=Now()
     )
+    invalidate_cache_namespaces(LEADERBOARD_NAMESPACE)
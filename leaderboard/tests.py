@@ -1,3 +1,54 @@
-from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.models import CustomUser
+from personalized_dictionary.testing import TestCase
+from .models import UserStatistics
+
+
+class LeaderboardAPITests(TestCase):
+    """
+    The leaderboard API renders the public statistics of users and answers
+    conditional requests until they change.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email='author@example.com', password='password', username='author')
+        cls.url = reverse('leaderboard_api:leaderboard')
+
+    def test_payload_fields(self):
+        statistics = self.client.get(self.url).json()['most_entries'][0]
+        self.assertEqual(set(statistics), {
+            'id', 'user', 'total_entries', 'weekly_entries', 'total_examples', 'weekly_examples',
+            'last_entry_date', 'current_streak', 'max_streak',
+        })
+
+    def test_conditional_get(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        statistics = UserStatistics.objects.get(user=self.user)
+        statistics.total_entries = 1
+        statistics.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        self.user.username = 'writer'
+        self.user.save(update_fields=['username'])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['most_entries'][0]['user']['username'], 'writer')
+
+
+class LeaderboardPageTests(TestCase):
+    """
+    The leaderboard page is cached for anonymous visitors until anything
+    shown on it changes.
+    """
+    def test_rename_invalidates_cached_page(self):
+        user = CustomUser.objects.create_user(email='author@example.com', password='password', username='author')
+        url = reverse('leaderboard:leaderboard')
+        self.assertContains(self.client.get(url), 'author')
+
+        user.username = 'writer'
+        user.save()
+        self.assertContains(self.client.get(url), 'writer')
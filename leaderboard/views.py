@@ -1,10 +1,13 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import render
+from django.utils.decorators import method_decorator
 from django.views.generic import ListView
 
+from dictionary.caching import LEADERBOARD_NAMESPACE, cache_public_page
 from .models import UserStatistics
 
 
+@method_decorator(cache_public_page(lambda request, **kwargs: [LEADERBOARD_NAMESPACE]), name='dispatch')
 class LeaderboardView(ListView):
     """
     Renders leaderboard page with top user statistics.
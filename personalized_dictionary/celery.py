@@ -3,6 +3,9 @@ from __future__ import absolute_import, unicode_literals
 import os
 
 from celery import Celery
+from celery.signals import task_postrun, task_prerun
+
+from .profiling import profile_task_finish, profile_task_start
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'personalized_dictionary.settings')
@@ -19,6 +22,10 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Load tasks from all registered Django app configs.
 app.autodiscover_tasks()
 
+# Profile a sample of the tasks, and the slow ones, when PROFILING_ENABLED is set.
+task_prerun.connect(profile_task_start)
+task_postrun.connect(profile_task_finish)
+
 
 @app.task(bind=True)
 def debug_task(self):
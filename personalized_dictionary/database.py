@@ -0,0 +1,208 @@
+import random
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpRequest, HttpResponse
+
+# Pragmas run on every new SQLite connection. WAL lets readers proceed
+# while one writer commits; NORMAL synchronous is durable in WAL mode but
+# for the last transactions before a power loss. The cache is per
+# connection, in KiB when negative.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Seconds a persistent connection is reused for, across requests and tasks.
+SQLITE_CONN_MAX_AGE = 600
+
+# Cookie holding the time until which a client that wrote reads from the primary.
+REPLICA_PIN_COOKIE = 'primary_until'
+# Cache key holding the same time for a signed in user, whatever their client.
+REPLICA_PIN_KEY = 'primary-until:{}'
+
+# Apps always read from the primary: a session missing from a lagging
+# replica would log its user out.
+PRIMARY_APP_LABELS = {'sessions'}
+
+
+def sqlite_pragmas_command(pragmas: Dict) -> str:
+    """Return the ``init_command`` setting the given pragmas."""
+    return ';'.join(f'PRAGMA {name}={value}' for name, value in pragmas.items())
+
+
+def sqlite_database(name, conn_max_age: int = SQLITE_CONN_MAX_AGE, pragmas: Optional[Dict] = None) -> Dict:
+    """
+    Return a ``DATABASES`` entry for a SQLite database tuned for concurrent
+    web and Celery workers.
+
+    Transactions begin with ``BEGIN IMMEDIATE``, so that a writer waits for
+    the write lock up to the busy timeout when its transaction starts,
+    instead of failing with "database is locked" when a transaction that
+    has read upgrades to a write.
+
+    Args:
+        name: Path of the database file.
+        conn_max_age (int): Seconds connections are reused for.
+        pragmas (Dict, optional): Pragmas overriding ``SQLITE_PRAGMAS``.
+
+    Returns:
+        Dict: The database settings.
+    """
+    pragmas = {**SQLITE_PRAGMAS, **(pragmas or {})}
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': sqlite_pragmas_command(pragmas),
+            'transaction_mode': 'IMMEDIATE',
+            # Busy timeout sqlite3.connect() sets before the pragmas run
+            'timeout': pragmas['busy_timeout'] / 1000,
+        },
+    }
+
+
+def replica_databases(names: Iterable) -> Dict[str, Dict]:
+    """
+    Return the ``DATABASES`` entries of read replicas, aliased
+    ``replica_1``, ``replica_2``... Tests read their replicas from the
+    test database of ``default``.
+
+    Args:
+        names (Iterable): Paths of the replicas' database files, kept up to
+            date by replication outside Django.
+    """
+    return {
+        f'replica_{index}': {**sqlite_database(name), 'TEST': {'MIRROR': DEFAULT_DB_ALIAS}}
+        for index, name in enumerate(names, start=1)
+    }
+
+
+# Database the reads of the current request go to, None for the primary.
+_read_database: ContextVar[Optional[str]] = ContextVar('read_database', default=None)
+# Whether the current request has written to the primary.
+_has_written: ContextVar[bool] = ContextVar('has_written', default=False)
+
+
+class ReplicaRouter:
+    """
+    Send writes to the primary database and the reads of web requests to
+    the replica ``ReplicaMiddleware`` picked for the request.
+
+    Once a request writes, its remaining reads go to the primary too.
+    Reads outside of requests, e.g., in Celery tasks and management
+    commands, and reads of ``PRIMARY_APP_LABELS`` always go to the
+    primary. Reads related to an instance, e.g., of its foreign keys, go
+    to the database it was read from.
+    """
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_APP_LABELS:
+            return None
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        _read_database.set(None)
+        _has_written.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.READ_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.READ_REPLICAS
+
+
+class ReplicaMiddleware:
+    """
+    Read from one of ``READ_REPLICAS`` during safe requests, unless the
+    client wrote in the last ``REPLICA_STICKINESS_SECONDS``.
+
+    After a request that writes, a cookie pins the client's requests to the
+    primary for long enough for the replicas to catch up, so that users
+    always read their own writes. The pin of a signed in user is also kept
+    in the shared cache, so that it holds for their other clients and for
+    API clients authenticating with a token, which send no cookies.
+
+    Installed after ``AuthenticationMiddleware``, so that the user of a
+    session is known, and read from the primary, before picking a replica.
+    """
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        if not settings.READ_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        use_replica = request.method in ('GET', 'HEAD', 'OPTIONS') and not self.is_pinned(request)
+        read_token = _read_database.set(random.choice(settings.READ_REPLICAS) if use_replica else None)
+        written_token = _has_written.set(False)
+        try:
+            response = self.get_response(request)
+            has_written = _has_written.get()
+        finally:
+            _read_database.reset(read_token)
+            _has_written.reset(written_token)
+
+        if has_written:
+            stickiness = settings.REPLICA_STICKINESS_SECONDS
+            pinned_until = int(time.time()) + stickiness
+            response.set_cookie(
+                REPLICA_PIN_COOKIE, str(pinned_until), max_age=stickiness, httponly=True, samesite='Lax',
+            )
+            # Views authenticating with a token set the user once they ran
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                cache.set(REPLICA_PIN_KEY.format(user.pk), pinned_until, stickiness)
+        return response
+
+    @staticmethod
+    def is_pinned(request: HttpRequest) -> bool:
+        """Whether the client or its user wrote recently enough for replicas to lag behind."""
+        try:
+            if int(request.COOKIES.get(REPLICA_PIN_COOKIE, 0)) > time.time():
+                return True
+        except ValueError:
+            pass
+        user_id = get_user_id(request)
+        return user_id is not None and cache.get(REPLICA_PIN_KEY.format(user_id), 0) > time.time()
+
+
+def get_user_id(request: HttpRequest) -> Optional[Any]:
+    """
+    Return the primary key of the user signed in with the session, or of
+    the user of a valid access token, without reading the token's user.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+
+    # Imported here, as the settings import this module before apps are ready
+    from rest_framework.exceptions import AuthenticationFailed
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.settings import api_settings
+
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    try:
+        raw_token = authentication.get_raw_token(header) if header else None
+        if raw_token is None:
+            return None
+        return authentication.get_validated_token(raw_token).get(api_settings.USER_ID_CLAIM)
+    except AuthenticationFailed:
+        return None
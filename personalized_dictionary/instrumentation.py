@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+from contextlib import ExitStack
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+# Statements are logged without their parameters, cut to this length.
+STATEMENT_MAX_LENGTH = 300
+
+UNRESOLVED_VIEW = '<unresolved>'
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a view issues more queries than its budget."""
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper counting the queries of one request, their
+    total time and the slowest of them.
+    """
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_statement = ''
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.duration += duration
+            if duration > self.slowest_duration:
+                self.slowest_duration, self.slowest_statement = duration, sql
+
+
+class ViewMetrics:
+    """Database metrics accumulated over the requests of one view."""
+    __slots__ = ('requests', 'queries', 'duration', 'max_queries', 'slowest_duration')
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.duration = 0.0
+        self.max_queries = 0
+        self.slowest_duration = 0.0
+
+
+class QueryMetricsRegistry:
+    """
+    Per view database metrics of the current process.
+
+    Metrics are only labelled with the view, so their number stays bounded.
+    Whenever a view issues a slower query than any before, the statement is
+    logged instead.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views: Dict[str, ViewMetrics] = {}
+
+    def record(self, view_name: str, recorder: QueryRecorder):
+        with self.lock:
+            metrics = self.views.get(view_name)
+            if metrics is None:
+                metrics = self.views[view_name] = ViewMetrics()
+            metrics.requests += 1
+            metrics.queries += recorder.count
+            metrics.duration += recorder.duration
+            metrics.max_queries = max(metrics.max_queries, recorder.count)
+            slowest = recorder.slowest_duration > metrics.slowest_duration
+            if slowest:
+                metrics.slowest_duration = recorder.slowest_duration
+        if slowest:
+            logger.info(
+                'Slowest query of %s so far took %.3fs: %s',
+                view_name, recorder.slowest_duration, recorder.slowest_statement[:STATEMENT_MAX_LENGTH],
+            )
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+
+    def render(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+        """
+        families = (
+            ('django_view_requests_total', 'counter', 'Requests handled by the view.', 'requests'),
+            ('django_view_db_queries_total', 'counter', 'Database queries issued by the view.', 'queries'),
+            ('django_view_db_seconds_total', 'counter', 'Time spent in database queries by the view.', 'duration'),
+            ('django_view_db_queries_max', 'gauge', 'Most database queries issued by one request.', 'max_queries'),
+            ('django_view_db_slowest_query_seconds', 'gauge', 'Slowest database query of the view.', 'slowest_duration'),
+        )
+        with self.lock:
+            views = sorted(self.views.items())
+            lines = []
+            for name, metric_type, help_text, attribute in families:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                for view_name, metrics in views:
+                    lines.append(f'{name}{{view="{_escape_label(view_name)}"}} {getattr(metrics, attribute)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+query_metrics = QueryMetricsRegistry()
+
+
+def get_query_budget(view_name: str) -> Optional[int]:
+    """Return the query budget declared for a view in ``QUERY_BUDGETS``, if any."""
+    return getattr(settings, 'QUERY_BUDGETS', {}).get(view_name)
+
+
+class QueryBudgetMiddleware:
+    """
+    Record the number of queries, the database time and the slowest query
+    of every request, aggregated by resolved URL name in ``query_metrics``.
+
+    A request issuing more queries than the budget its view has in
+    ``QUERY_BUDGETS`` is logged, or fails with ``QueryBudgetExceeded``
+    when ``QUERY_BUDGET_STRICT`` is set, as it is for tests.
+    """
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        view_name = resolver_match.view_name if resolver_match else UNRESOLVED_VIEW
+        query_metrics.record(view_name, recorder)
+
+        budget = get_query_budget(view_name)
+        if budget is not None and recorder.count > budget:
+            message = (
+                f'{view_name} issued {recorder.count} queries for a budget of {budget} '
+                f'({request.method} {request.path})'
+            )
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Export the query metrics of the current process for Prometheus.
+
+    Only clients listed in ``INTERNAL_IPS`` may scrape them.
+    """
+    if request.META.get('REMOTE_ADDR') not in settings.INTERNAL_IPS:
+        raise PermissionDenied
+    return HttpResponse(query_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
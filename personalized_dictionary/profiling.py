@@ -0,0 +1,258 @@
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from django.utils.text import slugify
+
+from .instrumentation import UNRESOLVED_VIEW, QueryRecorder
+
+# Phases samples are attributed to, by the innermost frame of their stack
+# running in one of these modules; other samples are plain Python.
+PHASE_MODULES = (
+    ('db', 'django.db.'),
+    ('weasyprint', 'weasyprint'),
+    ('pillow', 'PIL'),
+    ('openai', 'openai'),
+    ('templates', 'django.template.'),
+)
+OTHER_PHASE = 'python'
+
+# Frames kept per sample, from the innermost one.
+MAX_STACK_DEPTH = 128
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get('__name__', '?')
+    return f'{module}.{getattr(code, "co_qualname", code.co_name)}:{frame.f_lineno}'
+
+
+def _frame_phase(frame) -> Optional[str]:
+    module = frame.f_globals.get('__name__', '')
+    for phase, prefix in PHASE_MODULES:
+        if module.startswith(prefix):
+            return phase
+    return None
+
+
+class Profile:
+    """
+    Statistical profile of one request or task: the number of samples of
+    every stack, in the folded format flame graph tools read, and of every
+    phase, along with the exact database time.
+    """
+    def __init__(self, kind: str, name: str, sampled: bool):
+        self.kind = kind
+        self.name = name
+        self.sampled = sampled
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.stacks = Counter()
+        self.phases = Counter()
+        self.queries = QueryRecorder()
+        self.database_wrappers = ExitStack()
+
+    def add_sample(self, frame):
+        labels, phase = [], None
+        while frame is not None and len(labels) < MAX_STACK_DEPTH:
+            labels.append(_frame_label(frame))
+            phase = phase or _frame_phase(frame)
+            frame = frame.f_back
+        self.stacks[';'.join(reversed(labels))] += 1
+        self.phases[phase or OTHER_PHASE] += 1
+
+    def start(self):
+        """Start counting the queries of the current thread and sampling it."""
+        for connection in connections.all():
+            self.database_wrappers.enter_context(connection.execute_wrapper(self.queries))
+        sampler.add(self)
+
+    def stop(self):
+        sampler.remove(self)
+        self.database_wrappers.close()
+        self.duration = time.perf_counter() - self.started
+
+    def summary(self) -> Dict:
+        interval = settings.PROFILING_INTERVAL
+        return {
+            'kind': self.kind,
+            'name': self.name,
+            'sampled': self.sampled,
+            'started_at': self.started_at,
+            'duration': self.duration,
+            'samples': sum(self.phases.values()),
+            'interval': interval,
+            'phases': {phase: count * interval for phase, count in self.phases.most_common()},
+            'db_queries': self.queries.count,
+            'db_seconds': self.queries.duration,
+        }
+
+
+class Sampler:
+    """
+    Background thread sampling the stacks of the threads that run a profile.
+
+    The thread runs while at least one profile is active, so that an idle
+    process pays nothing for profiling.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.profiles: Dict[int, Profile] = {}
+        self.thread: Optional[threading.Thread] = None
+
+    def add(self, profile: Profile):
+        with self.lock:
+            self.profiles[threading.get_ident()] = profile
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='profiling-sampler', daemon=True)
+                self.thread.start()
+
+    def remove(self, profile: Profile):
+        with self.lock:
+            if self.profiles.get(threading.get_ident()) is profile:
+                del self.profiles[threading.get_ident()]
+
+    def run(self):
+        interval = settings.PROFILING_INTERVAL
+        while True:
+            time.sleep(interval)
+            with self.lock:
+                if not self.profiles:
+                    self.thread = None
+                    return
+                frames = sys._current_frames()
+                for ident, profile in self.profiles.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        profile.add_sample(frame)
+
+
+sampler = Sampler()
+
+
+class ProfileStore:
+    """
+    Bounded on-disk ring buffer of profiles.
+
+    Every profile is written as a ``.folded`` file of collapsed stacks,
+    which flamegraph.pl, speedscope and similar tools render, and a
+    ``.json`` summary of its phases. Once the directory holds more than
+    ``max_profiles`` profiles, the oldest ones are deleted.
+    """
+    def __init__(self, directory, max_profiles: int):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+
+    def save(self, profile: Profile) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Names sort by start time, so that the oldest profiles are pruned first
+        stem = '-'.join((
+            time.strftime('%Y%m%dT%H%M%S', time.gmtime(profile.started_at)),
+            f'{int(profile.started_at % 1 * 1e6):06d}',
+            uuid.uuid4().hex[:8],
+            profile.kind,
+            slugify(profile.name.replace(':', '-').replace('.', '-'))[:80],
+        ))
+        folded = ''.join(f'{stack} {count}\n' for stack, count in profile.stacks.most_common())
+        self._write(self.directory / f'{stem}.folded', folded)
+        self._write(self.directory / f'{stem}.json', json.dumps(profile.summary(), indent=2))
+        self.prune()
+        return self.directory / f'{stem}.json'
+
+    def prune(self):
+        summaries = sorted(self.directory.glob('*.json'))
+        for summary in summaries[:max(0, len(summaries) - self.max_profiles)]:
+            for path in (summary, summary.with_suffix('.folded')):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass  # Pruned by another process
+
+    @staticmethod
+    def _write(path: Path, content: str):
+        temporary = path.with_name(f'.{path.name}.tmp')
+        temporary.write_text(content)
+        os.replace(temporary, path)
+
+
+def get_profile_store() -> ProfileStore:
+    return ProfileStore(settings.PROFILING_DIRECTORY, settings.PROFILING_MAX_PROFILES)
+
+
+def start_profile(kind: str, name: str) -> Optional[Profile]:
+    """
+    Start profiling the current thread if it is sampled, or if slow runs
+    are kept, in which case the profile is only stored if it turns out slow.
+    """
+    sampled = random.random() < settings.PROFILING_SAMPLE_RATE
+    if not sampled and not settings.PROFILING_SLOW_THRESHOLD:
+        return None
+    profile = Profile(kind, name, sampled)
+    profile.start()
+    return profile
+
+
+def finish_profile(profile: Profile, name: Optional[str] = None):
+    """Stop the profile and store it if it was sampled or ran over the slow threshold."""
+    profile.stop()
+    if name:
+        profile.name = name
+    threshold = settings.PROFILING_SLOW_THRESHOLD
+    if profile.sampled or (threshold and profile.duration >= threshold):
+        get_profile_store().save(profile)
+
+
+class ProfilingMiddleware:
+    """
+    Profile a sampled fraction of the requests, given by
+    ``PROFILING_SAMPLE_RATE``, and every request slower than
+    ``PROFILING_SLOW_THRESHOLD`` seconds, if set, into ``PROFILING_DIRECTORY``.
+    A threshold has every request sampled, to find out which are slow.
+
+    Only installed when ``PROFILING_ENABLED`` is set.
+    """
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        profile = start_profile('request', request.path)
+        if profile is None:
+            return self.get_response(request)
+        try:
+            return self.get_response(request)
+        finally:
+            resolver_match = getattr(request, 'resolver_match', None)
+            finish_profile(profile, resolver_match.view_name if resolver_match else UNRESOLVED_VIEW)
+
+
+_task_profiles: Dict[str, Profile] = {}
+
+
+def profile_task_start(task_id=None, task=None, **kwargs):
+    """``task_prerun`` receiver profiling Celery tasks like requests."""
+    if settings.PROFILING_ENABLED:
+        profile = start_profile('task', task.name)
+        if profile is not None:
+            _task_profiles[task_id] = profile
+
+
+def profile_task_finish(task_id=None, **kwargs):
+    """``task_postrun`` receiver storing the profile of a task."""
+    profile = _task_profiles.pop(task_id, None)
+    if profile is not None:
+        finish_profile(profile)
@@ -6,6 +6,8 @@ from dotenv import load_dotenv
 
 from celery import schedules
 
+from personalized_dictionary.database import replica_databases, sqlite_database
+
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -37,11 +39,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "personalized_dictionary.profiling.ProfilingMiddleware",
+    "personalized_dictionary.instrumentation.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "personalized_dictionary.database.ReplicaMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
@@ -77,13 +82,21 @@ WSGI_APPLICATION = "personalized_dictionary.wsgi.application"
 
 
 # Database
+# SQLite in WAL mode with a busy timeout and persistent connections, see
+# personalized_dictionary/database.py.
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": sqlite_database(BASE_DIR / "db.sqlite3"),
 }
 
+# Read replicas
+# Comma separated database files of replicas of the default database. Safe
+# web requests read from one of them, unless the client or its user wrote in
+# the last REPLICA_STICKINESS_SECONDS; everything else uses the primary.
+DATABASES.update(replica_databases(filter(None, os.getenv('DATABASE_REPLICAS', '').split(','))))
+READ_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["personalized_dictionary.database.ReplicaRouter"]
+REPLICA_STICKINESS_SECONDS = int(os.getenv('REPLICA_STICKINESS_SECONDS', '10'))
+
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -102,13 +115,74 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 # Cache Configuration
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "development-cache",
-        "STATS": True,
+# The cache is shared by every web worker and Celery process: Redis when
+# CACHE_URL is set, a file-based cache otherwise. Tests use a local memory
+# cache, see personalized_dictionary/testing.py.
+CACHE_URL = os.getenv('CACHE_URL')
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+            "KEY_PREFIX": "personalized-dictionary",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.getenv('CACHE_DIR', BASE_DIR / "cache"),
+            "OPTIONS": {
+                "MAX_ENTRIES": 10000,
+            },
+        }
     }
+
+# Query budgets
+# Most queries a request to each URL name may issue, whatever the amount of
+# data; QueryBudgetMiddleware logs requests over budget, or fails them in
+# strict mode, which tests enable.
+QUERY_BUDGETS = {
+    "dictionaries:home": 5,
+    "dictionaries:search": 10,
+    "dictionaries:folder-list": 8,
+    "dictionaries:folder-detail": 8,
+    "dictionaries:folder-pdf-download": 8,
+    "dictionaries:folder-flashcards": 8,
+    "dictionaries:dictionary-detail": 10,
+    "dictionaries:dictionary-pdf-download": 8,
+    "dictionaries:dictionary-flashcards": 8,
+    "dictionaries:entry-detail": 9,
+    "dictionaries_api:folder-list": 7,
+    "dictionaries_api:folder-detail": 7,
+    "dictionaries_api:folder-download-folder-pdf": 10,
+    "dictionaries_api:folder-generate-folder-flashcards": 7,
+    "dictionaries_api:dictionary-list": 7,
+    "dictionaries_api:dictionary-detail": 9,
+    "dictionaries_api:dictionary-download-dictionary-pdf": 10,
+    "dictionaries_api:dictionary-generate-dictionary-flashcards": 8,
+    "dictionaries_api:entry-list": 8,
+    "dictionaries_api:entry-detail": 8,
+    "dictionaries_api:search": 6,
+    "accounts_api:profile-list": 6,
+    "leaderboard:leaderboard": 10,
+    "leaderboard_api:leaderboard": 10,
 }
+QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT') == 'True'
+
+# Profiling
+# ProfilingMiddleware and the Celery task hooks sample the stacks of a
+# fraction of the requests and tasks, as flame graph input in a directory
+# holding at most PROFILING_MAX_PROFILES of them. They can also keep the
+# profiles of any slower than a threshold, in seconds, but telling which
+# are slow means sampling every request and task, so it is off (0) unless
+# set.
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED') == 'True'
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0.01'))
+PROFILING_SLOW_THRESHOLD = float(os.getenv('PROFILING_SLOW_THRESHOLD', '0'))
+PROFILING_INTERVAL = 0.005
+PROFILING_DIRECTORY = os.getenv('PROFILING_DIRECTORY', BASE_DIR / 'profiles')
+PROFILING_MAX_PROFILES = int(os.getenv('PROFILING_MAX_PROFILES', '200'))
 
 # Rest Framework Configuration
 REST_FRAMEWORK = {
@@ -155,12 +229,18 @@ CELERY_BROKER_URL = 'redis://127.0.0.1:6379'
 CELERY_ACCEPT_CONTENT = ['application/json']
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TASK_SERIALIZER = 'json'
+# Run tasks in process, e.g., to generate image derivatives without a worker
+CELERY_TASK_ALWAYS_EAGER = os.getenv('CELERY_TASK_ALWAYS_EAGER') == 'True'
 CELERY_TIMEZONE = 'Asia/Tbilisi'
 CELERY_BEAT_SCHEDULE = {
     'reset-weekly-stats': {
         'task': 'leaderboard.tasks.reset_weekly_stats',
         'schedule': schedules.crontab(hour=0, minute=0, day_of_week=0),
     },
+    'collect-orphaned-blobs': {
+        'task': 'accounts.tasks.collect_orphaned_blobs',
+        'schedule': schedules.crontab(hour=4, minute=0),
+    },
 }
 
 # Internationalization & Localization
@@ -178,12 +258,24 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
-STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
 
 # Media files
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    # Uploaded images, stored once per distinct content
+    "images": {
+        "BACKEND": "accounts.storage.ContentAddressedStorage",
+    },
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -196,6 +288,8 @@ EMAIL_HOST = os.getenv('EMAIL_HOST')
 EMAIL_PORT = os.getenv('EMAIL_PORT')
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
+# Seconds before a stalled SMTP server fails the sending task, which is then retried
+EMAIL_TIMEOUT = 30
 
 # Internal IPS
 INTERNAL_IPS = [
@@ -0,0 +1,28 @@
+from django import test
+from django.test import override_settings
+
+# Settings every test runs with, whichever runner or settings module runs
+# it: a cache of its own, so that tests neither see nor clear the entries
+# of running web and Celery processes, strict query budgets, and reads
+# from the primary database alone, as replicas would not see the
+# transactions tests run in.
+TEST_SETTINGS = {
+    'CACHES': {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'test-cache',
+        },
+    },
+    'QUERY_BUDGET_STRICT': True,
+    'READ_REPLICAS': [],
+}
+
+
+@override_settings(**TEST_SETTINGS)
+class SimpleTestCase(test.SimpleTestCase):
+    """``SimpleTestCase`` running with ``TEST_SETTINGS``."""
+
+
+@override_settings(**TEST_SETTINGS)
+class TestCase(test.TestCase):
+    """``TestCase`` running with ``TEST_SETTINGS``."""
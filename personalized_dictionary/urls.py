@@ -2,9 +2,15 @@ from debug_toolbar.toolbar import debug_toolbar_urls
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+from django.views.decorators.cache import cache_control
+from django.views.static import serve
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from accounts.images import DERIVATIVES_DIRECTORY
+from accounts.storage import BLOB_CACHE_MAX_AGE, BLOBS_DIRECTORY
+from .instrumentation import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('dictionary.urls', namespace='dictionaries')),
@@ -16,9 +22,18 @@ urlpatterns = [
     path('api-auth/', include('rest_framework.urls')),
     path('schema/', SpectacularAPIView.as_view(), name='schema'),
     path('swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger'),
+    path('metrics/', metrics_view, name='metrics'),
 ] + debug_toolbar_urls()
 
 
 if settings.DEBUG:
+    # Blobs and their derivatives are named after their content, so they never change
+    urlpatterns += [
+        re_path(
+            rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>(?:{BLOBS_DIRECTORY}|{DERIVATIVES_DIRECTORY})/.*)$',
+            cache_control(public=True, max_age=BLOB_CACHE_MAX_AGE, immutable=True)(serve),
+            {'document_root': settings.MEDIA_ROOT},
+        ),
+    ]
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)